@@ -4,121 +4,616 @@ Handles real-time audio streaming from the meeting bot, processes it through Whi
 and broadcasts transcription results to connected clients.
 """
 import asyncio
-import io
-import wave
-import tempfile
 import os
+import time
+from collections import deque
 from typing import Optional
 from fastapi import WebSocket
 import numpy as np
 
+from speech_Module.asr_worker_pool import asr_pool, ASR_MAX_QUEUE_DEPTH
+from speech_Module.batched_decoder import MicroBatcher, LIVE_ASR_BATCHING
+from speech_Module.vad import (
+    SpeechSegmenter,
+    contains_speech,
+    dbfs_to_amplitude,
+    VAD_THRESHOLD_DBFS,
+    VAD_MAX_SEGMENT_SECONDS,
+)
+from speech_Module.streaming import CaptionStream, LIVE_ASR_MODE, LIVE_STREAM_PARTIAL_INTERVAL, join_words
+from speech_Module.overload import (
+    OverloadController,
+    LIVE_OVERLOAD_POLICY,
+    LIVE_OVERLOAD_MODEL,
+    LIVE_OVERLOAD_GATE_BOOST_DB,
+    LIVE_OVERLOAD_WIDEN_FACTOR,
+)
+from utils.audio_ring_buffer import AudioRingBuffer
+from utils.recording_writer import open_recording_writer
+from utils.latency_metrics import LatencyTrace, latency_metrics
+from speech_Module.live_transcript import LIVE_WORD_TIMESTAMPS, LiveTranscriptLog, result_confidence, sidecar_path
+from speech_Module.decoding_profiles import decode_options, is_silence, transcribe_options
+from speech_Module.whisper_loader import inference_lock
+from speech_Module.language_id import LanguagePin, SUMMARY_LANGUAGE
+from speech_Module.model_cascade import (
+    LIVE_CASCADE,
+    LIVE_CASCADE_FIRST_MODEL,
+    cascade_stats,
+    needs_escalation,
+    result_compression_ratio,
+)
+from speech_Module.live_diarization import LIVE_DIARIZATION, DEFAULT_SPEAKER, LiveSpeakerTracker
+
+# Live ASR windowing (seconds). The window is what Whisper sees per call;
+# consecutive windows overlap by LIVE_ASR_OVERLAP_SECONDS so words falling on
+# a boundary are heard whole by at least one window.
+LIVE_ASR_WINDOW_SECONDS = float(os.getenv("LIVE_ASR_WINDOW_SECONDS", "5"))
+LIVE_ASR_OVERLAP_SECONDS = float(os.getenv("LIVE_ASR_OVERLAP_SECONDS", "1"))
+LIVE_ASR_BUFFER_SECONDS = float(os.getenv("LIVE_ASR_BUFFER_SECONDS", "30"))
+
+# "vad" cuts utterances at natural pauses (speech_Module/vad.py);
+# "fixed" uses the overlapping fixed-length windows above.
+LIVE_ASR_SEGMENTATION = os.getenv("LIVE_ASR_SEGMENTATION", "vad")
+
+
+def _get_meetings_collection():
+    """The meetings collection, imported the same way as the meeting manager"""
+    try:
+        from .database import get_meetings_collection
+    except ImportError:
+        from database import get_meetings_collection
+    return get_meetings_collection()
+
+
+def _warm_translator(src_lang: str, tgt_lang: str):
+    """Load the summary -> meeting language translation model ahead of the summary. Blocking."""
+    try:
+        from nlp_Module.nlp_pipeline import nlp_pipeline
+        nlp_pipeline.warm_translator(src_lang, tgt_lang)
+    except Exception as e:
+        print(f"⚠️  No translation model for {src_lang} -> {tgt_lang}: {e}")
+
+
+def _get_meeting_manager():
+    """
+    The meeting websocket ConnectionManager. main.py imports modules
+    top-level while other callers use the backend package, so try both
+    to get the same instance main.py uses.
+    """
+    try:
+        from .websocket_manager import manager
+    except ImportError:
+        from websocket_manager import manager
+    return manager
+
+
+def pcm16_to_float32(samples: np.ndarray) -> np.ndarray:
+    """Convert int16 PCM to the normalized float32 array Whisper expects (one allocation)"""
+    audio = samples.astype(np.float32)
+    audio *= 1.0 / 32768.0
+    return audio
+
+
+# Result for chunks the energy gate rejected before decoding
+_SILENCE = {"text": "", "avg_logprob": 0.0, "no_speech_prob": 1.0}
+
+
+def _logged_chunk(result: Optional[dict], text: Optional[str], audio_range) -> Optional[dict]:
+    """
+    A chunked-mode result as logged: the overlap-trimmed text, and its words
+    at recording positions. Words that no longer match the trimmed text are
+    left out (post-meeting analysis re-decodes that chunk).
+    """
+    if result is None:
+        return None
+    words = result.get("words")
+    spoken = (text or "").split()
+    if words is not None:
+        # The trim removes leading words, so the text is the tail of the decode
+        words = words[len(words) - len(spoken):] if spoken else []
+        if "".join(w for w, _, _ in words).split() == spoken:
+            words = [(w, audio_range[0] + s, audio_range[0] + e) for w, s, e in words]
+        else:
+            words = None
+    return {**result, "text": text, "words": words}
+
+
 class BotAudioProcessor:
     """Processes audio streams from the meeting bot"""
     
-    def __init__(self, meeting_id: str = "temp"):
-        self.audio_buffer = bytearray()
+    def __init__(
+        self,
+        meeting_id: str = "temp",
+        window_seconds: float = LIVE_ASR_WINDOW_SECONDS,
+        overlap_seconds: float = LIVE_ASR_OVERLAP_SECONDS,
+        buffer_seconds: float = LIVE_ASR_BUFFER_SECONDS,
+        segmentation: str = LIVE_ASR_SEGMENTATION,
+        mode: str = LIVE_ASR_MODE
+    ):
         self.sample_rate = 16000
         self.channels = 1
         self.sample_width = 2  # 16-bit audio
-        self.chunk_duration_seconds = 5  # Process every 5 seconds
-        self.min_chunk_size = self.sample_rate * self.channels * self.sample_width * self.chunk_duration_seconds
+
+        # Sliding window over the ring buffer: each window is `window_samples`
+        # long and the next one starts `stride_samples` later.
+        self.window_samples = int(self.sample_rate * window_seconds)
+        overlap_samples = min(int(self.sample_rate * overlap_seconds), self.window_samples - 1)
+        self.stride_samples = self.window_samples - max(0, overlap_samples)
+
+        # Streaming captions re-decode the open utterance, so they need the VAD
+        self.streaming = mode == "streaming"
+        if self.streaming:
+            segmentation = "vad"
+        self.captions = CaptionStream() if self.streaming else None
+        self.partial_interval_samples = int(self.sample_rate * LIVE_STREAM_PARTIAL_INTERVAL)
+
+        # Pause-based segmentation; None means fixed windows
+        self.segmenter = SpeechSegmenter(sample_rate=self.sample_rate) if segmentation == "vad" else None
+        self._ready_segments = deque()  # (start, end) utterances awaiting ASR
+
+        # Overload actions currently enabled (see speech_Module/overload.py)
+        self.overload = set()
+        self.widen_factor = max(1, LIVE_OVERLOAD_WIDEN_FACTOR)
+        if self.segmenter:
+            self._base_min_silence_frames = self.segmenter.min_silence_frames
+
+        # Queued ASR jobs hold views into the ring, so it must outlive the
+        # deepest backlog the worker pool allows before dropping jobs. A view
+        # overwritten anyway (a sustained backlog) is caught by view_intact.
+        if self.segmenter:
+            chunk_samples = int(self.sample_rate * VAD_MAX_SEGMENT_SECONDS) + 2 * self.segmenter.pad_samples
+            min_capacity = (ASR_MAX_QUEUE_DEPTH + 3) * chunk_samples
+        else:
+            # Widened windows (widen_chunk) are the longest a job can hold
+            widest = self.window_samples * self.widen_factor if "widen_chunk" in LIVE_OVERLOAD_POLICY else 0
+            min_capacity = max(
+                self.window_samples + (ASR_MAX_QUEUE_DEPTH + 2) * self.stride_samples,
+                (ASR_MAX_QUEUE_DEPTH + 3) * widest
+            )
+        capacity = max(int(self.sample_rate * buffer_seconds), min_capacity)
+        self.ring = AudioRingBuffer(capacity)
+        self._window_start = 0
+        self._pending_byte = b""  # Odd trailing byte of a split int16 sample
+        self._last_text = ""
+
+        # Spoken language, detected once from the first seconds of speech
+        self.language = LanguagePin()
+
+        # Live speaker labels from online clustering (LIVE_DIARIZATION=1)
+        self.speakers = LiveSpeakerTracker(sample_rate=self.sample_rate) if LIVE_DIARIZATION else None
+
+        # Ids of broadcast transcript lines, so cascade corrections can replace them
+        self._next_transcript_id = 0
+
+        # ASR jobs not finished yet: (job_id, ring position when queued, audio range).
+        # A meeting's jobs finish in order, so finishing one retires every
+        # older id too (including jobs the pool dropped).
+        self._outstanding = deque()
+        self._next_job_id = 0
+        self.last_chunk_range = None  # (start, end) of the last get_audio_chunk()
         
         # Full audio recording for post-meeting processing
         self.meeting_id = meeting_id
-        self.recording_path = f"temp_recordings/{meeting_id}.wav"
         os.makedirs("temp_recordings", exist_ok=True)
-        self.wave_file = wave.open(self.recording_path, 'wb')
-        self.wave_file.setnchannels(self.channels)
-        self.wave_file.setsampwidth(self.sample_width)
-        self.wave_file.setframerate(self.sample_rate)
-
-    def add_audio_chunk(self, chunk: bytes):
-        """Add audio chunk to buffer and full recording"""
-        self.audio_buffer.extend(chunk)
-        self.wave_file.writeframes(chunk)
+        # Written by a background thread; add_audio_chunk only queues bytes.
+        # The extension follows RECORDING_FORMAT (wav/flac/opus).
+        self.recorder = open_recording_writer(
+            f"temp_recordings/{meeting_id}",
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+            sample_width=self.sample_width
+        )
+        self.recording_path = self.recorder.path
+
+        # Live results next to the recording, so post-meeting analysis can
+        # reuse them instead of transcribing everything again
+        self.transcript_log = LiveTranscriptLog(
+            sidecar_path(self.recording_path),
+            sample_rate=self.sample_rate,
+            segmentation="vad" if self.segmenter else "fixed",
+            # Micro-batched decodes (whisper.decode) have no word timings
+            words=self.streaming or (LIVE_WORD_TIMESTAMPS and not LIVE_ASR_BATCHING)
+        )
+
+    def add_audio_chunk(self, chunk: bytes, marks: Optional[dict] = None):
+        """
+        Add audio chunk to ring buffer and full recording.
+        `marks` receives the "buffered" and "vad" latency timestamps.
+        """
+        if self._pending_byte:
+            chunk = self._pending_byte + chunk
+            self._pending_byte = b""
+        if len(chunk) % self.sample_width:
+            self._pending_byte = chunk[-1:]
+            chunk = chunk[:-1]
+
+        self.ring.write(np.frombuffer(chunk, dtype=np.int16))
+        self.recorder.write(chunk)
+        if marks is not None:
+            marks["buffered"] = time.perf_counter()
+
+        if self.segmenter:
+            self._ready_segments.extend(self.segmenter.push(self.ring))
+        if marks is not None:
+            marks["vad"] = time.perf_counter()
+
+    def next_transcript_id(self) -> int:
+        transcript_id = self._next_transcript_id
+        self._next_transcript_id += 1
+        return transcript_id
+
+    def flush_segments(self):
+        """Close the utterance in progress so it is transcribed (on disconnect)"""
+        if self.segmenter:
+            self._ready_segments.extend(self.segmenter.flush(self.ring))
+
+    def track_job(self, audio_range=None) -> int:
+        """
+        Record that an ASR job covering audio up to now was queued.
+        `audio_range` (start, end) is logged as dropped if the job never finishes.
+        """
+        job_id = self._next_job_id
+        self._next_job_id += 1
+        self._outstanding.append((job_id, self.ring.total_written, audio_range))
+        return job_id
+
+    def job_done(self, job_id: int):
+        """Retire a finished job and every older one (those were dropped or failed)"""
+        while self._outstanding and self._outstanding[0][0] <= job_id:
+            done_id, _, audio_range = self._outstanding.popleft()
+            if done_id != job_id and audio_range and self.transcript_log:
+                self.transcript_log.dropped(*audio_range)
+
+    def log_result(self, audio_range, result: Optional[dict]):
+        """Persist a finished chunk (text, confidence, word timings if decoded) to the live transcript log"""
+        if audio_range is None or not self.transcript_log:
+            return
+        if result is None:
+            self.transcript_log.dropped(*audio_range)
+        else:
+            self.transcript_log.chunk(
+                *audio_range, result["text"], result["avg_logprob"], result["no_speech_prob"],
+                words=result.get("words")
+            )
+
+    def close_transcript_log(self):
+        """Log jobs still queued as dropped (post-meeting analysis re-decodes them) and close"""
+        if not self.transcript_log:
+            return
+        for _, _, audio_range in self._outstanding:
+            if audio_range:
+                self.transcript_log.dropped(*audio_range)
+        self._outstanding.clear()
+        self.transcript_log.close()
+        self.transcript_log = None
+
+    @property
+    def has_outstanding_jobs(self) -> bool:
+        return bool(self._outstanding)
+
+    @property
+    def lag_seconds(self) -> float:
+        """Seconds of audio received since the oldest unfinished ASR job was queued"""
+        if not self._outstanding:
+            return 0.0
+        return (self.ring.total_written - self._outstanding[0][1]) / self.sample_rate
+
+    def set_overload(self, action: str, enabled: bool):
+        """Switch one overload action on or off"""
+        if enabled:
+            self.overload.add(action)
+        else:
+            self.overload.discard(action)
+
+        if action == "widen_chunk" and self.segmenter:
+            # Longer pauses needed to close an utterance -> fewer, longer jobs
+            factor = self.widen_factor if enabled else 1
+            self.segmenter.min_silence_frames = self._base_min_silence_frames * factor
+
+    def _current_window(self):
+        """(window, stride) in samples; widen_chunk drops the overlap and lengthens windows"""
+        if "widen_chunk" in self.overload:
+            window = self.window_samples * self.widen_factor
+            return window, window
+        return self.window_samples, self.stride_samples
+
+    def _next_window_start(self) -> int:
+        # If ASR fell more than a buffer behind, skip the audio that was lost
+        return max(self._window_start, self.ring.oldest_available)
     
     def has_enough_data(self) -> bool:
         """Check if buffer has enough data for processing"""
-        return len(self.audio_buffer) >= self.min_chunk_size
+        if self.segmenter:
+            return bool(self._ready_segments)
+        window, _ = self._current_window()
+        return self.ring.total_written - self._next_window_start() >= window
     
-    def get_audio_chunk(self) -> Optional[bytes]:
-        """Extract and return a chunk of audio for processing"""
+    def get_audio_chunk(self) -> Optional[np.ndarray]:
+        """
+        Return the next window of audio as a zero-copy int16 view.
+        With VAD segmentation this is the next finished utterance; otherwise
+        it overlaps the previous window by `window_samples - stride_samples`.
+        """
         if not self.has_enough_data():
             return None
+
+        if self.segmenter:
+            start, end = self._ready_segments.popleft()
+            if self.captions:
+                # Only the tail not yet promoted by local agreement is re-decoded
+                start = max(start, self.captions.commit_sample)
+            start = min(max(start, self.ring.oldest_available), end)
+            self.last_chunk_range = (start, end)
+            return self.ring.view(start, end)
         
-        # Extract chunk
-        chunk = bytes(self.audio_buffer[:self.min_chunk_size])
-        
-        # Remove processed data from buffer (keep 50% overlap for better continuity)
-        # overlap_size = self.min_chunk_size // 2
-        # self.audio_buffer = self.audio_buffer[self.min_chunk_size - overlap_size:]
-        
-        # For real-time transcription, we might not want overlap if we are just appending text
-        # But overlap helps with words cut in half. 
-        # Let's stick to no overlap for simplicity in this "Brain Layer 1" implementation
-        # as we are just appending text segments.
-        self.audio_buffer = bytearray() # Clear buffer after processing to avoid re-processing
+        window, stride = self._current_window()
+        start = self._next_window_start()
+        chunk = self.ring.view(start, start + window)
+        self._window_start = start + stride
+        self.last_chunk_range = (start, start + window)
         
         return chunk
     
+    def skip_ready_audio(self):
+        """
+        Consume every ready window/utterance without decoding it (live
+        transcription paused by the overload policy). The audio is still in
+        the recording; it is logged as dropped, so post-meeting analysis
+        transcribes it.
+        """
+        while self.has_enough_data():
+            utterance = self._ready_segments[0] if self.segmenter else None
+            self.get_audio_chunk()
+            audio_range = self.last_chunk_range
+            if self.captions:
+                # The open caption's promoted words are part of the skipped utterance
+                self.captions.close(utterance[1])
+                audio_range = utterance
+            if self.transcript_log:
+                self.transcript_log.dropped(*audio_range)
+
+    def get_partial_window(self):
+        """
+        In streaming mode, the uncommitted part of the open utterance if it is
+        time for another partial decode. Returns (start_sample, view) or None.
+        """
+        captions = self.captions
+        if not captions or captions.partial_pending or not self.segmenter.in_speech:
+            return None
+        interval = self.partial_interval_samples
+        if "widen_chunk" in self.overload:
+            interval *= self.widen_factor
+        end = self.ring.total_written
+        if end - captions.last_partial_end < interval:
+            return None
+        start = max(self.segmenter.current_start_sample, captions.commit_sample, self.ring.oldest_available)
+        if end - start < interval:
+            return None
+        captions.partial_pending = True
+        captions.last_partial_end = end
+        return start, self.ring.view(start, end)
+
     def clear_buffer(self):
-        """Clear the audio buffer"""
-        self.audio_buffer.clear()
+        """Drop any buffered audio that has not been windowed yet"""
+        self._window_start = self.ring.total_written
+        self._ready_segments.clear()
+
+    def trim_overlap(self, text: str, max_words: int = 8, previous_text: Optional[str] = None) -> str:
+        """
+        Remove words at the start of `text` that repeat the end of the previous
+        window's text (they were heard twice because windows overlap).
+        Pass `previous_text` to re-trim an older window (a cascade correction)
+        without moving on the previous-window state.
+        """
+        if self.segmenter or self.stride_samples >= self.window_samples:
+            return text
+        if previous_text is None:
+            previous_text = self._last_text
+            self._last_text = text
+        words = text.split()
+        previous = previous_text.split()
+
+        def norm(word):
+            return word.strip(".,!?;:\"'").lower()
+
+        for k in range(min(max_words, len(words), len(previous)), 0, -1):
+            if [norm(w) for w in previous[-k:]] == [norm(w) for w in words[:k]]:
+                return " ".join(words[k:])
+        return text
 
     def finalize_recording(self):
-        """Close the full audio recording file"""
-        if self.wave_file:
-            self.wave_file.close()
-            self.wave_file = None
+        """
+        Close the full audio recording file.
+        Blocks until pending audio is on disk; call it off the event loop.
+        """
+        if self.recorder:
+            self.recorder.close()
+            print(f"💾 Recording stats for {self.meeting_id}: {self.recorder.stats()}")
+            self.recorder = None
         return self.recording_path
     
-    async def process_with_whisper(self, audio_chunk: bytes):
+    def view_intact(self, start_sample: Optional[int]) -> bool:
         """
-        Process audio chunk with Whisper model
-        Returns transcribed text
+        False if the ring has overwritten a queued job's view since it was
+        handed out (the pool fell further behind than the ring holds). Check
+        it after copying the view: if it still holds then, the copy is good.
+        """
+        if start_sample is None or start_sample >= self.ring.oldest_available:
+            return True
+        print(f"⚠️  Audio for meeting {self.meeting_id} was overwritten before it was decoded; dropping it")
+        return False
+
+    def prepare_audio(self, audio_chunk: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Gate silence and convert an int16 window to float32 for Whisper.
+        Returns None for silent chunks.
+        """
+        skip_nonspeech = "skip_nonspeech" in self.overload
+        threshold_dbfs = VAD_THRESHOLD_DBFS + (LIVE_OVERLOAD_GATE_BOOST_DB if skip_nonspeech else 0.0)
+
+        # Cheap gate first: min/max read the view without allocating, so
+        # quiet chunks are dropped before any conversion happens.
+        peak = max(int(audio_chunk.max()), -int(audio_chunk.min())) if len(audio_chunk) else 0
+        if peak < dbfs_to_amplitude(threshold_dbfs):
+            return None
+
+        # VAD segments are speech by construction; fixed windows (and
+        # everything under skip_nonspeech) get a frame-level check so a
+        # single click cannot wake the model.
+        if (self.segmenter is None or skip_nonspeech) and not contains_speech(
+            audio_chunk, self.sample_rate, threshold_dbfs=threshold_dbfs
+        ):
+            return None
+
+        # Whisper takes float32 PCM in [-1, 1) directly; no WAV round trip
+        audio = pcm16_to_float32(audio_chunk)
+        return audio
+
+    async def process_with_whisper_batched(
+        self, audio_chunk: np.ndarray, batcher: MicroBatcher, start_sample: Optional[int] = None
+    ):
+        """
+        Same as process_with_whisper, but decodes through the cross-meeting
+        micro-batcher. Awaits the batch instead of occupying an executor thread.
+        """
+        audio = self.prepare_audio(audio_chunk)
+        if not self.view_intact(start_sample):
+            return None
+        if audio is None:
+            return _SILENCE
+
+        try:
+            language = self.language.language
+            if not self.language.pinned:
+                # Detection is a model call: keep it off the event loop
+                language = await asyncio.get_running_loop().run_in_executor(
+                    asr_pool.executor, self.language.language_for, self._model(escalated=True), audio
+                )
+            result = await batcher.transcribe(audio, language=language)
+            if not LIVE_CASCADE:
+                self.language.observe(result["avg_logprob"], result["no_speech_prob"])
+            # Mirror whisper.transcribe's no-speech rule, which decode() skips
+            text = "" if is_silence(result, "live") else result["text"]
+            return {
+                "text": text,
+                "avg_logprob": result["avg_logprob"],
+                "no_speech_prob": result["no_speech_prob"],
+                "compression_ratio": result["compression_ratio"],
+            }
+        except Exception as e:
+            print(f"❌ Whisper batched transcription error: {e}")
+            return None
+
+    def _model(self, escalated: bool = False):
+        """
+        The live Whisper model, the smaller fallback under downgrade_model,
+        or the cascade's first-tier model (escalated decodes use the live one)
+        """
+        from speech_Module.whisper_loader import get_whisper_model, load_named_model
+
+        if escalated:
+            return get_whisper_model("live")
+        if "downgrade_model" in self.overload:
+            return load_named_model(LIVE_OVERLOAD_MODEL)
+        if LIVE_CASCADE and not self.streaming:
+            return load_named_model(LIVE_CASCADE_FIRST_MODEL)
+        return get_whisper_model("live")
+
+    def transcribe_words(self, audio_chunk: np.ndarray, start_sample: int, final: bool = True):
         """
-        # Optimization: VAD (Voice Activity Detection) to skip silence
-        # Simple energy-based VAD
+        Decode a window with word timestamps for streaming captions.
+        Returns {"words": [(word, start_sample, end_sample), ...], "text",
+        "avg_logprob", "no_speech_prob"} with absolute ring positions
+        (no words for silence), or None on error. Blocking (worker thread).
+        Partials (final=False) neither feed nor trigger language detection.
+        """
+        audio = self.prepare_audio(audio_chunk)
+        if not self.view_intact(start_sample):
+            return None
+        if audio is None:
+            return {**_SILENCE, "words": []}
+
         try:
-            audio_array = np.frombuffer(audio_chunk, dtype=np.int16)
-            rms = np.sqrt(np.mean(audio_array**2))
-            # Threshold can be adjusted. 300-500 is usually a good floor for silence in 16-bit audio
-            if rms < 300: 
-                return ""
+            model = self._model()
+            language = self.language.language_for(model, audio, collect=final)
+            with inference_lock(model):
+                result = model.transcribe(
+                    audio,
+                    **transcribe_options(
+                        "live",
+                        language=language,
+                        task="transcribe",
+                        word_timestamps=True,
+                        condition_on_previous_text=False
+                    )
+                )
+
+            words = []
+            for segment in result.get("segments", []):
+                for word in segment.get("words", []):
+                    words.append((
+                        word["word"],
+                        start_sample + int(word["start"] * self.sample_rate),
+                        start_sample + int(word["end"] * self.sample_rate)
+                    ))
+            avg_logprob, no_speech_prob = result_confidence(result)
+            if final:
+                self.language.observe(avg_logprob, no_speech_prob)
+            return {
+                "words": words,
+                "text": result.get("text", "").strip(),
+                "avg_logprob": avg_logprob,
+                "no_speech_prob": no_speech_prob,
+            }
+
         except Exception as e:
-            print(f"⚠️ VAD check failed: {e}")
+            print(f"❌ Whisper streaming transcription error: {e}")
+            return None
+
+    def process_with_whisper(self, audio_chunk: np.ndarray, escalated: bool = False,
+                             start_sample: Optional[int] = None):
+        """
+        Process audio chunk with Whisper model
+        Returns {"text", "avg_logprob", "no_speech_prob", "compression_ratio",
+        "words"}, or None on error. "words" are (word, start_sample, end_sample)
+        within the chunk, for the live transcript log (LIVE_WORD_TIMESTAMPS). `escalated` re-decodes with the cascade's larger model.
+        `start_sample` is the ring position of a zero-copy `audio_chunk`, to
+        detect it being overwritten while queued (None for copies).
+
+        Blocking: runs on an ASR worker thread, never on the event loop.
+        """
+        audio = self.prepare_audio(audio_chunk)
+        if not self.view_intact(start_sample):
+            return None
+        if audio is None:
+            return _SILENCE
 
         try:
-            # Import whisper model
-            from speech_Module.whisper_loader import get_whisper_model
-            
-            # Create temporary WAV file for Whisper
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                temp_path = temp_wav.name
-                
-                # Write WAV file
-                with wave.open(temp_path, 'wb') as wav_file:
-                    wav_file.setnchannels(self.channels)
-                    wav_file.setsampwidth(self.sample_width)
-                    wav_file.setframerate(self.sample_rate)
-                    wav_file.writeframes(audio_chunk)
+            # Get Whisper model (smaller fallback while overloaded, first tier under the cascade)
+            model = self._model(escalated)
             
-            # Get Whisper model
-            model = get_whisper_model()
-            
-            # Transcribe
-            result = model.transcribe(
-                temp_path,
-                language="en",
-                task="transcribe",
-                fp16=False
-            )
-            
-            # Clean up temp file
-            os.unlink(temp_path)
+            # Transcribe with the deployment's live decoding profile, in the meeting's language
+            language = self.language.language_for(self._model(escalated=True), audio)
+            with inference_lock(model):
+                result = model.transcribe(audio, **transcribe_options(
+                    "live", language=language, task="transcribe", word_timestamps=LIVE_WORD_TIMESTAMPS
+                ))
             
             text = result.get("text", "").strip()
-            return text
+            avg_logprob, no_speech_prob = result_confidence(result)
+            # First-tier confidence says little about the language; escalations follow
+            if escalated or not LIVE_CASCADE:
+                self.language.observe(avg_logprob, no_speech_prob)
+            return {
+                "text": text,
+                "avg_logprob": avg_logprob,
+                "no_speech_prob": no_speech_prob,
+                "compression_ratio": result_compression_ratio(result),
+                "words": [
+                    (word["word"], int(word["start"] * self.sample_rate), int(word["end"] * self.sample_rate))
+                    for segment in result.get("segments", []) for word in segment.get("words", [])
+                ] if LIVE_WORD_TIMESTAMPS else None,
+            }
             
         except Exception as e:
             print(f"❌ Whisper transcription error: {e}")
@@ -130,11 +625,15 @@ class BotConnectionManager:
     def __init__(self):
         self.bot_connections = {}  # meeting_id -> (websocket, processor)
         self.meeting_connections = {}  # meeting_id -> list of client websockets
+        self.overload = {}  # meeting_id -> OverloadController
+        self._rechecks = set()  # meetings with a pending overload re-check
+        self._speaker_tasks = set()  # live speaker labelling in flight (referenced until done)
         
     async def connect_bot(self, websocket: WebSocket, meeting_id: str):
         """Connect a bot to a meeting (websocket already accepted by main endpoint)"""
         processor = BotAudioProcessor(meeting_id=meeting_id)
         self.bot_connections[meeting_id] = (websocket, processor)
+        self.overload[meeting_id] = OverloadController()
         
         print(f"🤖 Bot connected for meeting: {meeting_id}")
         
@@ -142,12 +641,21 @@ class BotConnectionManager:
         """Disconnect bot from meeting and trigger post-processing"""
         if meeting_id in self.bot_connections:
             _, processor = self.bot_connections[meeting_id]
+
+            # Transcribe the last utterance instead of dropping it
+            processor.flush_segments()
+            self._queue_ready_chunks(meeting_id, processor)
             
-            # Finalize recording
-            audio_path = processor.finalize_recording()
+            # Finalize recording (final flush + fsync happen off the event loop)
+            audio_path = await asyncio.get_running_loop().run_in_executor(None, processor.finalize_recording)
+            processor.close_transcript_log()
             print(f"💾 Meeting audio saved to: {audio_path}")
             
             del self.bot_connections[meeting_id]
+            self.overload.pop(meeting_id, None)
+            # Jobs still queued were just logged as dropped (post-meeting analysis
+            # re-decodes them); free the meeting's queue and drop counter
+            asr_pool.discard(meeting_id)
             print(f"🤖 Bot disconnected from meeting: {meeting_id}")
             
             # Trigger Post-Meeting Intelligence (Layer 2)
@@ -161,6 +669,14 @@ class BotConnectionManager:
             except Exception as e:
                 print(f"❌ Failed to trigger analysis: {e}")
     
+    def get_recording_stats(self, meeting_id: Optional[str] = None) -> dict:
+        """Bytes-written and writer lag counters for every live recording (or one meeting's)"""
+        return {
+            mid: processor.recorder.stats()
+            for mid, (_, processor) in self.bot_connections.items()
+            if processor.recorder and meeting_id in (None, mid)
+        }
+
     async def register_client(self, meeting_id: str, client_ws: WebSocket):
         """Register a client WebSocket to receive bot transcriptions"""
         if meeting_id not in self.meeting_connections:
@@ -178,23 +694,44 @@ class BotConnectionManager:
             if not self.meeting_connections[meeting_id]:
                 del self.meeting_connections[meeting_id]
     
-    async def broadcast_transcription(self, meeting_id: str, text: str, speaker: str = "Meeting Bot"):
+    async def broadcast_transcription(
+        self, meeting_id: str, text: str, speaker: str = "Meeting Bot", transcript_id: Optional[int] = None
+    ):
         """
         Broadcast transcription to all connected clients
         PHASE 3: Now also broadcasts to meeting WebSocket for dashboard integration
         """
+        await self._send_to_bot_clients(meeting_id, text, speaker)
+        
+        # PHASE 3: Also broadcast via meeting WebSocket manager for dashboard
+        try:
+            await _get_meeting_manager().broadcast_to_meeting(meeting_id, {
+                "type": "transcript_update",
+                "id": transcript_id,
+                "text": text,
+                "speaker": speaker,
+                "source": "meeting_bot"
+            })
+        except Exception as e:
+            print(f"⚠️  Could not broadcast via meeting manager: {e}")
+
+    async def broadcast_correction(self, meeting_id: str, transcript_id: int, text: str, speaker: str = "Meeting Bot"):
+        """Replace an already broadcast line (same `id`) with the cascade's re-decoded text"""
+        try:
+            await _get_meeting_manager().broadcast_to_meeting(meeting_id, {
+                "type": "transcript_correction",
+                "id": transcript_id,
+                "text": text,
+                "speaker": speaker,
+                "source": "meeting_bot",
+                "timestamp": __import__('datetime').datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            print(f"⚠️  Could not broadcast via meeting manager: {e}")
+
+    async def _send_to_bot_clients(self, meeting_id: str, text: str, speaker: str = "Meeting Bot"):
+        """Send a finished transcription to clients registered directly with the bot manager"""
         if meeting_id not in self.meeting_connections:
-            # Even if no direct connections, try to broadcast via meeting manager
-            try:
-                from .websocket_manager import manager
-                await manager.broadcast_to_meeting(meeting_id, {
-                    "type": "transcript_update",
-                    "text": text,
-                    "speaker": speaker,
-                    "source": "meeting_bot"
-                })
-            except Exception as e:
-                print(f"⚠️  Could not broadcast via meeting manager: {e}")
             return
         
         message = {
@@ -216,40 +753,422 @@ class BotConnectionManager:
         # Clean up disconnected clients
         for client_ws in disconnected:
             await self.unregister_client(meeting_id, client_ws)
-        
-        # PHASE 3: Also broadcast via meeting WebSocket manager for dashboard
+
+    async def broadcast_caption(
+        self,
+        meeting_id: str,
+        seq: int,
+        final_text: str,
+        partial_text: str = "",
+        is_final: bool = False,
+        speaker: str = "Meeting Bot"
+    ):
+        """
+        Broadcast a streaming caption. Messages share `seq` per utterance so
+        clients can replace a partial caption in place; `final_text` will not
+        change any more, `partial_text` may.
+        """
+        message = {
+            "type": "transcript_final" if is_final else "transcript_partial",
+            "seq": seq,
+            "text": " ".join(t for t in (final_text, partial_text) if t),
+            "final_text": final_text,
+            "partial_text": partial_text,
+            "speaker": speaker,
+            "source": "meeting_bot",
+            "timestamp": __import__('datetime').datetime.utcnow().isoformat()
+        }
         try:
-            from .websocket_manager import manager
-            await manager.broadcast_to_meeting(meeting_id, {
-                "type": "transcript_update",
-                "text": text,
-                "speaker": speaker,
-                "source": "meeting_bot"
-            })
+            await _get_meeting_manager().broadcast_to_meeting(meeting_id, message)
         except Exception as e:
             print(f"⚠️  Could not broadcast via meeting manager: {e}")
-    
-    async def process_audio_chunk(self, meeting_id: str, audio_data: bytes):
-        """Process incoming audio chunk from bot"""
+
+    async def process_audio_chunk(self, meeting_id: str, audio_data: bytes, received_at: Optional[float] = None):
+        """
+        Process incoming audio chunk from bot.
+        Only buffers audio and queues ASR jobs; never waits on inference.
+        `received_at` is the perf_counter time the websocket message arrived.
+        """
         if meeting_id not in self.bot_connections:
             return
         
         _, processor = self.bot_connections[meeting_id]
+        marks = {"receive": received_at if received_at is not None else time.perf_counter()}
         
         # Add chunk to buffer
-        processor.add_audio_chunk(audio_data)
+        processor.add_audio_chunk(audio_data, marks)
         
-        # Process if we have enough data
-        if processor.has_enough_data():
+        self._queue_ready_chunks(meeting_id, processor, marks)
+        await self._check_overload(meeting_id, processor)
+
+    def _submit(
+        self, meeting_id: str, processor: BotAudioProcessor, func, *args, on_result=None, trace=None,
+        audio_range=None
+    ) -> bool:
+        """
+        Queue an ASR job and track it for ingest lag and latency.
+        A job with an `audio_range` is logged as dropped in the live
+        transcript log if it never finishes; `on_result` logs its result.
+        """
+        job_id = processor.track_job(audio_range)
+        if trace is not None:
+            trace.mark("queued")
+
+        async def on_done(result):
+            processor.job_done(job_id)
+            if on_result:
+                await on_result(result)
+            await self._report_language(meeting_id, processor)
+            # Only jobs whose text reached clients count towards latency
+            if trace is not None and trace.has("broadcast"):
+                latency_metrics.record(meeting_id, trace)
+            await self._check_overload(meeting_id, processor)
+
+        return asr_pool.submit(meeting_id, func, *args, on_result=on_done, trace=trace)
+
+    def _trace(self, processor: BotAudioProcessor, audio_chunk, marks: Optional[dict], kind: str) -> LatencyTrace:
+        return LatencyTrace(len(audio_chunk) / processor.sample_rate, kind=kind, **(marks or {}))
+
+    async def _check_overload(self, meeting_id: str, processor: BotAudioProcessor):
+        """Apply the overload policy to the meeting's current lag and report changes"""
+        controller = self.overload.get(meeting_id)
+        if controller is None:
+            return
+
+        decision = controller.update(processor.lag_seconds)
+        if decision is None:
+            # Without queued jobs, audio arriving does not change the lag: re-check on a timer
+            if controller.level and not processor.has_outstanding_jobs:
+                self._schedule_overload_recheck(meeting_id, processor, controller.cooldown)
+            return
+
+        action, enabled = decision
+        processor.set_overload(action, enabled)
+        if action == "pause_bot":
+            await self._send_to_bot(meeting_id, {
+                "type": "ingest_control",
+                "action": "pause" if enabled else "resume"
+            })
+
+        lag = processor.lag_seconds
+        print(f"{'⚠️ ' if enabled else '✅'} Ingest lag {lag:.1f}s for {meeting_id}: "
+              f"{action} {'on' if enabled else 'off'}")
+        try:
+            await _get_meeting_manager().broadcast_to_meeting(meeting_id, {
+                "type": "ingest_status",
+                "action": action,
+                "enabled": enabled,
+                "active_actions": controller.active,
+                "lag_seconds": round(lag, 2),
+                "queue_depth": asr_pool.queue_depth(meeting_id),
+                "dropped_chunks": asr_pool.dropped.get(meeting_id, 0),
+                "timestamp": __import__('datetime').datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            print(f"⚠️  Could not broadcast via meeting manager: {e}")
+
+    def _schedule_overload_recheck(self, meeting_id: str, processor: BotAudioProcessor, delay: float):
+        if meeting_id in self._rechecks:
+            return
+        self._rechecks.add(meeting_id)
+
+        async def recheck():
+            await asyncio.sleep(delay)
+            self._rechecks.discard(meeting_id)
+            if meeting_id in self.bot_connections:
+                await self._check_overload(meeting_id, processor)
+
+        asyncio.create_task(recheck())
+
+    async def _report_language(self, meeting_id: str, processor: BotAudioProcessor):
+        """Once a meeting's language is pinned: record it, tell clients, warm its translator"""
+        change = processor.language.take_change()
+        if change is None:
+            return
+        language, probability = change
+        print(f"🌐 Meeting {meeting_id} language: {language} ({probability:.0%})")
+
+        if processor.transcript_log:
+            processor.transcript_log.language(language, probability)
+
+        try:
+            await _get_meeting_manager().broadcast_to_meeting(meeting_id, {
+                "type": "language_detected",
+                "language": language,
+                "probability": round(probability, 3),
+                "timestamp": __import__('datetime').datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            print(f"⚠️  Could not broadcast via meeting manager: {e}")
+
+        try:
+            from bson import ObjectId
+            meeting_key = ObjectId(meeting_id) if ObjectId.is_valid(meeting_id) else meeting_id
+            await _get_meetings_collection().update_one(
+                {"_id": meeting_key},
+                {"$set": {"language": language, "language_probability": round(probability, 3)}}
+            )
+        except Exception as e:
+            print(f"⚠️  Could not save meeting language: {e}")
+
+        if language != SUMMARY_LANGUAGE:
+            asyncio.get_running_loop().run_in_executor(None, _warm_translator, SUMMARY_LANGUAGE, language)
+
+    async def _identify_speaker(
+        self, meeting_id: str, processor: BotAudioProcessor, audio_chunk: np.ndarray, audio_range
+    ) -> str:
+        """Live speaker label of a transcribed chunk; relabels merged speakers on the clients"""
+        tracker = processor.speakers
+        if tracker is None:
+            return DEFAULT_SPEAKER
+
+        label, merges = await tracker.identify(audio_chunk)
+        for old, new in merges:
+            print(f"👥 {old} merged into {new} in meeting {meeting_id}")
+            if processor.transcript_log:
+                processor.transcript_log.speaker_merge(old, new)
+            try:
+                await _get_meeting_manager().broadcast_to_meeting(meeting_id, {
+                    "type": "speaker_merged",
+                    "from": old,
+                    "into": new,
+                    "timestamp": __import__('datetime').datetime.utcnow().isoformat()
+                })
+            except Exception as e:
+                print(f"⚠️  Could not broadcast via meeting manager: {e}")
+
+        if label != DEFAULT_SPEAKER and audio_range and processor.transcript_log:
+            processor.transcript_log.speaker(*audio_range, label)
+        return label
+
+    def _provisional_speaker(self, processor: BotAudioProcessor) -> str:
+        """Label shown with a new line until its own speaker is known: the previous speaker"""
+        return processor.speakers.current if processor.speakers is not None else DEFAULT_SPEAKER
+
+    def _label_speaker(
+        self, meeting_id: str, processor: BotAudioProcessor, audio_chunk: np.ndarray, audio_range,
+        provisional: str, **line
+    ) -> Optional[asyncio.Task]:
+        """
+        Identify a chunk's speaker without holding up its caption. Once known,
+        clients get a "speaker_update" for the line (`id=` or `seq=`) if it
+        differs from the `provisional` label it was sent with. Returns the
+        task (its result is the label), or None without live diarization.
+        """
+        if processor.speakers is None:
+            return None
+        audio_chunk = np.array(audio_chunk)  # The ring buffer may move on before the task runs
+
+        async def label():
+            try:
+                speaker = await self._identify_speaker(meeting_id, processor, audio_chunk, audio_range)
+            except Exception as e:
+                print(f"⚠️  Live speaker identification failed: {e}")
+                return provisional
+            if speaker != provisional and any(v is not None for v in line.values()):
+                await self.broadcast_speaker(meeting_id, speaker, **line)
+            return speaker
+
+        task = asyncio.create_task(label())
+        self._speaker_tasks.add(task)
+        task.add_done_callback(self._speaker_tasks.discard)
+        return task
+
+    async def broadcast_speaker(self, meeting_id: str, speaker: str, **line):
+        """Set the speaker of an already broadcast line (`id` for transcript lines, `seq` for captions)"""
+        try:
+            await _get_meeting_manager().broadcast_to_meeting(meeting_id, {
+                "type": "speaker_update",
+                **line,
+                "speaker": speaker,
+                "source": "meeting_bot",
+                "timestamp": __import__('datetime').datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            print(f"⚠️  Could not broadcast via meeting manager: {e}")
+
+    async def _send_to_bot(self, meeting_id: str, message: dict):
+        """Send a control message back over the bot's audio websocket"""
+        if meeting_id not in self.bot_connections:
+            return
+        websocket, _ = self.bot_connections[meeting_id]
+        try:
+            await websocket.send_json(message)
+        except Exception as e:
+            print(f"⚠️  Could not send {message.get('type')} to bot: {e}")
+
+    def _queue_ready_chunks(self, meeting_id: str, processor: BotAudioProcessor, marks: Optional[dict] = None):
+        """Queue every window/utterance that is ready for ASR"""
+        if "pause_bot" in processor.overload:
+            processor.skip_ready_audio()
+            return
+        if processor.streaming:
+            self._queue_streaming(meeting_id, processor, marks)
+            return
+
+        while processor.has_enough_data():
             audio_chunk = processor.get_audio_chunk()
-            if audio_chunk:
-                # Process with Whisper
-                text = await processor.process_with_whisper(audio_chunk)
-                
+            if audio_chunk is None:
+                break
+            trace = self._trace(processor, audio_chunk, marks, "chunk")
+            audio_range = processor.last_chunk_range
+
+            async def on_text(result, processor=processor, trace=trace, audio_range=audio_range,
+                              audio_chunk=audio_chunk):
+                previous_text = processor._last_text
+                text = result["text"] if result else None
+                if text:
+                    text = processor.trim_overlap(text)
+
+                escalate = LIVE_CASCADE and needs_escalation(result) and not processor.overload
+                if LIVE_CASCADE and result is not None:
+                    cascade_stats.record_decode(
+                        meeting_id, "first", len(audio_chunk) / processor.sample_rate, escalated=escalate
+                    )
+                # Logged after trimming, so overlapping windows do not repeat words.
+                # Escalated chunks are logged once the larger model has decoded them.
+                if not escalate:
+                    processor.log_result(audio_range, _logged_chunk(result, text, audio_range))
+
+                transcript_id = None
+                speaker = self._provisional_speaker(processor)
                 if text:
                     print(f"🎤 Transcribed: {text[:50]}...")
-                    # Broadcast to clients
-                    await self.broadcast_transcription(meeting_id, text)
+                    # Broadcast to clients; the speaker label follows once identified
+                    transcript_id = processor.next_transcript_id()
+                    await self.broadcast_transcription(meeting_id, text, speaker, transcript_id=transcript_id)
+                    trace.mark("broadcast")
+                speaker_task = None
+                if text or escalate:
+                    speaker_task = self._label_speaker(
+                        meeting_id, processor, audio_chunk, audio_range, speaker, id=transcript_id
+                    )
+
+                if escalate:
+                    self._escalate(
+                        meeting_id, processor, np.array(audio_chunk), audio_range, transcript_id, text, previous_text,
+                        speaker, speaker_task
+                    )
+
+            # The fallback model is not batched with the other meetings
+            if live_batcher is not None and "downgrade_model" not in processor.overload:
+                accepted = self._submit(
+                    meeting_id, processor, processor.process_with_whisper_batched, audio_chunk, live_batcher,
+                    audio_range[0], on_result=on_text, trace=trace, audio_range=audio_range
+                )
+            else:
+                accepted = self._submit(
+                    meeting_id, processor, processor.process_with_whisper, audio_chunk, False, audio_range[0],
+                    on_result=on_text, trace=trace, audio_range=audio_range
+                )
+            if not accepted:
+                print(f"⚠️  ASR queue full for meeting {meeting_id}, dropped oldest chunk")
+
+    def _escalate(
+        self, meeting_id: str, processor: BotAudioProcessor, audio_chunk: np.ndarray, audio_range,
+        transcript_id: Optional[int], first_text: Optional[str], previous_text: str,
+        speaker: str = DEFAULT_SPEAKER, speaker_task: Optional[asyncio.Task] = None
+    ):
+        """
+        Re-decode a chunk the first-tier model was unsure about and correct its
+        line in place. `speaker_task` is the chunk's speaker identification,
+        if still running (its label replaces `speaker`).
+        """
+        trace = LatencyTrace(len(audio_chunk) / processor.sample_rate, kind="escalated")
+
+        async def on_escalated(result):
+            text = result["text"] if result else None
+            if text:
+                text = processor.trim_overlap(text, previous_text=previous_text)
+            processor.log_result(audio_range, _logged_chunk(result, text, audio_range))
+            if result is None:
+                return
+            cascade_stats.record_decode(meeting_id, "escalated", len(audio_chunk) / processor.sample_rate)
+            if (text or "") == (first_text or ""):
+                return
+            cascade_stats.record_correction(meeting_id)
+            label = await speaker_task if speaker_task is not None else speaker
+            if transcript_id is not None:
+                print(f"🔁 Corrected: {(text or '')[:50]}...")
+                await self.broadcast_correction(meeting_id, transcript_id, text or "", label)
+                trace.mark("broadcast")
+            elif text:
+                # The first pass was trimmed away entirely: this is a new line
+                await self.broadcast_transcription(
+                    meeting_id, text, label, transcript_id=processor.next_transcript_id()
+                )
+                trace.mark("broadcast")
+
+        self._submit(
+            meeting_id, processor, processor.process_with_whisper, audio_chunk, True,  # escalated
+            on_result=on_escalated, trace=trace, audio_range=audio_range
+        )
+
+    def _queue_streaming(self, meeting_id: str, processor: BotAudioProcessor, marks: Optional[dict] = None):
+        """Queue final decodes for closed utterances and a partial for the open one"""
+        captions = processor.captions
+
+        while processor.has_enough_data():
+            utterance = processor._ready_segments[0]
+            end = utterance[1]
+            audio_chunk = processor.get_audio_chunk()
+            start = end - len(audio_chunk)
+            seq, final_words, commit_sample = captions.close(end)
+            trace = self._trace(processor, audio_chunk, marks, "final")
+
+            async def on_final(result, seq=seq, final_words=final_words, commit_sample=commit_sample, trace=trace,
+                               utterance=utterance, audio_chunk=audio_chunk):
+                words = result["words"] if result else []
+                caption = captions.finish(final_words, words, commit_sample)
+                text = join_words(caption)
+                # The whole utterance is logged: its caption includes words promoted by earlier partials
+                processor.log_result(utterance, {**result, "text": text, "words": caption} if result else None)
+                if text:
+                    print(f"🎤 Transcribed: {text[:50]}...")
+                    # The speaker label follows once identified
+                    speaker = self._provisional_speaker(processor)
+                    await self.broadcast_caption(meeting_id, seq, text, is_final=True, speaker=speaker)
+                    trace.mark("broadcast")
+                    await self._send_to_bot_clients(meeting_id, text, speaker)
+                    self._label_speaker(meeting_id, processor, audio_chunk, utterance, speaker, seq=seq)
+
+            self._submit(
+                meeting_id, processor, processor.transcribe_words, audio_chunk, start, on_result=on_final, trace=trace,
+                audio_range=utterance
+            )
+
+        window = processor.get_partial_window()
+        if window:
+            start, audio_chunk = window
+            seq = captions.seq
+            trace = self._trace(processor, audio_chunk, marks, "partial")
+
+            async def on_partial(result, seq=seq, trace=trace):
+                if seq == captions.seq:
+                    captions.partial_pending = False
+                if result is not None and captions.apply_partial(seq, result["words"]):
+                    # Provisional: the final caption carries this utterance's own speaker
+                    speaker = processor.speakers.current if processor.speakers else DEFAULT_SPEAKER
+                    await self.broadcast_caption(
+                        meeting_id, seq, captions.final_text, captions.partial_text, speaker=speaker
+                    )
+                    trace.mark("broadcast")
+
+            self._submit(
+                meeting_id, processor, processor.transcribe_words, audio_chunk, start, False,  # not final
+                on_result=on_partial, trace=trace
+            )
+
+# Cross-meeting micro-batcher (LIVE_ASR_BATCHING=1); shares the ASR pool's threads
+live_batcher = (
+    MicroBatcher(
+        asr_pool.executor,
+        # Under the cascade only first-tier decodes are batched
+        model_name=LIVE_CASCADE_FIRST_MODEL if LIVE_CASCADE else None,
+        **decode_options("live", task="transcribe")
+    )
+    if LIVE_ASR_BATCHING else None
+)
 
 # Global bot manager instance
 bot_manager = BotConnectionManager()
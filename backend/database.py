@@ -47,3 +47,8 @@ def get_meetings_collection():
     """Get meetings collection"""
     db = Database.get_database()
     return db.meetings
+
+def get_word_timings_collection():
+    """Get word timings collection (columnar word timestamps, one document per meeting)"""
+    db = Database.get_database()
+    return db.word_timings
@@ -0,0 +1,243 @@
+# backend/diarization_worker.py
+"""
+Speaker diarization in a dedicated worker process.
+
+pyannote holds the GIL and every core for minutes per recording, and a bad
+file can hang it. Running it inline pinned the event loop, so one upload
+stalled every other user's API calls. Here a single long-lived process
+loads the pipeline once with DIARIZATION_TORCH_THREADS threads and runs one
+job at a time. The process is spawned rather than forked: a fork of a
+server that has touched CUDA (or holds torch's thread pools) can hang or
+fail without an error in the child.
+
+    segments = await diarization_worker.diarize(audio_path)   # from async code
+    segments = diarization_worker.run(audio_path)             # from a worker thread
+
+Async callers that go through run() (e.g. a JobContext stage) should run it
+on `diarization_worker.executor`, a single thread that queues jobs, rather
+than parking a default-executor thread per waiting job.
+
+A job that exceeds DIARIZATION_TIMEOUT_SECONDS, is cancelled, or crashes the
+process gets [] back (callers already treat [] as "no speaker labels"), and
+the process is restarted for the next job. DIARIZATION_WORKER=0 runs
+pyannote in-process on a thread instead.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+DIARIZATION_WORKER = os.getenv("DIARIZATION_WORKER", "1") == "1"
+DIARIZATION_TIMEOUT_SECONDS = float(os.getenv("DIARIZATION_TIMEOUT_SECONDS", "1800"))
+DIARIZATION_TORCH_THREADS = int(os.getenv(
+    "DIARIZATION_TORCH_THREADS", str(max(1, (os.cpu_count() or 2) // 2))
+))
+
+# Time allowed for the worker to start and load the pipeline
+_STARTUP_TIMEOUT_SECONDS = 600
+
+
+def _import_diarization():
+    # Same module whether the server imported us as `backend.x` or top-level `x`
+    try:
+        from . import speaker_diarization
+    except ImportError:
+        import speaker_diarization
+    return speaker_diarization
+
+
+def _worker_main(conn, threads: int):
+    """Worker process: load the pipeline once, then diarize paths sent over `conn`"""
+    try:
+        import torch
+        torch.set_num_threads(max(1, threads))
+    except ImportError:
+        pass
+
+    try:
+        diarization = _import_diarization()
+        available = diarization.get_pipeline() is not None
+    except Exception as e:
+        print(f"⚠️  Diarization worker could not load pyannote: {str(e)[:100]}")
+        available = False
+    conn.send(("ready", available))
+    if not available:
+        return
+
+    while True:
+        try:
+            job_id, audio_path = conn.recv()
+        except (EOFError, OSError):
+            return  # Server went away
+        try:
+            conn.send(("ok", job_id, diarization.diarize_audio(audio_path)))
+        except Exception as e:
+            conn.send(("error", job_id, str(e)))
+
+
+class DiarizationJob:
+    def __init__(self, audio_path: str):
+        self.audio_path = audio_path
+        self.cancelled = False
+
+
+class DiarizationWorker:
+    """Owns the worker process; jobs run one at a time in submission order"""
+
+    def __init__(self, timeout: float = DIARIZATION_TIMEOUT_SECONDS, threads: int = DIARIZATION_TORCH_THREADS):
+        self.timeout = timeout
+        self.threads = threads
+        self.available = True  # False once the worker reports no pipeline (e.g. no HF token)
+        self._process = None
+        self._conn = None
+        self._ready = False
+        self._current = None
+        self._next_job_id = 0
+        self._lock = threading.Lock()  # one job at a time
+        self._process_lock = threading.Lock()
+        # Async callers queue here instead of parking default-executor threads on _lock
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarization")
+
+    # --- process lifecycle ---------------------------------------------------
+
+    def start(self):
+        """Spawn the worker (it preloads the pipeline); returns without waiting"""
+        with self._process_lock:
+            if self._process is not None and self._process.is_alive():
+                return
+            context = multiprocessing.get_context("spawn")
+            parent_conn, child_conn = context.Pipe()
+            self._process = context.Process(
+                target=_worker_main, args=(child_conn, self.threads), name="diarization-worker", daemon=True
+            )
+            self._process.start()
+            child_conn.close()
+            self._conn = parent_conn
+            self._ready = False
+            print(f"👥 Diarization worker started (pid {self._process.pid}, {self.threads} torch threads)")
+
+    def _kill(self):
+        with self._process_lock:
+            if self._process is not None:
+                if self._process.is_alive():
+                    self._process.terminate()
+                    self._process.join(5)
+                    if self._process.is_alive():
+                        self._process.kill()
+                self._process = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._ready = False
+
+    def shutdown(self):
+        self._kill()
+
+    def _receive(self, deadline: float):
+        """Next message from the worker, or None on timeout, crash or cancellation"""
+        conn = self._conn
+        try:
+            if conn is None or not conn.poll(max(0.0, deadline - time.monotonic())):
+                return None
+            return conn.recv()
+        except (EOFError, OSError):
+            return None
+
+    # --- jobs ----------------------------------------------------------------
+
+    def run(self, audio_path: str, timeout: Optional[float] = None, job: Optional[DiarizationJob] = None) -> List[dict]:
+        """Diarize `audio_path` in the worker. Blocking; returns [] on any failure."""
+        if not DIARIZATION_WORKER:
+            return _import_diarization().diarize_audio(audio_path) or []
+
+        job = job or DiarizationJob(audio_path)
+        with self._lock:
+            if job.cancelled or not self.available:
+                return []
+            self._current = job
+            try:
+                return self._run_locked(job, timeout if timeout is not None else self.timeout)
+            finally:
+                self._current = None
+
+    def _run_locked(self, job: DiarizationJob, timeout: float) -> List[dict]:
+        started = time.monotonic()
+        self.start()
+
+        if not self._ready:
+            message = self._receive(time.monotonic() + _STARTUP_TIMEOUT_SECONDS)
+            if message is None:
+                print("⚠️  Diarization worker failed to start - continuing without speaker labels")
+                self._kill()
+                return []
+            self._ready = True
+            self.available = message[1]
+            if not self.available:
+                print("ℹ️  Speaker diarization skipped (not configured)")
+                self._kill()
+                return []
+
+        self._next_job_id += 1
+        job_id = self._next_job_id
+        try:
+            self._conn.send((job_id, job.audio_path))
+        except (OSError, AttributeError):
+            self._kill()
+            return []
+
+        message = self._receive(started + timeout)
+        if message is None or message[1] != job_id:
+            if job.cancelled:
+                print(f"🛑 Diarization cancelled: {job.audio_path}")
+            elif self._process is not None and not self._process.is_alive():
+                print(f"❌ Diarization worker crashed (exit code {self._process.exitcode}) - no speaker labels")
+            else:
+                print(f"⏱️  Diarization timed out after {timeout:.0f}s - no speaker labels")
+            # A stuck or dead worker is replaced before the next job
+            self._kill()
+            return []
+
+        status, _, payload = message
+        if status != "ok":
+            print(f"❌ Diarization error: {payload}")
+            return []
+        return payload or []
+
+    def cancel(self, job: DiarizationJob):
+        """
+        Cancel a queued job, or kill the worker if it is the one running.
+        Blocking (up to a few seconds while the worker exits); use acancel()
+        from async code.
+        """
+        job.cancelled = True
+        if self._current is job:
+            self._kill()
+
+    async def acancel(self, job: DiarizationJob):
+        """`cancel` without blocking the event loop"""
+        job.cancelled = True  # At once, so a queued job never starts
+        await asyncio.get_running_loop().run_in_executor(None, self.cancel, job)
+
+    async def diarize(self, audio_path: str, timeout: Optional[float] = None) -> List[dict]:
+        """
+        Diarize without blocking the event loop. Cancelling the awaiting task
+        cancels the job (killing the worker if it is already running).
+        """
+        job = DiarizationJob(audio_path)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self.run, audio_path, timeout, job)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            job.cancelled = True
+            # Killing a running worker waits for it to exit: do that off the
+            # event loop, without holding up the cancellation
+            loop.run_in_executor(None, self.cancel, job)
+            raise
+
+
+# Shared worker for every diarization caller in this process
+diarization_worker = DiarizationWorker()
@@ -16,6 +16,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import asyncio
 import subprocess
+import time
 import json
 
 # Append project root to sys.path **before** importing from utils or other root modules
@@ -47,10 +48,12 @@ except Exception as e:
 from utils.pdf_generator import generate_pdf
 from utils.email_utils import send_email_with_attachment
 from pipeline_runner import run_pipeline_from_audio, run_pipeline_from_transcript
+from diarization_worker import DIARIZATION_WORKER, DiarizationJob, diarization_worker
+from utils.job_context import JobContext, inputs_key
 from nlp_Module.nlp_pipeline import nlp_pipeline  # Preload models
 
 # Import authentication and database modules
-from database import Database, get_users_collection, get_meetings_collection
+from database import Database, get_users_collection, get_meetings_collection, get_word_timings_collection
 from auth import (
     get_password_hash,
     verify_password,
@@ -72,7 +75,15 @@ from models import (
     ChatResponse
 )
 from websocket_manager import manager
-from bot_audio_processor import bot_manager
+from speech_Module.asr_worker_pool import asr_pool
+from speech_Module.parallel_transcribe import shutdown_transcribe_pool
+from utils.recording_writer import prune_recordings
+from utils.latency_metrics import latency_metrics
+from speech_Module.model_cascade import cascade_stats
+from utils.word_timings import fetch_word_timings
+# Aliased: ora_bot_manager's `bot_manager` is imported further down and would
+# otherwise shadow the audio manager used by /ws/bot-audio.
+from bot_audio_processor import bot_manager as bot_audio_manager
 import logging
 
 # Setup logger
@@ -95,12 +106,18 @@ app.add_middleware(
 async def startup_event():
     """Connect to MongoDB on startup"""
     await Database.connect_db()
+    removed = prune_recordings()
+    if removed:
+        print(f"🧹 Pruned {removed} old meeting recording(s)")
     print("✅ Application started")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close MongoDB connection on shutdown"""
     await Database.close_db()
+    asr_pool.shutdown()
+    shutdown_transcribe_pool()
+    diarization_worker.shutdown()
     print("✅ Application shutdown")
 
 # This dictionary will hold our models once loaded
@@ -341,7 +358,7 @@ async def bot_audio_websocket(websocket: WebSocket):
         print(f"🤖 Bot connected for meeting: {meeting_id}, sample rate: {sample_rate}")
         
         # Register bot connection
-        await bot_manager.connect_bot(websocket, meeting_id)
+        await bot_audio_manager.connect_bot(websocket, meeting_id)
         
         # Send acknowledgment
         await websocket.send_json({
@@ -355,9 +372,10 @@ async def bot_audio_websocket(websocket: WebSocket):
             try:
                 # Receive audio chunk (binary)
                 audio_data = await websocket.receive_bytes()
+                received_at = time.perf_counter()
                 
-                # Process the audio chunk
-                await bot_manager.process_audio_chunk(meeting_id, audio_data)
+                # Buffer the chunk and queue ASR; inference runs on the worker pool
+                await bot_audio_manager.process_audio_chunk(meeting_id, audio_data, received_at)
                 
             except Exception as e:
                 # Check if it's a disconnect or error
@@ -371,7 +389,7 @@ async def bot_audio_websocket(websocket: WebSocket):
         print(f"❌ Bot audio WebSocket error: {e}")
     finally:
         if meeting_id:
-            await bot_manager.disconnect_bot(meeting_id)
+            await bot_audio_manager.disconnect_bot(meeting_id)
 
 
 # ====== HELPER FUNCTIONS ======
@@ -607,6 +625,50 @@ async def get_live_transcript(
         "status": meeting["status"]
     }
 
+# GET /api/meetings/{meeting_id}/words - Word timings for an audio timeline range (PROTECTED)
+@app.get("/api/meetings/{meeting_id}/words")
+async def get_meeting_words(
+    meeting_id: str,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    current_user: str = Depends(get_current_user_email)
+):
+    """
+    Word-level timestamps overlapping [start, end) seconds, as parallel
+    columns {"start", "end", "prob", "word"} (compact for long ranges)
+    """
+    timings = await fetch_word_timings(meeting_id, get_word_timings_collection())
+    if timings is None:
+        return JSONResponse(status_code=404, content={"error": "No word timings for this meeting"})
+
+    words = timings.range(start, end if end is not None else float("inf"))
+    return {
+        "meeting_id": meeting_id,
+        "word_count": words.stop - words.start,
+        "words": timings.columns(words)
+    }
+
+# GET /api/meetings/{meeting_id}/search - Find a word or phrase in the meeting audio (PROTECTED)
+@app.get("/api/meetings/{meeting_id}/search")
+async def search_meeting_words(
+    meeting_id: str,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: str = Depends(get_current_user_email)
+):
+    """Every time a word or phrase was spoken, with its position in the recording"""
+    timings = await fetch_word_timings(meeting_id, get_word_timings_collection())
+    if timings is None:
+        return JSONResponse(status_code=404, content={"error": "No word timings for this meeting"})
+
+    hits = timings.search(q, limit=limit)
+    return {
+        "meeting_id": meeting_id,
+        "query": q,
+        "count": len(hits),
+        "results": hits
+    }
+
 # POST /api/meetings/{meeting_id}/upload-audio - Upload audio for processing (PROTECTED)
 @app.post("/api/meetings/{meeting_id}/upload-audio")
 async def upload_meeting_audio(
@@ -659,18 +721,22 @@ async def upload_meeting_audio(
                 "stage": "diarization"
             })
 
-        # Diarization (optional feature)
-        diarization_result = []
+        # Every stage runs once per upload; the pipeline reuses this job's diarization
+        loop = asyncio.get_running_loop()
+        job = JobContext(audio_path)
+
+        # Diarization (optional feature), running while the pipeline transcribes
+        diarization_task = None
+        diarization_job = DiarizationJob(audio_path)
         if SPEAKER_DIARIZATION_AVAILABLE and diarize_audio:
-            try:
-                diarization_result = diarize_audio(audio_path) or []
-                if meeting:
-                    meeting["diarization"] = diarization_result
-            except Exception as e:
-                print("Diarization failed:", e)
+            diarization_task = asyncio.ensure_future(
+                job.aget_or_compute(
+                    "diarization", diarization_worker.run, audio_path, None, diarization_job,
+                    executor=diarization_worker.executor
+                )
+            )
         else:
             print("⚠️  Speaker diarization skipped (not available)")
-            diarization_result = []
 
         # Send WebSocket update: Transcription starting
         await manager.send_status_update(meeting_id, "processing", {
@@ -679,7 +745,25 @@ async def upload_meeting_audio(
         })
 
         # Run pipeline
-        result = run_pipeline_from_audio(audio_path, lang)
+        try:
+            result = await loop.run_in_executor(None, lambda: run_pipeline_from_audio(audio_path, lang, job=job))
+        except BaseException:
+            # The upload failed: nothing will use its speaker labels
+            if diarization_task is not None:
+                await diarization_worker.acancel(diarization_job)
+                diarization_task.cancel()
+            raise
+        finally:
+            job.close()
+
+        diarization_result = []
+        if diarization_task is not None:
+            try:
+                diarization_result = await diarization_task
+                if meeting:
+                    meeting["diarization"] = diarization_result
+            except Exception as e:
+                print("Diarization failed:", e)
 
         # Get transcript segments
         transcript_segments = result.get("transcript_segments")
@@ -691,10 +775,13 @@ async def upload_meeting_audio(
             "stage": "alignment"
         })
 
-        # Align with diarization
+        # Align with diarization (the pipeline may have aligned already)
         speaker_aligned = []
         if transcript_segments and diarization_result:
-            speaker_aligned = align_transcript_with_diarization(transcript_segments, diarization_result)
+            speaker_aligned = job.get_or_compute(
+                "alignment", align_transcript_with_diarization, transcript_segments, diarization_result,
+                key=inputs_key(transcript_segments, diarization_result)
+            )
         elif full_transcript and diarization_result:
             speaker_aligned = naive_align_text_to_diarization(full_transcript, diarization_result)
         
@@ -1333,12 +1420,28 @@ async def load_models():
         print("✅ NLP models loaded and ready.")
     except Exception as e:
         print("⚠️  Warning: failed to preload NLP pipeline:", e)
+
+    # preload the live Whisper model so the first caption is not delayed
+    # (the offline model loads on first use)
+    try:
+        from speech_Module.whisper_loader import get_whisper_model, load_named_model
+        from speech_Module.model_cascade import LIVE_CASCADE, LIVE_CASCADE_FIRST_MODEL
+        get_whisper_model("live")
+        if LIVE_CASCADE:
+            load_named_model(LIVE_CASCADE_FIRST_MODEL)
+        print("✅ Live Whisper model loaded.")
+    except Exception as e:
+        print("⚠️  Warning: failed to preload Whisper model:", e)
     
     # preload diarization pipeline (optional; safe to wrap in try)
     if SPEAKER_DIARIZATION_AVAILABLE and preload_pipeline:
         try:
-            preload_pipeline()
-            print("✅ Diarization pipeline loaded.")
+            if DIARIZATION_WORKER:
+                # Loads in its own process; the first job waits for it if needed
+                diarization_worker.start()
+            else:
+                preload_pipeline()
+                print("✅ Diarization pipeline loaded.")
         except Exception as e:
             print("⚠️  Warning: Diarization pipeline not available:")
             print(f"   {str(e)[:100]}")
@@ -1356,18 +1459,41 @@ async def process_audio(audio: UploadFile = File(...), lang: str = Form("en"), e
         with open(audio_path, "wb") as buffer:
             shutil.copyfileobj(audio.file, buffer)
 
-        # --- Step A: Diarization (safe) ---
-        diarization_result = []
+        # Every stage runs once per upload; the pipeline reuses this job's diarization
+        loop = asyncio.get_running_loop()
+        job = JobContext(audio_path)
+
+        # --- Step A: Diarization (safe), running while the pipeline transcribes ---
+        diarization_task = None
+        diarization_job = DiarizationJob(audio_path)
         if SPEAKER_DIARIZATION_AVAILABLE and diarize_audio:
-            try:
-                diarization_result = diarize_audio(audio_path) or []
-            except Exception as e:
-                print("Diarization failed, continuing without it:", e)
+            diarization_task = asyncio.ensure_future(
+                job.aget_or_compute(
+                    "diarization", diarization_worker.run, audio_path, None, diarization_job,
+                    executor=diarization_worker.executor
+                )
+            )
         else:
             print("⚠️  Speaker diarization skipped (not available)")
 
         # --- Step B: Run existing pipeline (ASR, summary, etc.) ---
-        result = run_pipeline_from_audio(audio_path, lang)
+        try:
+            result = await loop.run_in_executor(None, lambda: run_pipeline_from_audio(audio_path, lang, job=job))
+        except BaseException:
+            # The upload failed: nothing will use its speaker labels
+            if diarization_task is not None:
+                await diarization_worker.acancel(diarization_job)
+                diarization_task.cancel()
+            raise
+        finally:
+            job.close()
+
+        diarization_result = []
+        if diarization_task is not None:
+            try:
+                diarization_result = await diarization_task
+            except Exception as e:
+                print("Diarization failed, continuing without it:", e)
 
         # Try to obtain transcript segments from result (your pipeline should supply these if possible)
         transcript_segments = result.get("transcript_segments")  # expected [{'start','end','text'}, ...]
@@ -1376,7 +1502,10 @@ async def process_audio(audio: UploadFile = File(...), lang: str = Form("en"), e
         # --- Step C: Align transcripts with diarization ---
         speaker_aligned = []
         if transcript_segments and diarization_result:
-            speaker_aligned = align_transcript_with_diarization(transcript_segments, diarization_result)
+            speaker_aligned = job.get_or_compute(
+                "alignment", align_transcript_with_diarization, transcript_segments, diarization_result,
+                key=inputs_key(transcript_segments, diarization_result)
+            )
         elif full_transcript and diarization_result:
             # fallback: naive proportional split
             speaker_aligned = naive_align_text_to_diarization(full_transcript, diarization_result)
@@ -1567,6 +1696,28 @@ async def join_meeting_from_invite(
             detail=f"Failed to join meeting: {str(e)}"
         )
 
+@app.get("/api/metrics/live-latency")
+async def get_live_latency_metrics(
+    meeting_id: Optional[str] = None,
+    email: str = Depends(get_current_user_email)
+):
+    """
+    Live transcription latency per stage (receive -> broadcast) as
+    histograms in milliseconds, plus real-time factor. Global and
+    per-meeting, or a single meeting with ?meeting_id=...
+    "cascade" counts decodes per model tier and escalations (LIVE_CASCADE).
+    "recordings" has each live recording writer's flush backlog and lag.
+    """
+    return {
+        "success": True,
+        **latency_metrics.snapshot(meeting_id),
+        "asr_queue": {
+            "dropped": dict(asr_pool.dropped),
+        },
+        "cascade": cascade_stats.snapshot(meeting_id),
+        "recordings": bot_audio_manager.get_recording_stats(meeting_id),
+    }
+
 @app.get("/api/bot/status/{meeting_id}")
 async def get_bot_status(
     meeting_id: str,
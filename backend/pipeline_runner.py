@@ -1,24 +1,43 @@
 # backend/pipeline_runner.py
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the project's root directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from nlp_Module.nlp_pipeline import nlp_pipeline
 from speech_Module.transcribe_audio import transcribe_audio as speech_to_text
+from speech_Module.parallel_transcribe import transcribe_long_audio, uses_worker_pool
+from speech_Module.batched_decoder import transcribe_turns
+from speech_Module.whisper_loader import get_whisper_model, get_model_id
+from speech_Module.asr_cache import asr_cache, audio_fingerprint
+from speech_Module.decoding_profiles import profile_name
+from speech_Module.language_id import TRANSCRIBE_LANGUAGE, detect_audio_language, fixed_language
 from tts_module.text_to_speech import text_to_speech
+from utils.job_context import JobContext, inputs_key
 
 # Optional speaker diarization import (may fail on Windows due to TorchAudio)
 diarize_audio = None
 try:
     from speaker_diarization import diarize_audio
+    from utils.diarization_utils import align_transcript_with_diarization
+    from diarization_worker import DiarizationJob, diarization_worker
     DIARIZATION_AVAILABLE = True
 except Exception as e:
     DIARIZATION_AVAILABLE = False
     print(f"⚠️  Speaker diarization not available in pipeline_runner: {str(e)[:80]}")
 
 
+# Decode short diarized turns in padded batches instead of one call per turn
+PIPELINE_BATCHED_TURNS = os.getenv("PIPELINE_BATCHED_TURNS", "1") == "1"
+# Transcribe the whole file while diarization runs, then align the two
+# (1), instead of diarizing first and transcribing each speaker turn (0).
+# Only recordings long enough for the worker pool overlap the two: shorter
+# ones transcribe in this process on every torch thread, which would fight
+# the diarization worker for the same cores.
+PIPELINE_CONCURRENT_DIARIZATION = os.getenv("PIPELINE_CONCURRENT_DIARIZATION", "1") == "1"
+
 # Language mapping for Google Cloud TTS
 LANG_MAP = {
     "en": "en-US",
@@ -28,18 +47,60 @@ LANG_MAP = {
     # Add more if needed
 }
 
-def run_pipeline_from_audio(audio_path, lang="en"):
+def run_pipeline_from_audio(audio_path, lang="en", job=None):
     """
     Full pipeline: Audio → Diarization → Transcript → Summary → Translation → Action Items → TTS
+    (diarization and transcription of long recordings run concurrently unless PIPELINE_CONCURRENT_DIARIZATION=0)
+
+    Pass the caller's JobContext as `job` to share stage outputs with it:
+    diarization, decoded audio, ASR segments and alignment it already has
+    (or is computing) are reused instead of being computed again.
     """
+    own_job = job is None
+    job = job or JobContext(audio_path)
+    try:
+        if (DIARIZATION_AVAILABLE and diarize_audio and PIPELINE_CONCURRENT_DIARIZATION
+                and uses_worker_pool(job.audio().duration)):
+            transcript_segments, full_transcript_parts, diarization_segments = _transcribe_while_diarizing(job)
+        else:
+            transcript_segments, full_transcript_parts, diarization_segments = _transcribe_turns(job)
+    finally:
+        if own_job:
+            job.close()
+    return _finish_pipeline(transcript_segments, full_transcript_parts, diarization_segments, lang)
+
+
+def _diarize(job, diarization_job=None):
+    """The job's diarization (computed once per job), [] if it fails"""
+    try:
+        diarization_segments = job.get_or_compute(
+            "diarization", diarization_worker.run, job.audio_path, None, diarization_job
+        )
+        print("Diarization segments:", diarization_segments)
+        return diarization_segments
+    except Exception as e:
+        print(f"⚠️  Diarization failed: {e}")
+        return []
+
+
+def _transcribe_file(job):
+    """Whole-file ASR result (computed once per job)"""
+    return job.get_or_compute(
+        "asr", lambda: transcribe_long_audio(
+            job.audio_path, decoded=job.audio(), language=fixed_language(TRANSCRIBE_LANGUAGE)
+        )
+    )
+
+
+def _transcribe_turns(job):
+    """Diarize first, then transcribe every speaker turn"""
+    audio_path = job.audio_path
+
     # --- Step 0: Speaker Diarization (optional) ---
     diarization_segments = []
     if DIARIZATION_AVAILABLE and diarize_audio:
-        try:
-            diarization_segments = diarize_audio(audio_path) or []
-            print("Diarization segments:", diarization_segments)
-        except Exception as e:
-            print(f"⚠️  Diarization failed: {e}")
+        # Blocking, but pyannote runs in the worker process with its own timeout
+        diarization_segments = _diarize(job)
     else:
         print("ℹ️  Diarization skipped (not available)")
 
@@ -48,14 +109,46 @@ def run_pipeline_from_audio(audio_path, lang="en"):
     full_transcript_parts = []
 
     if diarization_segments:
-        # Transcribe each diarized time range
-        for seg in diarization_segments:
+        # Decode the file once; every diarized time range is a slice of it
+        audio = job.audio()
+
+        def transcribe_all_turns():
+            # One language for the whole file; short turns detect it poorly
+            language = fixed_language(TRANSCRIBE_LANGUAGE)
+            if language is None:
+                language, probability = detect_audio_language(get_whisper_model("offline"), audio.samples)
+                print(f"🌐 Detected language: {language} ({probability:.0%})")
+
+            if PIPELINE_BATCHED_TURNS:
+                texts = transcribe_turns(get_whisper_model("offline"), audio, diarization_segments, language=language)
+            else:
+                # Transcribe only each segment of audio
+                texts = [
+                    speech_to_text(audio_path, audio=audio, start_time=seg.get("start"), end_time=seg.get("end"),
+                                   language=language)
+                    for seg in diarization_segments
+                ]
+            return {"texts": texts, "language": language}
+
+        # Same audio, turns and model as an earlier run -> reuse its texts
+        seg_texts = job.get_or_compute("asr_turns", lambda: asr_cache.get_or_compute(
+            audio_fingerprint(audio.samples),
+            get_model_id("offline"),
+            {
+                "mode": "turns",
+                "batched": PIPELINE_BATCHED_TURNS,
+                "profile": profile_name("offline"),
+                "language": TRANSCRIBE_LANGUAGE,
+                "turns": [(seg.get("start"), seg.get("end")) for seg in diarization_segments],
+            },
+            transcribe_all_turns
+        ))["texts"]
+
+        for seg, seg_text in zip(diarization_segments, seg_texts):
             start_time = seg.get("start")
             end_time = seg.get("end")
             speaker = seg.get("speaker")
 
-            # Transcribe only this segment of audio
-            seg_text = speech_to_text(audio_path, start_time=start_time, end_time=end_time)
             transcript_segments.append({
                 "start": start_time,
                 "end": end_time,
@@ -65,7 +158,8 @@ def run_pipeline_from_audio(audio_path, lang="en"):
             full_transcript_parts.append(f"[{speaker}] {seg_text}")
     else:
         # No diarization — transcribe whole file
-        seg_text = speech_to_text(audio_path)
+        seg_text = _transcribe_file(job)["text"]
+        print(f"Transcript: {seg_text}")
         transcript_segments.append({
             "start": 0.0,
             "end": None,
@@ -74,6 +168,45 @@ def run_pipeline_from_audio(audio_path, lang="en"):
         })
         full_transcript_parts.append(f"[UNKNOWN] {seg_text}")
 
+    return transcript_segments, full_transcript_parts, diarization_segments
+
+
+def _transcribe_while_diarizing(job):
+    """
+    Diarize in the worker process while this thread transcribes the whole
+    file, then give every transcript segment the speaker it overlaps most.
+    Takes about as long as the slower of the two instead of their sum.
+    """
+    diarization_job = DiarizationJob(job.audio_path)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Joins the caller's diarization instead if it already started one for this job
+        diarization_future = executor.submit(_diarize, job, diarization_job)
+        try:
+            result = _transcribe_file(job)
+        except Exception:
+            diarization_worker.cancel(diarization_job)
+            raise
+        diarization_segments = diarization_future.result()
+
+    segments = [
+        {"start": seg["start"], "end": seg["end"], "text": seg["text"].strip()}
+        for seg in result["segments"]
+    ]
+    transcript_segments = []
+    full_transcript_parts = []
+    aligned = job.get_or_compute(
+        "alignment", align_transcript_with_diarization, segments, diarization_segments,
+        key=inputs_key(segments, diarization_segments)
+    )
+    for seg in aligned:
+        speaker = seg["speaker"] or "UNKNOWN"
+        transcript_segments.append(dict(seg, speaker=speaker))
+        full_transcript_parts.append(f"[{speaker}] {seg['text']}")
+    return transcript_segments, full_transcript_parts, diarization_segments
+
+
+def _finish_pipeline(transcript_segments, full_transcript_parts, diarization_segments, lang):
+    """Transcript → Summary → Translation → Action Items → TTS"""
     transcript = "\n".join(full_transcript_parts)
 
     # Save transcript
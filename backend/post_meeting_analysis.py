@@ -5,18 +5,34 @@ from typing import List, Dict, Any
 
 # Import existing modules
 # Note: We use absolute imports based on the workspace structure
-from speech_Module.whisper_loader import get_whisper_model
-from backend.speaker_diarization import diarize_audio
+from speech_Module.audio_io import decode_audio
+from speech_Module.parallel_transcribe import OFFLINE_TRANSCRIBE_WORKERS, transcribe_long_audio, uses_worker_pool
+from speech_Module.live_transcript import (
+    POST_MEETING_REUSE_LIVE,
+    incremental_transcribe,
+    load_live_transcript,
+    sidecar_path,
+)
+from speech_Module.live_diarization import reconcile_speakers
+try:
+    # The server imports this top-level; share its worker process
+    from diarization_worker import diarization_worker
+except ImportError:
+    from backend.diarization_worker import diarization_worker
 from nlp_Module.nlp_pipeline import nlp_pipeline
-from backend.database import get_meetings_collection
+from backend.database import get_meetings_collection, get_word_timings_collection
 from utils.diarization_utils import align_transcript_with_diarization, build_speaker_tagged_text
+from utils.word_timings import WordTimings, store_word_timings
+
+# Assign speakers per word and split segments at speaker changes
+ALIGN_WORD_LEVEL = os.getenv("ALIGN_WORD_LEVEL", "0") == "1"
 
 async def analyze_meeting(meeting_id: str, audio_path: str):
     """
     Perform post-meeting analysis:
     1. Full transcription (for better quality than real-time)
-    2. Speaker Diarization
-    3. Alignment
+    2. Speaker Diarization (concurrently with 1 when 1 uses the worker pool)
+    3. Alignment (once both are done)
     4. Summarization
     5. Action Item Extraction
     6. Database Update
@@ -27,15 +43,57 @@ async def analyze_meeting(meeting_id: str, audio_path: str):
         print(f"❌ Audio file not found: {audio_path}")
         return
 
+    loop = asyncio.get_running_loop()
+    diarization_task = None
     try:
-        # 1. Full Transcription
-        print("   🎙️  Running full transcription...")
-        model = get_whisper_model()
-        # Transcribe with word timestamps for better alignment
-        result = model.transcribe(audio_path, word_timestamps=True)
+        # Decoded once for transcription; mapped so the worker pool can share it
+        audio = await loop.run_in_executor(
+            None, lambda: decode_audio(audio_path, mmap=True if OFFLINE_TRANSCRIBE_WORKERS > 1 else None)
+        )
+        try:
+            # 2. Speaker Diarization - only needs the audio file. Long recordings
+            # are transcribed by the core-capped worker pool, so the diarization
+            # worker runs alongside; shorter ones are transcribed in-process on
+            # every core, and diarization waits instead of oversubscribing them
+            # (the same rule as pipeline_runner).
+            if uses_worker_pool(audio.duration):
+                print("   👥 Running speaker diarization...")
+                diarization_task = asyncio.create_task(diarization_worker.diarize(audio_path))
+
+            # 1. Full Transcription
+            print("   🎙️  Running full transcription...")
+            # Transcribe with word timestamps for better alignment, off the event loop
+            live_log = load_live_transcript(sidecar_path(audio_path))
+            if POST_MEETING_REUSE_LIVE and live_log and live_log["chunks"]:
+                # Reuse confident live chunks; only weak, dropped or cut regions are decoded again
+                result = await loop.run_in_executor(
+                    None, lambda: incremental_transcribe(audio_path, live_log, decoded=audio, word_timestamps=True)
+                )
+                print(f"   ♻️  Reused {len(live_log['chunks'])} live chunks, "
+                      f"re-decoded {result['redecoded_seconds']}s of audio")
+            else:
+                result = await loop.run_in_executor(
+                    None, lambda: transcribe_long_audio(audio_path, decoded=audio, word_timestamps=True)
+                )
+        finally:
+            audio.close()
         full_text = result["text"]
         segments = result["segments"] # List of segments with start/end/text
-        
+
+        # Keep word timestamps as compact columns instead of per-word dicts.
+        # An index with holes would make search miss words, so none is stored then.
+        try:
+            word_timings = WordTimings.from_segments(segments, require_words=True)
+        except ValueError as e:
+            print(f"   ⚠️  Word timings not stored: {e}")
+            word_timings = None
+        if word_timings is not None:
+            try:
+                await store_word_timings(meeting_id, word_timings, get_word_timings_collection())
+                print(f"   ⏱️  Stored timings for {len(word_timings)} words")
+            except Exception as e:
+                print(f"   ⚠️  Could not store word timings: {e}")
+
         # Convert Whisper segments to our format
         transcript_segments = []
         for seg in segments:
@@ -44,16 +102,32 @@ async def analyze_meeting(meeting_id: str, audio_path: str):
                 "end": seg["end"],
                 "text": seg["text"].strip()
             })
+        del result, segments
 
         # 2. Speaker Diarization
-        print("   👥 Running speaker diarization...")
-        diarization_result = diarize_audio(audio_path)
-        
+        if diarization_task is None:
+            print("   👥 Running speaker diarization...")
+            diarization_task = asyncio.create_task(diarization_worker.diarize(audio_path))
+        diarization_result = await diarization_task
+
+        # Reconcile the live speaker labels with the offline ones
+        live_speakers = live_log["speakers"] if live_log else []
+        live_speaker_map = {}
+        if diarization_result and live_speakers:
+            live_speaker_map = reconcile_speakers(live_speakers, diarization_result)
+            print(f"   👥 Live speakers: {live_speaker_map}")
+        elif live_speakers:
+            # pyannote unavailable or failed: the live labels are the best there is
+            print("   👥 Using live speaker labels")
+            diarization_result = live_speakers
+
         # 3. Alignment
         print("   🔗 Aligning speakers with transcript...")
         speaker_aligned_segments = []
         if diarization_result:
-            speaker_aligned_segments = align_transcript_with_diarization(transcript_segments, diarization_result)
+            speaker_aligned_segments = align_transcript_with_diarization(
+                transcript_segments, diarization_result, word_level=ALIGN_WORD_LEVEL, word_timings=word_timings
+            )
         else:
             # Fallback if diarization fails
             speaker_aligned_segments = [{"speaker": "Unknown", "text": s["text"], "timestamp": s["start"]} for s in transcript_segments]
@@ -121,6 +195,8 @@ async def analyze_meeting(meeting_id: str, audio_path: str):
             "ended_at": datetime.utcnow(),
             "rag_indexed": True
         }
+        if live_speaker_map:
+            update_data["live_speaker_map"] = live_speaker_map
         
         await meetings_collection.update_one(
             {"_id": meeting_id},
@@ -134,6 +210,9 @@ async def analyze_meeting(meeting_id: str, audio_path: str):
 
     except Exception as e:
         print(f"❌ Error during post-meeting analysis: {e}")
+        # Transcription failed: stop the diarization job instead of waiting it out
+        if diarization_task is not None:
+            diarization_task.cancel()
         # Update status to failed or partial
         meetings_collection = get_meetings_collection()
         await meetings_collection.update_one(
@@ -60,6 +60,17 @@ def preload_pipeline():
         print("Failed to preload pyannote pipeline:", e)
         traceback.print_exc()
 
+def _pipeline_input(audio_file):
+    """
+    pyannote reads WAV/FLAC paths itself; Ogg/Opus recordings are decoded
+    in memory first so the pipeline never depends on the torchaudio backend.
+    """
+    if isinstance(audio_file, str) and os.path.splitext(audio_file)[1].lower() in (".ogg", ".opus"):
+        import soundfile as sf
+        data, sample_rate = sf.read(audio_file, dtype="float32", always_2d=True)
+        return {"waveform": torch.from_numpy(data.T.copy()), "sample_rate": sample_rate}
+    return audio_file
+
 def diarize_audio(audio_file, return_raw=False):
     """
     Run diarization and return a list of dicts:
@@ -78,7 +89,7 @@ def diarize_audio(audio_file, return_raw=False):
                 return [], None
             return []
         
-        annotation = pipeline(audio_file)
+        annotation = pipeline(_pipeline_input(audio_file))
 
         segments = []
         for turn, _, speaker in annotation.itertracks(yield_label=True):
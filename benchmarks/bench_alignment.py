@@ -0,0 +1,101 @@
+"""
+Benchmark: transcript/diarization alignment, pairwise O(n*m) vs sweep line.
+
+Usage:
+    python benchmarks/bench_alignment.py
+    python benchmarks/bench_alignment.py --hours 3 --speakers 6 --words
+
+Builds a synthetic meeting (Whisper-like segments of 2-8 s, speaker turns of
+1-20 s with some overlapping speech), checks that both implementations
+agree, and prints their wall time. --words also times word-level speaker
+assignment over about 2.5 words per second.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.diarization_utils import align_transcript_with_diarization, assign_word_speakers, overlap
+
+
+def pairwise_align(transcript_segments, diarization_segments):
+    """The previous implementation: every transcript segment against every turn"""
+    aligned = []
+    for t in transcript_segments:
+        best = None
+        best_ov = 0.0
+        for d in diarization_segments:
+            ov = overlap(t['start'], t['end'], d['start'], d['end'])
+            if ov > best_ov:
+                best_ov = ov
+                best = d
+        aligned.append({
+            "start": t["start"],
+            "end": t["end"],
+            "speaker": best['speaker'] if best and best_ov > 0 else None,
+            "text": t["text"]
+        })
+    return aligned
+
+
+def synthetic_meeting(hours, speakers, seed=0):
+    rng = random.Random(seed)
+    duration = hours * 3600
+    segments, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(2, 8)
+        segments.append({"start": t, "end": t + length, "text": "lorem ipsum"})
+        t += length + rng.uniform(0, 0.5)
+
+    turns, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(1, 20)
+        turns.append({"start": t, "end": t + length, "speaker": f"SPEAKER_{rng.randrange(speakers):02d}"})
+        # Occasionally the next speaker starts before this one finished
+        t += length - (rng.uniform(0, 1) if rng.random() < 0.2 else 0)
+    return segments, turns
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--speakers", type=int, default=6)
+    parser.add_argument("--words", action="store_true", help="also time word-level speaker assignment")
+    args = parser.parse_args()
+
+    segments, turns = synthetic_meeting(args.hours, args.speakers)
+    print(f"🎧 {args.hours:g} h meeting: {len(segments)} transcript segments, {len(turns)} speaker turns")
+
+    old, old_time = timed(pairwise_align, segments, turns)
+    new, new_time = timed(align_transcript_with_diarization, segments, turns)
+    assert old == new, "implementations disagree"
+
+    print(f"\n{'method':<14}{'seconds':>10}")
+    print(f"{'pairwise':<14}{old_time:>10.3f}")
+    print(f"{'sweep line':<14}{new_time:>10.3f}")
+    print(f"\n⚡ Speedup: {old_time / new_time:.1f}x (identical output)")
+
+    if args.words:
+        rng = random.Random(1)
+        starts, ends = [], []
+        for seg in segments:
+            n = max(1, int((seg["end"] - seg["start"]) * 2.5))
+            step = (seg["end"] - seg["start"]) / n
+            for k in range(n):
+                starts.append(seg["start"] + k * step)
+                ends.append(seg["start"] + k * step + step * rng.uniform(0.6, 1.0))
+        _, word_time = timed(assign_word_speakers, starts, ends, turns)
+        print(f"🔤 Word-level speakers for {len(starts)} words: {word_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
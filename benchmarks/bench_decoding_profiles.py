@@ -0,0 +1,89 @@
+"""
+Benchmark: speed and accuracy of each Whisper decoding profile.
+
+Usage:
+    python benchmarks/bench_decoding_profiles.py
+    python benchmarks/bench_decoding_profiles.py meeting.wav --reference meeting.txt --model small
+
+Defaults to the bundled reference clip benchmarks/data/reference_en.wav and
+its text benchmarks/data/reference_en.txt (kept apart from output/, which
+every pipeline run overwrites). That clip is synthetic TTS speech; see
+benchmarks/README.md before reading much into its WER column. For every profile in
+speech_Module/decoding_profiles the clip is transcribed --repeat times;
+prints the real-time factor (seconds of compute per second of audio, lower
+is faster) and the word error rate against the reference.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from speech_Module.audio_io import decode_audio
+from speech_Module.decoding_profiles import PROFILES, transcribe_options
+from speech_Module.whisper_loader import get_whisper_model, load_named_model
+
+
+def normalize(text):
+    return re.sub(r"[^\w' ]+", " ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    """(substitutions + deletions + insertions) / reference words"""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, start=1):
+        cur = [i]
+        for j, h in enumerate(hyp, start=1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h)))
+        prev = cur
+    return prev[-1] / len(ref)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", nargs="?", default=os.path.join(ROOT, "benchmarks", "data", "reference_en.wav"))
+    parser.add_argument("--reference", default=None,
+                        help="reference transcript (default: the audio path with .txt)")
+    parser.add_argument("--model", default=None, help="model size (default: the offline model)")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per profile; the fastest is reported")
+    args = parser.parse_args()
+
+    reference_path = args.reference or os.path.splitext(args.audio)[0] + ".txt"
+    with open(reference_path, encoding="utf-8") as f:
+        reference = f.read()
+
+    model = load_named_model(args.model) if args.model else get_whisper_model("offline")
+
+    with decode_audio(args.audio) as decoded:
+        audio = decoded.samples.copy()
+        duration = decoded.duration
+    print(f"🎧 {duration:.1f}s reference clip, {len(normalize(reference))} reference words")
+
+    # Warm up so model loading and first-call setup are not measured
+    model.transcribe(audio[:16000], **transcribe_options("live-fast", language="en"))
+
+    rows = []
+    for name in args.profiles:
+        options = transcribe_options(name, language="en")
+        best, text = None, ""
+        for _ in range(max(1, args.repeat)):
+            t0 = time.perf_counter()
+            text = model.transcribe(audio, **options)["text"]
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        rows.append((name, best / duration, word_error_rate(reference, text)))
+
+    print(f"\n{'profile':<18}{'RTF':>8}{'WER':>9}")
+    for name, rtf, wer in rows:
+        print(f"{name:<18}{rtf:>8.3f}{wer:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,9 @@ export class WebSocketManager {
     this.audioWs = null;
     this.audioWsUrl = config.backend.audioWsUrl;
     this.isAudioConnected = false;
+    // Set while the backend has paused live transcription to catch up (ingest_control).
+    // Audio keeps flowing: the backend still records it.
+    this.isAudioPaused = false;
     
     // Meeting WebSocket
     this.meetingWs = null;
@@ -230,6 +233,12 @@ export class WebSocketManager {
     try {
       const message = JSON.parse(data.toString());
       logger.debug('📨 Audio message:', message);
+      if (message.type === 'ingest_control') {
+        this.isAudioPaused = message.action === 'pause';
+        logger.warn(this.isAudioPaused
+          ? '⏸️  Backend overloaded, live transcription paused (audio still recorded)'
+          : '▶️  Backend caught up, live transcription resumed');
+      }
       this._emitEvent('message', { type: 'audio', data: message });
     } catch (e) {
       // Binary data, ignore
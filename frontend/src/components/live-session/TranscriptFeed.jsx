@@ -52,7 +52,7 @@ const TranscriptFeed = ({ transcripts = [], isLive = false }) => {
         className="flex-1 overflow-y-auto custom-scrollbar p-4 space-y-4"
       >
         {transcripts.map((transcript, index) => (
-          <div key={index} className="flex gap-3 animate-fade-in">
+          <div key={transcript.seq ?? `i-${index}`} className="flex gap-3 animate-fade-in">
             <Avatar speaker={transcript.speaker} size="md" />
             
             <div className="flex-1 min-w-0">
@@ -68,6 +68,11 @@ const TranscriptFeed = ({ transcripts = [], isLive = false }) => {
               <div className="bg-gray-100 dark:bg-gray-700 rounded-lg rounded-tl-none p-3">
                 <p className="text-gray-800 dark:text-gray-200 leading-relaxed">
                   {transcript.text}
+                  {transcript.isPartial && transcript.partialText && (
+                    <span className="italic text-gray-500 dark:text-gray-400">
+                      {transcript.text ? ' ' : ''}{transcript.partialText}
+                    </span>
+                  )}
                 </p>
               </div>
             </div>
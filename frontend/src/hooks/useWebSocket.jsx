@@ -7,6 +7,8 @@ import { useEffect, useRef, useState, useCallback } from 'react';
 export const useWebSocket = (meetingId, token, options = {}) => {
   const {
     onTranscript = () => {},
+    onCaption = () => {},
+    onSpeakerUpdate = () => {},
     onStatus = () => {},
     onSummary = () => {},
     onSignDetected = () => {},
@@ -25,6 +27,8 @@ export const useWebSocket = (meetingId, token, options = {}) => {
   // Store callbacks in refs to avoid recreating connect function
   const callbacksRef = useRef({
     onTranscript,
+    onCaption,
+    onSpeakerUpdate,
     onStatus,
     onSummary,
     onSignDetected,
@@ -36,13 +40,15 @@ export const useWebSocket = (meetingId, token, options = {}) => {
   useEffect(() => {
     callbacksRef.current = {
       onTranscript,
+      onCaption,
+      onSpeakerUpdate,
       onStatus,
       onSummary,
       onSignDetected,
       onError,
       onConnected,
     };
-  }, [onTranscript, onStatus, onSummary, onSignDetected, onError, onConnected]);
+  }, [onTranscript, onCaption, onSpeakerUpdate, onStatus, onSummary, onSignDetected, onError, onConnected]);
 
   const connect = useCallback(() => {
     if (!meetingId) {
@@ -104,6 +110,34 @@ export const useWebSocket = (meetingId, token, options = {}) => {
             callbacksRef.current.onTranscript(data.segment);
             break;
 
+          case 'transcript_partial':
+          case 'transcript_final':
+            // Streaming live caption; same seq replaces the previous one
+            callbacksRef.current.onCaption(data);
+            break;
+
+          case 'speaker_update':
+            // Speaker of a line already shown (by seq or id), identified after its text
+            callbacksRef.current.onSpeakerUpdate(data);
+            break;
+
+          case 'ingest_status':
+            // Live transcription overload policy switched an action on/off
+            console.warn(
+              `⚠️ Live transcription ${data.enabled ? 'degraded' : 'restored'}: ${data.action} (lag ${data.lag_seconds}s)`
+            );
+            break;
+
+          case 'language_detected':
+            // Meeting language pinned after the first seconds of speech
+            console.log(`🌐 Meeting language: ${data.language} (${Math.round(data.probability * 100)}%)`);
+            break;
+
+          case 'speaker_merged':
+            // Live speaker clustering merged two speakers into one
+            console.log(`👥 ${data.from} is now ${data.into}`);
+            break;
+
           case 'status':
             // Status update (processing, completed, etc.)
             callbacksRef.current.onStatus(data.status, data.details);
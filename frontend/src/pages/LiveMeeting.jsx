@@ -36,6 +36,29 @@ const LiveMeeting = () => {
       console.log('Received transcript segment:', segment)
       setTranscripts(prev => [...prev, segment])
     },
+    onCaption: (caption) => {
+      // Partial captions are replaced in place until the final one arrives
+      const entry = {
+        seq: caption.seq,
+        speaker: caption.speaker,
+        text: caption.final_text,
+        partialText: caption.partial_text,
+        isPartial: caption.type === 'transcript_partial',
+        timestamp: caption.timestamp,
+      }
+      setTranscripts(prev => {
+        const index = prev.findLastIndex(t => t.seq === caption.seq)
+        if (index === -1) return [...prev, entry]
+        const next = prev.slice()
+        next[index] = entry
+        return next
+      })
+    },
+    onSpeakerUpdate: (update) => {
+      setTranscripts(prev => prev.map(t =>
+        t.seq !== undefined && t.seq === update.seq ? { ...t, speaker: update.speaker } : t
+      ))
+    },
     onStatus: (status, details) => {
       console.log('Status update:', status, details)
       setMeetingStatus(status)
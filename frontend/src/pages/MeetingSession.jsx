@@ -57,12 +57,58 @@ const MeetingSession = () => {
             if (data.type === "transcript_update") {
                 setTranscripts(prev => [...prev, {
                     id: Date.now(),
+                    lineId: data.id,
                     speaker: data.speaker || "Unknown",
                     text: data.text,
                     time: new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })
                 }]);
             }
             
+            // HANDLE: Re-decoded line from the larger model replaces the first pass in place
+            if (data.type === "transcript_correction") {
+                setTranscripts(prev => {
+                    const index = prev.findLastIndex(t => t.lineId === data.id);
+                    if (index === -1) return prev;
+                    const next = prev.slice();
+                    next[index] = { ...prev[index], text: data.text };
+                    return next;
+                });
+            }
+            
+            // HANDLE: Speaker of a line already shown, identified after its text
+            if (data.type === "speaker_update") {
+                setTranscripts(prev => prev.map(t =>
+                    (data.id != null && t.lineId === data.id) || (data.seq != null && t.seq === data.seq)
+                        ? { ...t, speaker: data.speaker }
+                        : t
+                ));
+            }
+            
+            // HANDLE: Two live speakers turned out to be the same person
+            if (data.type === "speaker_merged") {
+                setTranscripts(prev => prev.map(t =>
+                    t.speaker === data.from ? { ...t, speaker: data.into } : t
+                ));
+            }
+            
+            // HANDLE: Streaming captions (a partial is replaced in place by seq)
+            if (data.type === "transcript_partial" || data.type === "transcript_final") {
+                setTranscripts(prev => {
+                    const entry = {
+                        id: `seq-${data.seq}`,
+                        seq: data.seq,
+                        speaker: data.speaker || "Unknown",
+                        text: data.text,
+                        time: new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })
+                    };
+                    const index = prev.findLastIndex(t => t.seq === data.seq);
+                    if (index === -1) return [...prev, entry];
+                    const next = prev.slice();
+                    next[index] = entry;
+                    return next;
+                });
+            }
+            
             // HANDLE: Bot Status Updates
             if (data.type === "bot_status") {
                 console.log("🤖 Bot Status:", data.action);
@@ -1,6 +1,7 @@
 # nlp_module/nlp_pipeline.py
 
 import os
+import threading
 os.environ["TRANSFORMERS_NO_TF"] = "1"
 os.environ["TRANSFORMERS_NO_FLAX"] = "1"
 
@@ -24,36 +25,47 @@ class NLPPipeline:
         )
          # A dictionary to cache translation models
         self.translators = {}
+        # Translators are warmed from worker threads while summaries use them
+        self._translators_lock = threading.Lock()
         print("✅ Core NLP models loaded.")
 
     def summarize_text(self, transcript):
         summary = self.summarizer(transcript, max_length=150, min_length=40, do_sample=False)
         return summary[0]['summary_text']
 
+    def _get_translator(self, src_lang, tgt_lang):
+        model_name = f'Helsinki-NLP/opus-mt-{src_lang}-{tgt_lang}'
+
+        # Check if the model is already in our cache (loaded once, even when asked for concurrently)
+        with self._translators_lock:
+            if model_name not in self.translators:
+                print(f"Loading translation model: {model_name}...")
+                tokenizer = MarianTokenizer.from_pretrained(model_name)
+                model = MarianMTModel.from_pretrained(model_name)
+
+                # Save the loaded model and tokenizer in our cache
+                self.translators[model_name] = {"model": model, "tokenizer": tokenizer}
+                print(f"✅ {model_name} loaded and cached.")
+
+            return self.translators[model_name]
+
+    def warm_translator(self, src_lang, tgt_lang):
+        """Load a translation model ahead of time (e.g. once a meeting's language is known)"""
+        if src_lang != tgt_lang:
+            self._get_translator(src_lang, tgt_lang)
+
     def translate_text(self, text, src_lang="en", tgt_lang="hi"):
         if src_lang == tgt_lang:
             return text  # no translation needed
-        
-        model_name = f'Helsinki-NLP/opus-mt-{src_lang}-{tgt_lang}'
 
-        # Check if the model is already in our cache
-        if model_name not in self.translators:
-            print(f"Loading translation model: {model_name}...")
-            tokenizer = MarianTokenizer.from_pretrained(model_name)
-            model = MarianMTModel.from_pretrained(model_name)
-            
-            # Save the loaded model and tokenizer in our cache
-            self.translators[model_name] = {"model": model, "tokenizer": tokenizer}
-            print(f"✅ {model_name} loaded and cached.")
-
-            # Use the cached model and tokenizer
-            cached_translator = self.translators[model_name]
-            tokenizer = cached_translator['tokenizer']
-            model = cached_translator['model']
-        
-            inputs = tokenizer([text], return_tensors="pt", padding=True)
-            translated = model.generate(**inputs)
-            return tokenizer.decode(translated[0], skip_special_tokens=True)
+        # Use the cached model and tokenizer
+        cached_translator = self._get_translator(src_lang, tgt_lang)
+        tokenizer = cached_translator['tokenizer']
+        model = cached_translator['model']
+
+        inputs = tokenizer([text], return_tensors="pt", padding=True)
+        translated = model.generate(**inputs)
+        return tokenizer.decode(translated[0], skip_special_tokens=True)
 
 
     def extract_action_items(self, text):
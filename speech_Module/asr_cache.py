@@ -0,0 +1,173 @@
+# speech_Module/asr_cache.py
+"""
+Persistent, content-addressed cache of ASR results.
+
+Keys hash the decoded audio samples (so re-uploads and re-encodes of the
+same recording hit), the model that produced the result and the decoding
+options. Entries are gzip'd JSON files holding segments and word timestamps.
+When the cache grows past ASR_CACHE_MAX_MB the least recently used entries
+are evicted (a hit refreshes the entry's mtime). The directory is scanned
+once for its size and again only to evict, not on every write.
+
+    result = asr_cache.get_or_compute(fingerprint, model_id, options, compute)
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+ASR_CACHE_ENABLED = os.getenv("ASR_CACHE_ENABLED", "1") == "1"
+ASR_CACHE_DIR = os.getenv("ASR_CACHE_DIR", "asr_cache")
+ASR_CACHE_MAX_MB = float(os.getenv("ASR_CACHE_MAX_MB", "1024"))
+
+_HASH_BLOCK_SAMPLES = 4 * 1024 * 1024  # 16 MB of float32 per update
+
+
+def audio_fingerprint(samples: np.ndarray) -> str:
+    """Hash of decoded float32 samples; reads memory-mapped audio block by block"""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(str(len(samples)).encode())
+    for start in range(0, len(samples), _HASH_BLOCK_SAMPLES):
+        block = np.ascontiguousarray(samples[start:start + _HASH_BLOCK_SAMPLES], dtype=np.float32)
+        h.update(memoryview(block).cast("B"))
+    return h.hexdigest()
+
+
+def _json_default(value):
+    # numpy scalars from some decoders
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class ASRCache:
+    """Directory of gzip'd JSON results with size-bounded LRU eviction"""
+
+    def __init__(self, directory: str = ASR_CACHE_DIR, max_mb: float = ASR_CACHE_MAX_MB,
+                 enabled: bool = ASR_CACHE_ENABLED):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._total_bytes = None  # Size of the cache directory, scanned on the first write
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, fingerprint: str, model_id: str, options: Optional[dict] = None) -> str:
+        payload = json.dumps({"audio": fingerprint, "model": model_id, "options": options or {}},
+                             sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json.gz")
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)  # Mark as recently used
+            self.hits += 1
+            return result
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Discarding unreadable ASR cache entry {key}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: dict):
+        if not self.enabled:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        replaced = self._size(path)
+        # Write to a temp file and rename, so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(result, default=_json_default).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️  Could not write ASR cache entry: {e}")
+            self._remove(tmp_path)
+            return
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]  # Includes this entry
+            else:
+                self._total_bytes += self._size(path) - replaced
+            full = self._total_bytes > self.max_bytes
+        if full:
+            self.evict()
+
+    def get_or_compute(self, fingerprint: str, model_id: str, options: Optional[dict],
+                       compute: Callable[[], dict]) -> dict:
+        """Cached result for (audio, model, options), computing and storing it on a miss"""
+        key = self.key(fingerprint, model_id, options)
+        result = self.get(key)
+        if result is not None:
+            print(f"   ⚡ ASR cache hit ({model_id})")
+            return result
+        result = compute()
+        self.put(key, result)
+        return result
+
+    def _scan(self):
+        """([(mtime, size, path), ...], total bytes) of every entry on disk"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json.gz"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        return entries, total
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries, total = self._scan()
+            if total > self.max_bytes:
+                for _, size, path in sorted(entries):
+                    self._remove(path)
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            self._total_bytes = total
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "hits": self.hits, "misses": self.misses, "directory": self.directory}
+
+
+# Shared cache for every offline transcription path
+asr_cache = ASRCache()
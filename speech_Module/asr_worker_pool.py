@@ -0,0 +1,151 @@
+# speech_Module/asr_worker_pool.py
+"""
+Bounded ASR worker pool for live transcription.
+
+Keeps Whisper inference off the asyncio event loop. Every meeting gets its own
+FIFO queue of bounded depth; workers pick meetings round-robin so one busy
+meeting cannot starve the others, and a meeting never has more than one job in
+flight so its captions stay in order.
+"""
+import asyncio
+import functools
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from speech_Module.batched_decoder import LIVE_ASR_BATCHING, LIVE_ASR_MAX_BATCH
+
+# Threads share the loaded models instead of copying them into every worker.
+# An openai-whisper model decodes one call at a time (see inference_lock in
+# whisper_loader), so extra workers overlap audio preparation, VAD and
+# different models (the overload fallback, cascade tiers); CTranslate2 models
+# decode concurrently.
+ASR_WORKERS = int(os.getenv("ASR_WORKERS", "2"))
+ASR_MAX_QUEUE_DEPTH = int(os.getenv("ASR_MAX_QUEUE_DEPTH", "4"))
+
+# Jobs that may be in flight at once. With micro-batching a job mostly waits
+# for its batch, so every executor thread needs a full batch's worth of jobs.
+ASR_MAX_IN_FLIGHT = ASR_WORKERS * LIVE_ASR_MAX_BATCH if LIVE_ASR_BATCHING else ASR_WORKERS
+
+
+class ASRWorkerPool:
+    """Fair, bounded scheduler that runs ASR jobs on a dedicated executor"""
+
+    def __init__(
+        self,
+        workers: int = ASR_WORKERS,
+        max_queue_depth: int = ASR_MAX_QUEUE_DEPTH,
+        max_in_flight: int = ASR_MAX_IN_FLIGHT
+    ):
+        self.workers = max(1, workers)
+        self.max_queue_depth = max(1, max_queue_depth)
+        self.max_in_flight = max(self.workers, max_in_flight)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asr")
+
+        # meeting_id -> deque of (func, args, on_result, trace); order = round-robin order
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._busy = set()  # meetings with a job currently running
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks = []
+
+        # meeting_id -> number of jobs dropped because the queue was full
+        self.dropped = {}
+
+    def _ensure_started(self):
+        """Start worker tasks on the running loop (the pool is created at import time)"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.max_in_flight)]
+
+    def submit(
+        self, meeting_id: str, func: Callable, *args, on_result: Optional[Callable] = None, trace=None
+    ) -> bool:
+        """
+        Queue a job for a meeting without waiting for it.
+
+        `func` runs on the executor (or is awaited directly if it is a
+        coroutine function); `on_result` is awaited on the event loop with its
+        return value. When the meeting's queue is full the oldest job is
+        dropped so latency stays bounded. Returns False if a job was dropped.
+        `trace` (a utils.latency_metrics.LatencyTrace) gets the inference
+        start/end marks.
+        """
+        self._ensure_started()
+        queue = self._queues.setdefault(meeting_id, deque())
+
+        accepted = True
+        if len(queue) >= self.max_queue_depth:
+            queue.popleft()
+            self.dropped[meeting_id] = self.dropped.get(meeting_id, 0) + 1
+            accepted = False
+
+        queue.append((func, args, on_result, trace))
+        self._wakeup.set()
+        return accepted
+
+    def queue_depth(self, meeting_id: str) -> int:
+        """Number of jobs waiting (not running) for a meeting"""
+        return len(self._queues.get(meeting_id, ()))
+
+    def discard(self, meeting_id: str):
+        """Drop all queued jobs for a meeting (a running job is left to finish)"""
+        self._queues.pop(meeting_id, None)
+        self.dropped.pop(meeting_id, None)
+
+    def _next_job(self):
+        """Pick the next job round-robin across meetings that are not busy"""
+        for meeting_id in list(self._queues):
+            queue = self._queues[meeting_id]
+            if not queue:
+                if meeting_id not in self._busy:
+                    del self._queues[meeting_id]
+                continue
+            if meeting_id in self._busy:
+                continue
+
+            job = queue.popleft()
+            self._queues.move_to_end(meeting_id)
+            return meeting_id, job
+        return None
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            picked = self._next_job()
+            if picked is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            meeting_id, (func, args, on_result, trace) = picked
+            self._busy.add(meeting_id)
+            try:
+                if trace is not None:
+                    trace.mark("inference_start")
+                if asyncio.iscoroutinefunction(func):
+                    result = await func(*args)
+                else:
+                    result = await loop.run_in_executor(self.executor, functools.partial(func, *args))
+                if trace is not None:
+                    trace.mark("inference_end")
+                if on_result:
+                    await on_result(result)
+            except Exception as e:
+                print(f"❌ ASR job failed for meeting {meeting_id}: {e}")
+            finally:
+                self._busy.discard(meeting_id)
+                # The meeting may have more work queued behind this job
+                self._wakeup.set()
+
+    def shutdown(self):
+        """Cancel worker tasks and stop the executor"""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self.executor.shutdown(wait=False)
+
+
+# Global pool shared by all live meetings
+asr_pool = ASRWorkerPool()
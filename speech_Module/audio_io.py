@@ -0,0 +1,111 @@
+# speech_Module/audio_io.py
+"""
+Decode a recording once into 16 kHz mono float32 and slice it in memory.
+
+`whisper.load_audio` spawns ffmpeg and decodes the whole file on every call,
+so transcribing N diarized turns used to decode the file N times. Here ffmpeg
+writes raw float32 samples to a temporary file once; short recordings are
+read into RAM, long ones are memory-mapped so their pages are shared by
+every reader (including worker processes) and only touched when sliced.
+
+    with decode_audio(path) as audio:
+        piece = audio.slice(12.5, 18.0)   # zero-copy view
+"""
+import os
+import subprocess
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Recordings at least this long are memory-mapped instead of read into RAM
+AUDIO_MMAP_MIN_SECONDS = float(os.getenv("AUDIO_MMAP_MIN_SECONDS", "600"))
+
+
+class DecodedAudio:
+    """
+    Float32 samples of one recording. `samples` is an ndarray or np.memmap;
+    `raw_path` is the raw float32 file backing it while it is open (workers
+    can map it themselves with `np.memmap(raw_path, np.float32, "r")`).
+    """
+
+    def __init__(self, samples: np.ndarray, raw_path: Optional[str] = None, sample_rate: int = SAMPLE_RATE):
+        self.samples = samples
+        self.raw_path = raw_path
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def is_mapped(self) -> bool:
+        return isinstance(self.samples, np.memmap)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def slice(self, start_time: float, end_time: Optional[float] = None) -> np.ndarray:
+        """View of [start_time, end_time) seconds (clamped to the recording)"""
+        start = max(0, int(start_time * self.sample_rate))
+        end = len(self.samples) if end_time is None else min(len(self.samples), int(end_time * self.sample_rate))
+        return self.samples[start:max(start, end)]
+
+    def close(self):
+        """
+        Drop our reference to the samples and delete the raw file. Views
+        still held elsewhere keep the mapping alive until they are freed.
+        """
+        self.samples = np.zeros(0, dtype=np.float32)
+        if self.raw_path:
+            try:
+                os.remove(self.raw_path)
+            except OSError:
+                pass
+            self.raw_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def decode_audio(path: str, sample_rate: int = SAMPLE_RATE, mmap: Optional[bool] = None) -> DecodedAudio:
+    """
+    Decode `path` (any format ffmpeg reads) once. `mmap=None` maps the
+    result if it is longer than AUDIO_MMAP_MIN_SECONDS; True/False forces it.
+    Close the result (or use it as a context manager) to free the raw file.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The audio file {path} does not exist.")
+
+    fd, raw_path = tempfile.mkstemp(suffix=".f32")
+    os.close(fd)
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-y", "-i", path,
+        "-f", "f32le", "-ac", "1", "-acodec", "pcm_f32le", "-ar", str(sample_rate),
+        raw_path,
+    ]
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        os.remove(raw_path)
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode(errors='ignore')}") from e
+    except Exception:
+        os.remove(raw_path)
+        raise
+
+    n_samples = os.path.getsize(raw_path) // 4
+    if mmap is None:
+        mmap = n_samples >= AUDIO_MMAP_MIN_SECONDS * sample_rate
+
+    if mmap and n_samples:
+        samples = np.memmap(raw_path, dtype=np.float32, mode="r", shape=(n_samples,))
+        return DecodedAudio(samples, raw_path, sample_rate)
+
+    samples = np.fromfile(raw_path, dtype=np.float32)
+    os.remove(raw_path)
+    return DecodedAudio(samples, None, sample_rate)
@@ -0,0 +1,236 @@
+# speech_Module/batched_decoder.py
+"""
+Cross-meeting micro-batching for live Whisper decoding.
+
+Whisper's encoder always runs on a padded 30-second log-mel window, so a
+5-second live chunk costs as much encoder time as a full window. Collecting
+ready windows from several meetings for a few milliseconds and running them
+through the encoder and decoder as one batch amortizes that cost.
+
+The same batching serves the offline pipeline: `transcribe_turns` decodes
+short diarized speaker turns in padded mel batches instead of one
+`model.transcribe` call per turn.
+"""
+import asyncio
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from speech_Module.decoding_profiles import decode_options, get_profile, has_fallback, is_silence, transcribe_options
+
+LIVE_ASR_BATCHING = os.getenv("LIVE_ASR_BATCHING", "0") == "1"
+LIVE_ASR_BATCH_WINDOW_MS = float(os.getenv("LIVE_ASR_BATCH_WINDOW_MS", "50"))
+LIVE_ASR_MAX_BATCH = int(os.getenv("LIVE_ASR_MAX_BATCH", "8"))
+OFFLINE_TURN_BATCH_SIZE = int(os.getenv("OFFLINE_TURN_BATCH_SIZE", "16"))
+
+# One Whisper window; longer turns need transcribe()'s sliding window
+MAX_BATCH_CLIP_SECONDS = 30.0
+
+
+def decode_batch(model, audios: List[np.ndarray], **decode_options) -> List[dict]:
+    """
+    Decode several float32 clips (each up to 30 s) in a single forward pass.
+
+    Each clip is padded to a 30 s window and its log-mel spectrogram stacked
+    into one (batch, n_mels, frames) tensor for `whisper.decode`.
+    Returns one dict per clip with the text and decoding confidence.
+
+    The CTranslate2 backend has no batched decode here, so its clips are
+    transcribed one by one with the same result shape.
+    """
+    from speech_Module.whisper_loader import inference_lock, is_openai_whisper
+
+    if not is_openai_whisper(model):
+        return [_transcribe_one(model, audio, **decode_options) for audio in audios]
+
+    import torch
+    import whisper
+
+    mels = [
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(audio)), model.dims.n_mels)
+        for audio in audios
+    ]
+    mel = torch.stack(mels).to(model.device)
+
+    # whisper.decode, unlike transcribe, does not fall back to fp32 on CPU
+    decode_options.setdefault("fp16", model.device.type == "cuda")
+    decode_options.setdefault("without_timestamps", True)
+    options = whisper.DecodingOptions(**decode_options)
+
+    with inference_lock(model), torch.no_grad():
+        results = whisper.decode(model, mel, options)
+
+    return [
+        {
+            "text": r.text.strip(),
+            "language": r.language,
+            "avg_logprob": r.avg_logprob,
+            "no_speech_prob": r.no_speech_prob,
+            "compression_ratio": r.compression_ratio,
+        }
+        for r in results
+    ]
+
+
+def _transcribe_one(model, audio: np.ndarray, **decode_options) -> dict:
+    """Per-clip fallback for decode_batch, summarizing segments like a DecodingResult"""
+    decode_options.pop("without_timestamps", None)
+    decode_options["condition_on_previous_text"] = False
+    result = model.transcribe(audio, **decode_options)
+    from speech_Module.live_transcript import result_confidence
+
+    segments = result.get("segments", [])
+    avg_logprob, no_speech_prob = result_confidence(result)
+    return {
+        "text": result["text"].strip(),
+        "language": result.get("language"),
+        "avg_logprob": avg_logprob,
+        "no_speech_prob": no_speech_prob,
+        "compression_ratio": float(max((s["compression_ratio"] for s in segments), default=0.0)),
+    }
+
+
+def _needs_fallback(result: dict, profile: str = "offline") -> bool:
+    """whisper.transcribe would retry these at a higher temperature"""
+    if not has_fallback(profile) or is_silence(result, profile):
+        return False  # silence, not a failed decode
+    settings = get_profile(profile)
+    return (result["compression_ratio"] > settings["compression_ratio_threshold"]
+            or result["avg_logprob"] < settings["logprob_threshold"])
+
+
+def transcribe_turns(model, audio, turns: List[dict], batch_size: int = OFFLINE_TURN_BATCH_SIZE,
+                     profile: str = "offline", **overrides) -> List[str]:
+    """
+    Transcribe diarized turns ({"start", "end", ...} in seconds) of a
+    DecodedAudio (speech_Module.audio_io). Turns of up to 30 s are decoded
+    `batch_size` at a time in their original order; longer turns and decodes
+    that look failed (repetitive or low confidence) go through
+    `model.transcribe`, which has temperature fallback if the decoding
+    `profile` allows it. Returns one text per turn, "" where Whisper heard
+    no speech.
+    """
+    from speech_Module.whisper_loader import inference_lock
+
+    decode_kwargs = decode_options(profile, **overrides)
+    transcribe_kwargs = transcribe_options(profile, **overrides)
+    texts = [""] * len(turns)
+    short, long_ = [], []
+    for i, turn in enumerate(turns):
+        duration = (turn.get("end") or 0) - (turn.get("start") or 0)
+        if duration <= 0:
+            continue
+        (short if duration <= MAX_BATCH_CLIP_SECONDS else long_).append(i)
+
+    def transcribe_one(i):
+        clip = np.array(audio.slice(turns[i]["start"], turns[i]["end"]))
+        with inference_lock(model):
+            return model.transcribe(clip, **transcribe_kwargs)["text"].strip()
+
+    for offset in range(0, len(short), batch_size):
+        indices = short[offset:offset + batch_size]
+        clips = [np.array(audio.slice(turns[i]["start"], turns[i]["end"])) for i in indices]
+        for i, result in zip(indices, decode_batch(model, clips, **decode_kwargs)):
+            if _needs_fallback(result, profile):
+                long_.append(i)
+            elif not is_silence(result, profile):
+                texts[i] = result["text"]
+
+    for i in long_:
+        texts[i] = transcribe_one(i)
+    return texts
+
+
+class MicroBatcher:
+    """
+    Collects decode requests for up to `window_ms` (or until `max_batch`
+    requests are waiting) and runs them as one batch on `executor`.
+    Each caller awaits its own result, so results go back to the right meeting.
+
+    Batches run one at a time: the model decodes one call at a time anyway
+    (see inference_lock in whisper_loader), so requests arriving during a
+    decode join the next batch instead of holding another executor thread.
+    """
+
+    def __init__(
+        self,
+        executor,
+        window_ms: float = LIVE_ASR_BATCH_WINDOW_MS,
+        max_batch: int = LIVE_ASR_MAX_BATCH,
+        model_name: Optional[str] = None,
+        **decode_options
+    ):
+        self.executor = executor
+        self.model_name = model_name  # None = the live role's model
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.decode_options = decode_options
+        self._pending = []  # (audio, options, future)
+        self._timer = None
+        self._running = False
+
+        # Simple counters to check that batching actually happens
+        self.batches_run = 0
+        self.items_decoded = 0
+
+    async def transcribe(self, audio: np.ndarray, **options) -> dict:
+        """
+        Queue one float32 clip and wait for its decoded result. `options`
+        (e.g. the meeting's language) override the batcher's decode options;
+        clips with different options are decoded in separate batches.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((audio, options, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None and not self._running:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self._running:
+            return  # A running batch flushes again when it finishes
+
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        self._running = True
+        asyncio.get_running_loop().create_task(self._run(batch))
+
+    def _decode(self, batch):
+        from speech_Module.whisper_loader import get_whisper_model, load_named_model
+
+        model = load_named_model(self.model_name) if self.model_name else get_whisper_model("live")
+        # One decode per distinct option set (in practice: per language)
+        groups = {}
+        for index, (_, options, _) in enumerate(batch):
+            groups.setdefault(tuple(sorted(options.items())), []).append(index)
+
+        results = [None] * len(batch)
+        for key, indices in groups.items():
+            decoded = decode_batch(model, [batch[i][0] for i in indices], **{**self.decode_options, **dict(key)})
+            for i, result in zip(indices, decoded):
+                results[i] = result
+        return results
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self._decode, batch)
+            self.batches_run += 1
+            self.items_decoded += len(batch)
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._running = False
+            self._flush()
@@ -0,0 +1,120 @@
+# speech_Module/decoding_profiles.py
+"""
+Named Whisper decoding profiles.
+
+A profile fixes the options that trade speed for accuracy:
+
+    live-fast          greedy, no temperature fallback, no conditioning on the
+                       previous window - one decoder pass per chunk
+    balanced           greedy with temperature fallback on failed decodes
+                       (openai-whisper's own `transcribe` defaults)
+    offline-accurate   beam search (5 beams, best of 5 when sampling) with
+                       full temperature fallback
+
+LIVE_DECODING_PROFILE and OFFLINE_DECODING_PROFILE pick one per deployment.
+`benchmarks/bench_decoding_profiles.py` measures each profile's real-time
+factor and WER on a reference clip.
+
+    model.transcribe(audio, **transcribe_options("live", language="en"))
+    whisper.DecodingOptions(**decode_options("offline", language="en"))
+"""
+import os
+
+PROFILES = {
+    "live-fast": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": (0.0,),
+        "condition_on_previous_text": False,
+        "no_speech_threshold": 0.6,
+        "logprob_threshold": -1.0,
+        "compression_ratio_threshold": 2.4,
+    },
+    "balanced": {
+        "beam_size": None,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "no_speech_threshold": 0.6,
+        "logprob_threshold": -1.0,
+        "compression_ratio_threshold": 2.4,
+    },
+    "offline-accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "no_speech_threshold": 0.6,
+        "logprob_threshold": -1.0,
+        "compression_ratio_threshold": 2.4,
+    },
+}
+
+LIVE_DECODING_PROFILE = os.getenv("LIVE_DECODING_PROFILE", "live-fast")
+OFFLINE_DECODING_PROFILE = os.getenv("OFFLINE_DECODING_PROFILE", "balanced")
+
+ROLE_PROFILES = {
+    "live": LIVE_DECODING_PROFILE,
+    "offline": OFFLINE_DECODING_PROFILE,
+}
+
+
+def get_profile(name: str) -> dict:
+    """Settings of a profile, by profile name or by role ("live" / "offline")"""
+    name = ROLE_PROFILES.get(name, name)
+    if name not in PROFILES:
+        raise ValueError(f"Unknown decoding profile '{name}', expected one of {list(PROFILES)}")
+    return PROFILES[name]
+
+
+def profile_name(name: str) -> str:
+    """Profile name behind a role, e.g. "live" -> "live-fast" (for cache keys and logs)"""
+    return ROLE_PROFILES.get(name, name)
+
+
+def _precision(profile: str, options: dict):
+    # Live decodes always ran in fp32; elsewhere Whisper picks (fp16 on GPU, fp32 on CPU)
+    if profile == "live":
+        options["fp16"] = False
+
+
+def transcribe_options(profile: str, **overrides) -> dict:
+    """Keyword arguments for `model.transcribe` under a profile; `overrides` win"""
+    options = dict(get_profile(profile))
+    _precision(profile, options)
+    options.update(overrides)
+    if len(options["temperature"]) == 1:
+        options["temperature"] = options["temperature"][0]
+    return options
+
+
+def decode_options(profile: str, **overrides) -> dict:
+    """
+    Keyword arguments for `whisper.DecodingOptions` (a single decoder pass,
+    as used by batched decoding). Only the first temperature applies; beam
+    search is for greedy passes and best_of for sampling ones, as Whisper
+    requires.
+    """
+    settings = get_profile(profile)
+    temperature = settings["temperature"][0]
+    options = {"temperature": temperature}
+    _precision(profile, options)
+    if temperature == 0:
+        if settings["beam_size"]:
+            options["beam_size"] = settings["beam_size"]
+    elif settings["best_of"]:
+        options["best_of"] = settings["best_of"]
+    options.update(overrides)
+    return options
+
+
+def has_fallback(profile: str) -> bool:
+    """True when failed decodes should be retried at higher temperatures"""
+    return len(get_profile(profile)["temperature"]) > 1
+
+
+def is_silence(result: dict, profile: str = "offline") -> bool:
+    """Whisper's no-speech rule for a decode with "no_speech_prob" and "avg_logprob" """
+    settings = get_profile(profile)
+    return (result["no_speech_prob"] > settings["no_speech_threshold"]
+            and result["avg_logprob"] < settings["logprob_threshold"])
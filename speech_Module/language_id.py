@@ -0,0 +1,155 @@
+# speech_Module/language_id.py
+"""
+Spoken-language detection, once per meeting or file.
+
+Passing `language=None` to Whisper makes it detect the language on every
+call: one extra encoder pass and a language-token decode per live chunk or
+diarized turn, and short chunks are often mis-detected. Instead the
+language is detected once from the first LANGUAGE_DETECT_SECONDS of speech
+and pinned:
+
+    pin = LanguagePin()
+    language = pin.language_for(model, speech)  # detects once, then reuses
+    pin.observe(avg_logprob, no_speech_prob)    # weak decodes unpin it
+
+If LANGUAGE_REDETECT_CHUNKS decodes in a row fall below
+LANGUAGE_REDETECT_LOGPROB (the meeting switched language, or the first
+guess was wrong), the pin is released and the next LANGUAGE_DETECT_SECONDS
+of speech are detected again.
+
+LIVE_LANGUAGE / TRANSCRIBE_LANGUAGE set a fixed language code instead of
+"auto" for deployments that only ever see one language.
+"""
+import os
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+LIVE_LANGUAGE = os.getenv("LIVE_LANGUAGE", "auto")
+TRANSCRIBE_LANGUAGE = os.getenv("TRANSCRIBE_LANGUAGE", "auto")
+LANGUAGE_DETECT_SECONDS = float(os.getenv("LANGUAGE_DETECT_SECONDS", "10"))
+LANGUAGE_MIN_PROBABILITY = float(os.getenv("LANGUAGE_MIN_PROBABILITY", "0.5"))
+LANGUAGE_REDETECT_LOGPROB = float(os.getenv("LANGUAGE_REDETECT_LOGPROB", "-1.0"))
+LANGUAGE_REDETECT_CHUNKS = int(os.getenv("LANGUAGE_REDETECT_CHUNKS", "3"))
+# Summaries are written in this language and translated into the meeting's;
+# that translation model is warmed up once a meeting's language is known
+SUMMARY_LANGUAGE = os.getenv("SUMMARY_LANGUAGE", "en")
+
+SAMPLE_RATE = 16000
+
+
+def fixed_language(setting: str) -> Optional[str]:
+    """Language code for a LIVE_LANGUAGE / TRANSCRIBE_LANGUAGE value, None for "auto" """
+    return None if not setting or setting.lower() == "auto" else setting.lower()
+
+
+def detect_language(model, audio: np.ndarray) -> Tuple[str, float]:
+    """(language code, probability) for float32 16 kHz speech (first 30 s are used)"""
+    from speech_Module.whisper_loader import inference_lock, is_openai_whisper
+
+    if not is_openai_whisper(model):
+        return model.detect_language(audio)
+    if not model.is_multilingual:
+        return "en", 1.0  # English-only checkpoints (*.en)
+
+    import torch
+    import whisper
+
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(audio)), model.dims.n_mels)
+    with inference_lock(model), torch.no_grad():
+        _, probs = model.detect_language(mel.to(model.device))
+    language = max(probs, key=probs.get)
+    return language, float(probs[language])
+
+
+def leading_speech(samples: np.ndarray, seconds: float = LANGUAGE_DETECT_SECONDS,
+                   sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """The first `seconds` of voiced frames of a recording, joined (silence skipped)"""
+    from speech_Module.vad import VAD_FRAME_MS, VAD_THRESHOLD_DBFS, dbfs_to_amplitude, frame_rms
+
+    frame = sample_rate * VAD_FRAME_MS // 1000
+    wanted = int(seconds * sample_rate)
+    threshold = dbfs_to_amplitude(VAD_THRESHOLD_DBFS) / 32768.0  # float32 scale
+    pieces, total = [], 0
+    # Scan in blocks so a memory-mapped recording is only read as far as needed
+    block = 60 * sample_rate
+    for offset in range(0, len(samples), block):
+        chunk = np.asarray(samples[offset:offset + block], dtype=np.float32)
+        voiced = np.flatnonzero(frame_rms(chunk, frame) >= threshold)
+        for i in voiced:
+            pieces.append(chunk[i * frame:(i + 1) * frame])
+            total += frame
+            if total >= wanted:
+                return np.concatenate(pieces)
+    return np.concatenate(pieces) if pieces else np.asarray(samples[:wanted], dtype=np.float32)
+
+
+def detect_audio_language(model, samples: np.ndarray) -> Tuple[str, float]:
+    """Detect the language of a whole recording from its leading speech"""
+    return detect_language(model, leading_speech(samples))
+
+
+class LanguagePin:
+    """A meeting's language: detected once from its first speech, re-detected on weak decodes"""
+
+    def __init__(self, setting: str = LIVE_LANGUAGE, detect_seconds: float = LANGUAGE_DETECT_SECONDS,
+                 sample_rate: int = SAMPLE_RATE):
+        self.fixed = fixed_language(setting)
+        self.language = self.fixed
+        self.probability = 1.0 if self.fixed else 0.0
+        self.pinned = self.fixed is not None
+        self.detect_samples = int(detect_seconds * sample_rate)
+        self.detections = 0
+        self._speech = []
+        self._speech_samples = 0
+        self._weak_streak = 0
+        self._change = None  # (language, probability) not yet reported
+        self._lock = threading.Lock()
+
+    def language_for(self, model, audio: np.ndarray, collect: bool = True) -> Optional[str]:
+        """
+        Language to decode `audio` with. Until enough speech has been seen
+        this is the previous guess (None at the very start, which lets
+        Whisper detect per chunk). Pass collect=False for audio that will be
+        seen again (streaming partials). Blocking when it runs detection.
+        """
+        with self._lock:
+            if self.pinned or not collect:
+                return self.language
+            self._speech.append(audio)
+            self._speech_samples += len(audio)
+            if self._speech_samples < self.detect_samples:
+                return self.language
+            sample = np.concatenate(self._speech)[:self.detect_samples]
+            self._speech, self._speech_samples = [], 0
+
+        language, probability = detect_language(model, sample)
+        with self._lock:
+            self.detections += 1
+            self.language, self.probability = language, probability
+            if probability >= LANGUAGE_MIN_PROBABILITY:
+                self.pinned = True
+                self._weak_streak = 0
+                self._change = (language, probability)
+            return language
+
+    def observe(self, avg_logprob: float, no_speech_prob: float):
+        """Feed back a decode's confidence; enough weak decodes in a row release the pin"""
+        if self.fixed or not self.pinned:
+            return
+        if no_speech_prob > 0.6:
+            return  # Silence says nothing about the language
+        with self._lock:
+            self._weak_streak = self._weak_streak + 1 if avg_logprob < LANGUAGE_REDETECT_LOGPROB else 0
+            if self._weak_streak >= LANGUAGE_REDETECT_CHUNKS:
+                print(f"🌐 Low decode confidence in '{self.language}', re-detecting language...")
+                self.pinned = False
+                self._weak_streak = 0
+
+    def take_change(self) -> Optional[Tuple[str, float]]:
+        """The newly pinned (language, probability) once, then None until it changes again"""
+        with self._lock:
+            change, self._change = self._change, None
+            return change
@@ -0,0 +1,304 @@
+# speech_Module/live_diarization.py
+"""
+Online speaker labels for live captions.
+
+pyannote only runs after the meeting, so live captions used to be labeled
+"Meeting Bot". With LIVE_DIARIZATION=1 every transcribed chunk also gets a
+speaker embedding (speechbrain ECAPA, LIVE_DIARIZATION_MODEL) on a dedicated
+CPU thread, and the embedding is assigned to an incrementally maintained set
+of speaker centroids:
+
+    tracker = LiveSpeakerTracker()
+    label, merges = await tracker.identify(pcm16)   # "Speaker 2", [("Speaker 4", "Speaker 2")]
+
+- A chunk closer than LIVE_SPEAKER_THRESHOLD (cosine) to no centroid starts
+  a new speaker, up to LIVE_SPEAKER_MAX_SPEAKERS.
+- Two centroids that drift closer than LIVE_SPEAKER_MERGE_THRESHOLD are
+  merged; the newer label is reported so clients can relabel its lines.
+- A speaker whose recent embeddings form two distinct groups (two people
+  that were clustered together early on) is split in two.
+
+Per-meeting state is bounded: at most LIVE_SPEAKER_MAX_SPEAKERS centroids,
+each with its last LIVE_SPEAKER_RECENT embeddings. Chunks shorter than
+LIVE_SPEAKER_MIN_SECONDS, and chunks arriving while the embedding thread is
+behind, keep the previous speaker instead of being embedded.
+
+After the meeting `reconcile_speakers` maps every live label to the offline
+(pyannote) speaker it overlaps most.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+LIVE_DIARIZATION = os.getenv("LIVE_DIARIZATION", "0") == "1"
+LIVE_DIARIZATION_MODEL = os.getenv("LIVE_DIARIZATION_MODEL", "speechbrain/spkrec-ecapa-voxceleb")
+LIVE_DIARIZATION_THREADS = int(os.getenv("LIVE_DIARIZATION_THREADS", "1"))
+LIVE_SPEAKER_THRESHOLD = float(os.getenv("LIVE_SPEAKER_THRESHOLD", "0.5"))
+LIVE_SPEAKER_MERGE_THRESHOLD = float(os.getenv("LIVE_SPEAKER_MERGE_THRESHOLD", "0.7"))
+LIVE_SPEAKER_MAX_SPEAKERS = int(os.getenv("LIVE_SPEAKER_MAX_SPEAKERS", "8"))
+LIVE_SPEAKER_MIN_SECONDS = float(os.getenv("LIVE_SPEAKER_MIN_SECONDS", "1.0"))
+# Longer chunks are embedded from their middle this many seconds
+LIVE_SPEAKER_MAX_SECONDS = float(os.getenv("LIVE_SPEAKER_MAX_SECONDS", "6"))
+LIVE_SPEAKER_RECENT = int(os.getenv("LIVE_SPEAKER_RECENT", "24"))
+# Chunks waiting for the embedding thread before new ones skip it
+LIVE_SPEAKER_MAX_PENDING = int(os.getenv("LIVE_SPEAKER_MAX_PENDING", "2"))
+
+SAMPLE_RATE = 16000
+DEFAULT_SPEAKER = "Meeting Bot"
+
+# A speaker is checked for a split every this many assignments, and each
+# half needs this many of its recent embeddings
+SPLIT_CHECK_EVERY = 8
+SPLIT_MIN_MEMBERS = 6
+
+_encoder = None
+_encoder_available = True
+_encoder_lock = threading.Lock()
+
+# Embeddings run here, not on the ASR threads, so captions are never queued behind them
+embedding_executor = ThreadPoolExecutor(max_workers=max(1, LIVE_DIARIZATION_THREADS),
+                                        thread_name_prefix="live-diarization")
+_pending = 0  # chunks handed to embedding_executor and not finished (all meetings)
+
+
+def get_encoder():
+    """The speaker embedding model, loaded once; None if speechbrain is not installed"""
+    global _encoder, _encoder_available
+    with _encoder_lock:
+        if _encoder is None and _encoder_available:
+            try:
+                try:
+                    from speechbrain.inference.speaker import EncoderClassifier
+                except ImportError:
+                    from speechbrain.pretrained import EncoderClassifier  # speechbrain < 1.0
+                _encoder = EncoderClassifier.from_hparams(
+                    source=LIVE_DIARIZATION_MODEL,
+                    savedir=os.path.join("pretrained_models", LIVE_DIARIZATION_MODEL.replace("/", "_")),
+                    run_opts={"device": "cpu"},
+                )
+                print(f"✅ Live speaker embeddings loaded ({LIVE_DIARIZATION_MODEL})")
+            except Exception as e:
+                _encoder_available = False
+                print(f"⚠️  Live speaker labels disabled: {str(e)[:100]}")
+        return _encoder
+
+
+def embed(audio: np.ndarray, max_seconds: float = LIVE_SPEAKER_MAX_SECONDS,
+          sample_rate: int = SAMPLE_RATE) -> Optional[np.ndarray]:
+    """Unit-length speaker embedding of float32 16 kHz speech, or None without a model"""
+    encoder = get_encoder()
+    if encoder is None:
+        return None
+
+    import torch
+
+    limit = int(max_seconds * sample_rate)
+    if len(audio) > limit:
+        offset = (len(audio) - limit) // 2
+        audio = audio[offset:offset + limit]
+    with torch.no_grad():
+        vector = encoder.encode_batch(torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))[None])
+    vector = vector.reshape(-1).cpu().numpy().astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else None
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class _Speaker:
+    def __init__(self, number: int, embedding: np.ndarray, seconds: float, recent: int):
+        self.number = number
+        self.total = embedding.astype(np.float64)
+        self.count = 1
+        self.seconds = seconds
+        self.recent = deque([embedding], maxlen=recent)
+        self.since_split_check = 0
+
+    @property
+    def label(self) -> str:
+        return f"Speaker {self.number}"
+
+    @property
+    def centroid(self) -> np.ndarray:
+        return _unit(self.total)
+
+    def add(self, embedding: np.ndarray, seconds: float):
+        self.total += embedding
+        self.count += 1
+        self.seconds += seconds
+        self.recent.append(embedding)
+        self.since_split_check += 1
+
+    def absorb(self, other: "_Speaker"):
+        self.total += other.total
+        self.count += other.count
+        self.seconds += other.seconds
+        self.recent.extend(other.recent)
+
+
+def _two_means(vectors: np.ndarray, iterations: int = 5) -> np.ndarray:
+    """Cosine 2-means seeded with the two least similar vectors; returns 0/1 per row"""
+    sims = vectors @ vectors.T
+    a, b = np.unravel_index(np.argmin(sims), sims.shape)
+    centers = vectors[[a, b]]
+    groups = np.zeros(len(vectors), dtype=int)
+    for _ in range(iterations):
+        groups = np.argmax(vectors @ centers.T, axis=1)
+        if groups.min() == groups.max():
+            break
+        centers = np.stack([_unit(vectors[groups == k].sum(axis=0)) for k in (0, 1)])
+    return groups
+
+
+class OnlineSpeakerClustering:
+    """Incremental cosine clustering of speaker embeddings with merge and split"""
+
+    def __init__(self, threshold: float = LIVE_SPEAKER_THRESHOLD,
+                 merge_threshold: float = LIVE_SPEAKER_MERGE_THRESHOLD,
+                 max_speakers: int = LIVE_SPEAKER_MAX_SPEAKERS, recent: int = LIVE_SPEAKER_RECENT):
+        self.threshold = threshold
+        self.merge_threshold = merge_threshold
+        self.max_speakers = max(1, max_speakers)
+        self.recent = max(2 * SPLIT_MIN_MEMBERS, recent)
+        self.speakers: List[_Speaker] = []
+        self._next_number = 1
+
+    def _new_speaker(self, embedding: np.ndarray, seconds: float) -> _Speaker:
+        speaker = _Speaker(self._next_number, embedding, seconds, self.recent)
+        self._next_number += 1
+        self.speakers.append(speaker)
+        return speaker
+
+    def assign(self, embedding: np.ndarray, seconds: float) -> Tuple[str, List[Tuple[str, str]]]:
+        """Label for one embedding, plus (old label, new label) for speakers merged away"""
+        if not self.speakers:
+            return self._new_speaker(embedding, seconds).label, []
+
+        sims = np.array([s.centroid @ embedding for s in self.speakers])
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold and len(self.speakers) < self.max_speakers:
+            return self._new_speaker(embedding, seconds).label, []
+
+        speaker = self.speakers[best]
+        speaker.add(embedding, seconds)
+        merges = self._merge_into_neighbours(speaker)
+        speaker = self._survivor(speaker, merges)
+        self._maybe_split(speaker)
+        return speaker.label, merges
+
+    def _survivor(self, speaker: _Speaker, merges) -> _Speaker:
+        for old, new in merges:
+            if old == speaker.label:
+                return next(s for s in self.speakers if s.label == new)
+        return speaker
+
+    def _merge_into_neighbours(self, speaker: _Speaker) -> List[Tuple[str, str]]:
+        """Merge any speaker whose centroid is now too close to `speaker`'s; the older label survives"""
+        merges = []
+        centroid = speaker.centroid
+        for other in list(self.speakers):
+            if other is speaker or other not in self.speakers or other.centroid @ centroid < self.merge_threshold:
+                continue
+            keep, drop = (speaker, other) if speaker.number < other.number else (other, speaker)
+            keep.absorb(drop)
+            self.speakers.remove(drop)
+            merges.append((drop.label, keep.label))
+            speaker, centroid = keep, keep.centroid
+        return merges
+
+    def _maybe_split(self, speaker: _Speaker):
+        """Split a speaker whose recent embeddings form two distinct voices"""
+        if (speaker.since_split_check < SPLIT_CHECK_EVERY or len(speaker.recent) < 2 * SPLIT_MIN_MEMBERS
+                or len(self.speakers) >= self.max_speakers):
+            return
+        speaker.since_split_check = 0
+
+        vectors = np.stack(speaker.recent)
+        groups = _two_means(vectors)
+        sizes = np.bincount(groups, minlength=2)
+        if sizes.min() < SPLIT_MIN_MEMBERS:
+            return
+        halves = [vectors[groups == k] for k in (0, 1)]
+        if _unit(halves[0].sum(axis=0)) @ _unit(halves[1].sum(axis=0)) >= self.threshold:
+            return
+
+        # The latest embedding's group keeps the label, since it was just assigned to it
+        stay, leave = (0, 1) if groups[-1] == 0 else (1, 0)
+        moved = halves[leave]
+        new = self._new_speaker(_unit(moved.sum(axis=0)), 0.0)
+        new.total = moved.sum(axis=0).astype(np.float64)
+        new.count = len(moved)
+        new.recent = deque(moved, maxlen=self.recent)
+        speaker.total = speaker.total - new.total
+        speaker.count = max(1, speaker.count - len(moved))
+        speaker.recent = deque(halves[stay], maxlen=self.recent)
+        print(f"👥 Split {speaker.label} into {speaker.label} and {new.label}")
+
+
+class LiveSpeakerTracker:
+    """One meeting's live speaker labels"""
+
+    def __init__(self, min_seconds: float = LIVE_SPEAKER_MIN_SECONDS, sample_rate: int = SAMPLE_RATE):
+        self.clustering = OnlineSpeakerClustering()
+        self.min_samples = int(min_seconds * sample_rate)
+        self.sample_rate = sample_rate
+        self.current = DEFAULT_SPEAKER
+        self._lock = threading.Lock()
+
+    def label(self, audio: np.ndarray) -> Tuple[str, List[Tuple[str, str]]]:
+        """Speaker of a float32 chunk and any merges it caused. Blocking (runs the embedding)."""
+        embedding = embed(audio, sample_rate=self.sample_rate)
+        with self._lock:
+            if embedding is None:
+                return self.current, []
+            label, merges = self.clustering.assign(embedding, len(audio) / self.sample_rate)
+            self.current = label
+            return label, merges
+
+    async def identify(self, pcm16: np.ndarray) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Speaker of an int16 chunk, embedded on the embedding thread. Chunks
+        too short to identify, or arriving while that thread is behind, get
+        the previous speaker.
+        """
+        global _pending
+        if len(pcm16) < self.min_samples or _pending >= LIVE_SPEAKER_MAX_PENDING:
+            return self.current, []
+        audio = pcm16.astype(np.float32) / 32768.0  # A copy: the ring buffer may move on meanwhile
+        _pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(embedding_executor, self.label, audio)
+        finally:
+            _pending -= 1
+
+
+def reconcile_speakers(live_turns: List[dict], offline_turns: List[dict]) -> Dict[str, str]:
+    """
+    Map every live label to the offline speaker it overlaps longest.
+    Both are lists of {"start", "end", "speaker"}; live labels that overlap
+    no offline turn are left out.
+    """
+    live = sorted(live_turns, key=lambda t: t["start"])
+    offline = sorted(offline_turns, key=lambda t: t["start"])
+    totals: Dict[str, Dict[str, float]] = {}
+    first = 0
+    for turn in live:
+        # Offline turns that end before this live turn starts end before every later one too
+        while first < len(offline) and offline[first]["end"] <= turn["start"]:
+            first += 1
+        for other in offline[first:]:
+            if other["start"] >= turn["end"]:
+                break
+            shared = min(turn["end"], other["end"]) - max(turn["start"], other["start"])
+            if shared > 0:
+                by_speaker = totals.setdefault(turn["speaker"], {})
+                by_speaker[other["speaker"]] = by_speaker.get(other["speaker"], 0.0) + shared
+    return {label: max(candidates, key=candidates.get) for label, candidates in totals.items()}
@@ -0,0 +1,285 @@
+# speech_Module/live_transcript.py
+"""
+Live transcript sidecar and incremental post-meeting transcription.
+
+While a bot meeting runs, every finished live ASR chunk is appended to
+`<recording>.live.jsonl` with its position in the recording and its decode
+confidence. Chunks the worker pool dropped (or that were still queued when
+the bot left) are logged as "dropped".
+
+After the meeting, `incremental_transcribe` reuses every confident chunk and
+re-decodes only the regions that need it with the offline model:
+low-confidence chunks, dropped chunks, and chunks that were cut mid-speech
+(VAD forced cuts) together with their neighbour. Regions close together are
+decoded as one, and long recordings send them to the parallel transcription
+pool. The result has the same shape as `model.transcribe`, so post-meeting
+analysis does not change.
+
+Live decodes log their word timings (LIVE_WORD_TIMESTAMPS=1), so kept chunks
+keep their words. The header records whether the meeting's decodes could
+have them (micro-batched decodes cannot); only then is a chunk without words
+re-decoded when word timestamps are requested.
+"""
+import contextlib
+import json
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+POST_MEETING_REUSE_LIVE = os.getenv("POST_MEETING_REUSE_LIVE", "1") == "1"
+LIVE_REUSE_MIN_LOGPROB = float(os.getenv("LIVE_REUSE_MIN_LOGPROB", "-0.8"))
+LIVE_REUSE_REGION_PAD_SECONDS = float(os.getenv("LIVE_REUSE_REGION_PAD_SECONDS", "0.3"))
+# Regions separated by less than this are re-decoded as one (with the chunks between them)
+LIVE_REUSE_MERGE_GAP_SECONDS = float(os.getenv("LIVE_REUSE_MERGE_GAP_SECONDS", "2.0"))
+# Live chunk decodes produce word timings for the sidecar
+LIVE_WORD_TIMESTAMPS = os.getenv("LIVE_WORD_TIMESTAMPS", "1") == "1"
+
+# Chunks closer than this were cut without a pause between them
+_TOUCHING_SECONDS = 0.05
+
+
+def sidecar_path(recording_path: str) -> str:
+    return os.path.splitext(recording_path)[0] + ".live.jsonl"
+
+
+def result_confidence(result: dict) -> Tuple[float, float]:
+    """(avg_logprob, no_speech_prob) of a transcribe() result, as Whisper reports per window"""
+    segments = result.get("segments") or []
+    if not segments:
+        return 0.0, 1.0
+    avg_logprob = float(np.mean([s["avg_logprob"] for s in segments]))
+    return avg_logprob, float(segments[0]["no_speech_prob"])
+
+
+class LiveTranscriptLog:
+    """Append-only JSONL log of live chunk results for one meeting"""
+
+    def __init__(self, path: str, sample_rate: int = 16000, segmentation: str = "vad", words: bool = False):
+        """`words`: the meeting's live decodes log word timings with their chunks"""
+        self.path = path
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._file = open(path, "w", encoding="utf-8")
+        self._write({"type": "header", "sample_rate": sample_rate, "segmentation": segmentation, "words": words})
+
+    def _write(self, entry: dict):
+        with self._lock:
+            if self._file is None:
+                return  # Results that arrive after the meeting ended were logged as dropped
+            self._file.write(json.dumps(entry) + "\n")
+
+    def chunk(self, start: int, end: int, text: str, avg_logprob: float, no_speech_prob: float,
+              words: Optional[List[Tuple[str, int, int]]] = None):
+        """
+        Record a finished chunk; positions are sample indices in the recording.
+        `words` are (text, start_sample, end_sample) tuples when the live
+        decode had word timestamps.
+        """
+        entry = {
+            "type": "chunk",
+            "start": round(start / self.sample_rate, 3),
+            "end": round(end / self.sample_rate, 3),
+            "text": text,
+            "avg_logprob": round(float(avg_logprob), 4),
+            "no_speech_prob": round(float(no_speech_prob), 4),
+        }
+        if words is not None:
+            entry["words"] = [
+                [word, round(s / self.sample_rate, 3), round(e / self.sample_rate, 3)] for word, s, e in words
+            ]
+        self._write(entry)
+
+    def language(self, language: str, probability: float):
+        """Record the meeting's detected language (offline re-decodes reuse it)"""
+        self._write({"type": "language", "language": language, "probability": round(float(probability), 3)})
+
+    def speaker(self, start: int, end: int, label: str):
+        """Record the live speaker label of a chunk (reconciled with the offline pass later)"""
+        self._write({
+            "type": "speaker",
+            "start": round(start / self.sample_rate, 3),
+            "end": round(end / self.sample_rate, 3),
+            "speaker": label,
+        })
+
+    def speaker_merge(self, old: str, new: str):
+        """Record that live speaker `old` turned out to be `new`"""
+        self._write({"type": "speaker_merge", "from": old, "into": new})
+
+    def dropped(self, start: int, end: int):
+        """Record audio that was never transcribed live"""
+        self._write({
+            "type": "dropped",
+            "start": round(start / self.sample_rate, 3),
+            "end": round(end / self.sample_rate, 3),
+        })
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def load_live_transcript(path: str) -> Optional[dict]:
+    """
+    Read a sidecar into {"segmentation", "words", "language", "chunks",
+    "dropped", "speakers"}, or None if missing. Speaker turns carry their final label
+    (after any live merges).
+    """
+    if not os.path.exists(path):
+        return None
+    log = {"segmentation": "vad", "words": False, "language": None, "chunks": [], "dropped": [], "speakers": []}
+    merged_into = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Torn last line after a crash
+            kind = entry.get("type")
+            if kind == "header":
+                log["segmentation"] = entry.get("segmentation", "vad")
+                log["words"] = entry.get("words", False)
+            elif kind == "chunk":
+                log["chunks"].append(entry)
+            elif kind == "dropped":
+                log["dropped"].append(entry)
+            elif kind == "language":
+                log["language"] = entry["language"]  # The last pinned language wins
+            elif kind == "speaker":
+                log["speakers"].append(entry)
+            elif kind == "speaker_merge":
+                merged_into[entry["from"]] = entry["into"]
+    log["chunks"].sort(key=lambda c: c["start"])
+    for turn in log["speakers"]:
+        while turn["speaker"] in merged_into:
+            turn["speaker"] = merged_into[turn["speaker"]]
+    log["speakers"].sort(key=lambda t: t["start"])
+    return log
+
+
+def _merge_regions(regions: List[Tuple[float, float]], gap: float = 0.0) -> List[Tuple[float, float]]:
+    merged = []
+    for start, end in sorted(regions):
+        if merged and start - merged[-1][1] <= gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def plan_redecode(log: dict, duration: float, min_logprob: float = LIVE_REUSE_MIN_LOGPROB,
+                  pad: float = LIVE_REUSE_REGION_PAD_SECONDS, need_words: bool = False,
+                  merge_gap: float = LIVE_REUSE_MERGE_GAP_SECONDS):
+    """
+    Split the live log into chunks to keep and regions (start, end) in
+    seconds to decode again. A kept chunk never overlaps a region.
+    With `need_words`, chunks logged without word timings are decoded again
+    if the live decodes were logging them (a sidecar without words keeps
+    its chunks, and their segments have no words).
+    """
+    need_words = need_words and log.get("words", False)
+    chunks = log["chunks"]
+    suspect = set()
+    for i, chunk in enumerate(chunks):
+        silent = chunk["no_speech_prob"] > 0.6 and chunk["avg_logprob"] < -1.0
+        if chunk["text"] and chunk["avg_logprob"] < min_logprob and not silent:
+            suspect.add(i)
+        if need_words and chunk["text"] and "words" not in chunk:
+            suspect.add(i)
+        # A forced cut splits speech: decode both sides together
+        if log["segmentation"] == "vad" and i + 1 < len(chunks):
+            if chunks[i + 1]["start"] - chunk["end"] < _TOUCHING_SECONDS:
+                suspect.update((i, i + 1))
+
+    regions = [(chunks[i]["start"], chunks[i]["end"]) for i in suspect]
+    regions += [(d["start"], d["end"]) for d in log["dropped"]]
+    regions = _merge_regions([(max(0.0, s - pad), min(duration, e + pad)) for s, e in regions], merge_gap)
+
+    def overlaps(chunk):
+        return any(chunk["start"] < e and s < chunk["end"] for s, e in regions)
+
+    kept = [c for c in chunks if c["text"] and not overlaps(c)]
+    return kept, regions
+
+
+def _chunk_segment(chunk: dict) -> dict:
+    """A kept live chunk as a transcribe() segment (with words if they were logged)"""
+    segment = {"start": chunk["start"], "end": chunk["end"], "text": " " + chunk["text"].strip()}
+    if "words" in chunk:
+        segment["words"] = [{"word": w, "start": s, "end": e} for w, s, e in chunk["words"]]
+    return segment
+
+
+def _decode_regions(audio, regions: List[Tuple[float, float]], options: dict) -> List[dict]:
+    """
+    Transcribe each region, with timestamps shifted to the recording.
+    Long recordings use the parallel transcription pool (the same rule as a
+    full decode, so the diarization budget holds); short ones decode in-process.
+    """
+    from speech_Module.parallel_transcribe import (
+        SAMPLE_RATE,
+        _offset_result,
+        _transcribe_piece,
+        get_transcribe_pool,
+        uses_worker_pool,
+    )
+    from speech_Module.whisper_loader import get_whisper_model, inference_lock
+
+    if uses_worker_pool(audio.duration) and audio.raw_path is not None:
+        pool = get_transcribe_pool()
+        futures = [
+            pool.submit(_transcribe_piece, audio.raw_path, int(start * SAMPLE_RATE), int(end * SAMPLE_RATE), options)
+            for start, end in regions
+        ]
+        return [f.result() for f in futures]
+
+    model = get_whisper_model("offline")
+    results = []
+    for start, end in regions:
+        with inference_lock(model):
+            result = model.transcribe(np.array(audio.slice(start, end)), **options)
+        results.append(_offset_result(result, start))
+    return results
+
+
+def incremental_transcribe(audio_path: str, log: dict, decoded=None, **options) -> dict:
+    """
+    Combine reusable live chunks with offline re-decodes of the regions that
+    need it. Returns {"text", "segments", "language", "redecoded_seconds"}.
+    Blocking. Pass `decoded` (a DecodedAudio of the file) to reuse an existing decode.
+    """
+    from speech_Module.audio_io import decode_audio
+    from speech_Module.decoding_profiles import transcribe_options
+    from speech_Module.language_id import detect_audio_language
+    from speech_Module.whisper_loader import get_whisper_model
+
+    options = transcribe_options("offline", **options)
+    # Long recordings stay memory-mapped, so pool workers can map the file too
+    with decode_audio(audio_path) if decoded is None else contextlib.nullcontext(decoded) as audio:
+        kept, regions = plan_redecode(log, audio.duration, need_words=bool(options.get("word_timestamps")))
+        segments = [_chunk_segment(c) for c in kept]
+
+        # Short regions detect their language poorly: use the meeting's
+        if regions and options.get("language") is None:
+            options["language"] = log.get("language") or detect_audio_language(
+                get_whisper_model("offline"), audio.samples
+            )[0]
+
+        # Not cached: region boundaries differ from run to run, so entries would
+        # only push whole-file results out of the cache
+        for result in _decode_regions(audio, regions, options) if regions else []:
+            segments += result.get("segments", [])
+
+    segments.sort(key=lambda s: s["start"])
+    for i, seg in enumerate(segments):
+        seg["id"] = i
+    return {
+        "text": "".join(seg["text"] for seg in segments),
+        "segments": segments,
+        "language": options.get("language"),
+        "redecoded_seconds": round(sum(e - s for s, e in regions), 2),
+    }
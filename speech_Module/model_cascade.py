@@ -0,0 +1,125 @@
+# speech_Module/model_cascade.py
+"""
+Confidence-triggered model escalation for live ASR.
+
+With LIVE_CASCADE=1 every live chunk is first decoded by a small model
+(LIVE_CASCADE_FIRST_MODEL, "tiny" by default) and its text is broadcast at
+once. Only chunks the small model was unsure about - average log-probability
+below LIVE_CASCADE_MIN_LOGPROB, or a compression ratio above
+LIVE_CASCADE_MAX_COMPRESSION (repetition loops) - are decoded again by the
+live model (WHISPER_LIVE_MODEL), and the corrected text replaces the first
+one in place on the clients. Chunks that Whisper's no-speech rule calls
+silence are not escalated: their low confidence is the silence itself.
+
+Most meeting audio is easy, so most chunks only ever cost a tiny-model
+decode. CascadeStats counts decodes per tier, escalations and corrections
+per meeting, so the escalation rate can be checked against the thresholds.
+"""
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from speech_Module.decoding_profiles import is_silence
+
+LIVE_CASCADE = os.getenv("LIVE_CASCADE", "0") == "1"
+LIVE_CASCADE_FIRST_MODEL = os.getenv("LIVE_CASCADE_FIRST_MODEL", "tiny")
+LIVE_CASCADE_MIN_LOGPROB = float(os.getenv("LIVE_CASCADE_MIN_LOGPROB", "-0.7"))
+LIVE_CASCADE_MAX_COMPRESSION = float(os.getenv("LIVE_CASCADE_MAX_COMPRESSION", "2.2"))
+
+TIERS = ("first", "escalated")
+
+# Finished meetings kept for inspection before the oldest is dropped
+MAX_TRACKED_MEETINGS = 50
+
+
+def compression_ratio(text: str) -> float:
+    """Whisper's repetition measure: text bytes over zlib-compressed bytes"""
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data)) if data else 0.0
+
+
+def result_compression_ratio(result: dict) -> float:
+    """Highest per-segment compression ratio of a transcribe() result"""
+    segments = result.get("segments") or []
+    if segments and "compression_ratio" in segments[0]:
+        return float(max(s["compression_ratio"] for s in segments))
+    return compression_ratio(result.get("text", ""))
+
+
+def needs_escalation(result: dict, min_logprob: float = LIVE_CASCADE_MIN_LOGPROB,
+                     max_compression: float = LIVE_CASCADE_MAX_COMPRESSION) -> bool:
+    """True for a first-tier result with text that the small model was unsure about"""
+    if not result or not result.get("text"):
+        return False
+    if "no_speech_prob" in result and is_silence(result, "live"):
+        return False
+    return (result["avg_logprob"] < min_logprob
+            or result.get("compression_ratio", 0.0) > max_compression)
+
+
+class TierCounters:
+    """Decode counts and audio seconds per tier for one scope"""
+
+    def __init__(self):
+        self.decodes = {tier: 0 for tier in TIERS}
+        self.audio_seconds = {tier: 0.0 for tier in TIERS}
+        self.escalations = 0
+        self.corrections = 0  # escalations whose text differed from the first pass
+
+    def summary(self) -> dict:
+        first = self.decodes["first"]
+        return {
+            "decodes": dict(self.decodes),
+            "audio_seconds": {tier: round(s, 1) for tier, s in self.audio_seconds.items()},
+            "escalations": self.escalations,
+            "corrections": self.corrections,
+            "escalation_rate": round(self.escalations / first, 3) if first else None,
+        }
+
+
+class CascadeStats:
+    """Per-meeting and global cascade counters"""
+
+    def __init__(self, max_meetings: int = MAX_TRACKED_MEETINGS):
+        self.global_counters = TierCounters()
+        self.meetings: "OrderedDict[str, TierCounters]" = OrderedDict()
+        self.max_meetings = max_meetings
+        self._lock = threading.Lock()
+
+    def _scopes(self, meeting_id: str):
+        counters = self.meetings.get(meeting_id)
+        if counters is None:
+            counters = self.meetings[meeting_id] = TierCounters()
+            while len(self.meetings) > self.max_meetings:
+                self.meetings.popitem(last=False)
+        return self.global_counters, counters
+
+    def record_decode(self, meeting_id: str, tier: str, audio_seconds: float, escalated: bool = False):
+        with self._lock:
+            for counters in self._scopes(meeting_id):
+                counters.decodes[tier] += 1
+                counters.audio_seconds[tier] += audio_seconds
+                if escalated:
+                    counters.escalations += 1
+
+    def record_correction(self, meeting_id: str):
+        with self._lock:
+            for counters in self._scopes(meeting_id):
+                counters.corrections += 1
+
+    def snapshot(self, meeting_id: Optional[str] = None) -> Dict:
+        with self._lock:
+            if meeting_id is not None:
+                return {"meeting_id": meeting_id, **(self.meetings.get(meeting_id) or TierCounters()).summary()}
+            return {
+                "enabled": LIVE_CASCADE,
+                "first_model": LIVE_CASCADE_FIRST_MODEL,
+                "global": self.global_counters.summary(),
+                "meetings": {mid: c.summary() for mid, c in self.meetings.items()},
+            }
+
+
+# Global counters shared by the live pipeline and the metrics endpoint
+cascade_stats = CascadeStats()
@@ -0,0 +1,90 @@
+# speech_Module/overload.py
+"""
+Overload policy for live transcription.
+
+Ingest lag is the amount of meeting audio (in seconds) that has been handed
+to the ASR pool but whose transcription has not come back yet. When it stays
+above LIVE_LAG_THRESHOLD_SECONDS the controller switches on the next action
+of LIVE_OVERLOAD_POLICY, a comma-separated escalation list; when lag falls
+below LIVE_LAG_RECOVER_SECONDS actions are switched off again in reverse
+order. Quality degrades step by step instead of latency growing unbounded.
+
+Actions:
+    skip_nonspeech   stricter energy gate, so only clear speech is decoded
+    widen_chunk      fewer, longer ASR jobs (no window overlap / merged utterances)
+    downgrade_model  decode with LIVE_OVERLOAD_MODEL instead of the live model
+    pause_bot        stop transcribing the bot's audio live until the backlog clears
+                     (it is still recorded, and transcribed after the meeting)
+"""
+import os
+import time
+from typing import List, Optional, Tuple
+
+OVERLOAD_ACTIONS = ("skip_nonspeech", "widen_chunk", "downgrade_model", "pause_bot")
+
+LIVE_OVERLOAD_POLICY = os.getenv("LIVE_OVERLOAD_POLICY", "skip_nonspeech,widen_chunk,downgrade_model")
+LIVE_LAG_THRESHOLD_SECONDS = float(os.getenv("LIVE_LAG_THRESHOLD_SECONDS", "10"))
+LIVE_LAG_RECOVER_SECONDS = float(os.getenv("LIVE_LAG_RECOVER_SECONDS", "3"))
+LIVE_OVERLOAD_COOLDOWN_SECONDS = float(os.getenv("LIVE_OVERLOAD_COOLDOWN_SECONDS", "5"))
+LIVE_OVERLOAD_MODEL = os.getenv("LIVE_OVERLOAD_MODEL", "tiny")
+LIVE_OVERLOAD_GATE_BOOST_DB = float(os.getenv("LIVE_OVERLOAD_GATE_BOOST_DB", "10"))
+LIVE_OVERLOAD_WIDEN_FACTOR = int(os.getenv("LIVE_OVERLOAD_WIDEN_FACTOR", "2"))
+
+
+def parse_policy(policy: str) -> List[str]:
+    """Split a policy string into known actions, keeping their order"""
+    actions = []
+    for name in policy.split(","):
+        name = name.strip()
+        if not name or name == "none":
+            continue
+        if name not in OVERLOAD_ACTIONS:
+            print(f"⚠️  Unknown overload action '{name}' ignored")
+            continue
+        if name not in actions:
+            actions.append(name)
+    return actions
+
+
+class OverloadController:
+    """
+    Per-meeting escalation state. Feed it the current lag with `update()`;
+    it returns (action, enabled) when an action should be switched on or off.
+    Changes are at least `cooldown` seconds apart so one slow job cannot
+    flip the whole list at once.
+    """
+
+    def __init__(
+        self,
+        policy: str = LIVE_OVERLOAD_POLICY,
+        threshold: float = LIVE_LAG_THRESHOLD_SECONDS,
+        recover: float = LIVE_LAG_RECOVER_SECONDS,
+        cooldown: float = LIVE_OVERLOAD_COOLDOWN_SECONDS
+    ):
+        self.actions = parse_policy(policy)
+        self.threshold = threshold
+        self.recover = min(recover, threshold)
+        self.cooldown = cooldown
+        self.level = 0  # Number of actions currently enabled
+        self._last_change = float("-inf")
+
+    @property
+    def active(self) -> List[str]:
+        return self.actions[:self.level]
+
+    def update(self, lag_seconds: float, now: Optional[float] = None) -> Optional[Tuple[str, bool]]:
+        now = time.monotonic() if now is None else now
+        if now - self._last_change < self.cooldown:
+            return None
+
+        if lag_seconds > self.threshold and self.level < len(self.actions):
+            self.level += 1
+            self._last_change = now
+            return self.actions[self.level - 1], True
+
+        if lag_seconds < self.recover and self.level > 0:
+            self.level -= 1
+            self._last_change = now
+            return self.actions[self.level], False
+
+        return None
@@ -0,0 +1,239 @@
+# speech_Module/parallel_transcribe.py
+"""
+Silence-split parallel transcription for long recordings.
+
+One `model.transcribe` over a multi-hour file runs on a single core. Here the
+recording is decoded once, cut at the quietest point near every
+OFFLINE_CHUNK_SECONDS boundary, and the pieces are transcribed concurrently
+by a pool of worker processes (each with its own model). Segment and word
+timestamps are shifted back to global time, and segments that were cut in
+the middle of a sentence at a boundary are merged again.
+
+Short recordings (or OFFLINE_TRANSCRIBE_WORKERS=1) take the plain
+single-call path, so results are unchanged for them.
+"""
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+OFFLINE_TRANSCRIBE_WORKERS = int(os.getenv(
+    "OFFLINE_TRANSCRIBE_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) // 2)))
+))
+OFFLINE_CHUNK_SECONDS = float(os.getenv("OFFLINE_CHUNK_SECONDS", "300"))
+OFFLINE_SPLIT_SEARCH_SECONDS = float(os.getenv("OFFLINE_SPLIT_SEARCH_SECONDS", "30"))
+OFFLINE_PARALLEL_MIN_SECONDS = float(os.getenv("OFFLINE_PARALLEL_MIN_SECONDS", "600"))
+# Cores shared by the pool's workers. Post-meeting analysis diarizes at the
+# same time, so by default the pool gets the cores the diarization worker
+# (DIARIZATION_TORCH_THREADS, half of them) does not.
+OFFLINE_TRANSCRIBE_CPUS = int(os.getenv(
+    "OFFLINE_TRANSCRIBE_CPUS", str(max(1, (os.cpu_count() or 2) - (os.cpu_count() or 2) // 2))
+))
+
+# Segments this close to a cut on both sides are candidates for merging
+BOUNDARY_MERGE_SECONDS = 1.0
+_SENTENCE_END = (".", "?", "!")
+
+
+def find_split_points(audio: np.ndarray, chunk_seconds: float = OFFLINE_CHUNK_SECONDS,
+                      search_seconds: float = OFFLINE_SPLIT_SEARCH_SECONDS,
+                      sample_rate: int = SAMPLE_RATE) -> List[Tuple[int, int]]:
+    """
+    Cut `audio` into pieces of about `chunk_seconds` (never more than
+    `chunk_seconds + search_seconds`), each cut placed at the quietest
+    half-second within `search_seconds` of the nominal boundary.
+    Returns [(start_sample, end_sample), ...] covering the whole file.
+    """
+    from speech_Module.vad import frame_rms
+
+    total = len(audio)
+    chunk = int(chunk_seconds * sample_rate)
+    if total <= chunk:
+        return [(0, total)]
+
+    frame = sample_rate // 100  # 10 ms frames
+    rms = frame_rms(audio, frame)
+    # Half-second moving average, so a cut lands in a pause rather than a gap between syllables
+    smooth = np.convolve(rms, np.ones(50) / 50, mode="same") if len(rms) >= 50 else rms
+    search = int(search_seconds * sample_rate) // frame
+
+    pieces = []
+    start = 0
+    while total - start > chunk + search * frame:
+        nominal = (start + chunk) // frame
+        lo = max(start // frame + 1, nominal - search)
+        hi = min(len(smooth), nominal + search)
+        cut = (lo + int(np.argmin(smooth[lo:hi]))) * frame
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, total))
+    return pieces
+
+
+def _offset_result(result: dict, offset_seconds: float) -> dict:
+    for seg in result.get("segments", []):
+        seg["start"] += offset_seconds
+        seg["end"] += offset_seconds
+        for word in seg.get("words", []) or []:
+            word["start"] += offset_seconds
+            word["end"] += offset_seconds
+    return result
+
+
+def stitch_results(results: List[dict], boundaries: List[float]) -> dict:
+    """
+    Join per-piece results (already in global time) into one whisper-style
+    result. `boundaries` are the cut times between consecutive pieces. A
+    segment that ends right at a cut without finishing its sentence is
+    merged with the first segment after the cut.
+    """
+    segments = []
+    for i, result in enumerate(results):
+        piece = list(result.get("segments", []))
+        if i > 0 and segments and piece:
+            cut = boundaries[i - 1]
+            prev, first = segments[-1], piece[0]
+            if (cut - prev["end"] <= BOUNDARY_MERGE_SECONDS
+                    and first["start"] - cut <= BOUNDARY_MERGE_SECONDS
+                    and not prev["text"].strip().endswith(_SENTENCE_END)):
+                merged = dict(prev)
+                merged["end"] = first["end"]
+                merged["text"] = prev["text"].rstrip() + " " + first["text"].lstrip()
+                if "words" in prev or "words" in first:
+                    merged["words"] = (prev.get("words") or []) + (first.get("words") or [])
+                if "tokens" in prev and "tokens" in first:
+                    merged["tokens"] = prev["tokens"] + first["tokens"]
+                segments[-1] = merged
+                piece = piece[1:]
+        segments.extend(piece)
+
+    for i, seg in enumerate(segments):
+        seg["id"] = i
+
+    languages = Counter(r.get("language") for r in results if r.get("language"))
+    return {
+        "text": "".join(seg["text"] for seg in segments),
+        "segments": segments,
+        "language": languages.most_common(1)[0][0] if languages else None,
+    }
+
+
+# --- worker processes --------------------------------------------------------
+
+def _init_worker(threads: int):
+    # Split the cores between workers instead of every process using all of them
+    try:
+        import torch
+        torch.set_num_threads(max(1, threads))
+    except ImportError:
+        pass
+
+
+def _transcribe_piece(raw_path: str, start: int, end: int, options: dict) -> dict:
+    """Runs in a worker process: transcribe samples [start, end) of the decoded raw float32 file"""
+    from speech_Module.whisper_loader import get_whisper_model, inference_lock
+
+    audio = np.memmap(raw_path, dtype=np.float32, mode="r")
+    piece = np.array(audio[start:end])
+    del audio
+    model = get_whisper_model("offline")
+    with inference_lock(model):
+        result = model.transcribe(piece, **options)
+    return _offset_result(result, start / SAMPLE_RATE)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def uses_worker_pool(duration: float, workers: int = OFFLINE_TRANSCRIBE_WORKERS) -> bool:
+    """True if a recording this long is transcribed by the (core-capped) worker pool, not in-process"""
+    return workers > 1 and duration >= OFFLINE_PARALLEL_MIN_SECONDS
+
+
+def get_transcribe_pool(workers: int = OFFLINE_TRANSCRIBE_WORKERS) -> ProcessPoolExecutor:
+    """Shared worker pool; each process keeps its model loaded between jobs"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            threads = OFFLINE_TRANSCRIBE_CPUS // workers
+            # Spawned, not forked: a fork of a process that has touched CUDA or
+            # torch's thread pools can hang in the child
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker, initargs=(threads,)
+            )
+        return _pool
+
+
+def shutdown_transcribe_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# --- entry point -------------------------------------------------------------
+
+def transcribe_long_audio(audio_path: str, workers: int = OFFLINE_TRANSCRIBE_WORKERS, decoded=None,
+                          **options) -> dict:
+    """
+    Transcribe a recording, in parallel pieces when it is long enough.
+    Takes the same options as `model.transcribe` (on top of the offline
+    decoding profile) and returns the same
+    {"text", "segments", "language"} dict with global timestamps. Blocking.
+    Pass `decoded` (a DecodedAudio of the file) to reuse an existing decode.
+    """
+    from speech_Module.asr_cache import asr_cache, audio_fingerprint
+    from speech_Module.audio_io import decode_audio
+    from speech_Module.decoding_profiles import transcribe_options
+    from speech_Module.whisper_loader import get_model_id
+
+    # The offline decoding profile, unless the caller overrides an option
+    options = transcribe_options("offline", **options)
+
+    def transcribe(audio):
+        return asr_cache.get_or_compute(
+            audio_fingerprint(audio.samples), get_model_id("offline"), options,
+            lambda: _transcribe_decoded(audio, workers, options)
+        )
+
+    if decoded is not None:
+        return transcribe(decoded)
+    parallel = workers > 1
+    # Decoded once; when parallel, kept on disk so workers map it instead of receiving it pickled
+    with decode_audio(audio_path, mmap=True if parallel else None) as audio:
+        return transcribe(audio)
+
+
+def _transcribe_decoded(audio, workers: int, options: dict) -> dict:
+    from speech_Module.language_id import detect_audio_language
+    from speech_Module.whisper_loader import get_whisper_model, inference_lock
+
+    if options.get("language") is None:
+        # Detected once, so every piece is decoded in the same language
+        language, probability = detect_audio_language(get_whisper_model("offline"), audio.samples)
+        print(f"   🌐 Detected language: {language} ({probability:.0%})")
+        options = dict(options, language=language)
+
+    if not uses_worker_pool(audio.duration, workers) or audio.raw_path is None:
+        model = get_whisper_model("offline")
+        with inference_lock(model):
+            return model.transcribe(np.array(audio.samples), **options)
+
+    pieces = find_split_points(audio.samples)
+    print(f"   ⚡ Transcribing {audio.duration / 60:.1f} min in {len(pieces)} pieces on {workers} workers...")
+
+    pool = get_transcribe_pool(workers)
+    futures = [pool.submit(_transcribe_piece, audio.raw_path, start, end, options) for start, end in pieces]
+    results = [f.result() for f in futures]
+
+    boundaries = [start / SAMPLE_RATE for start, _ in pieces[1:]]
+    return stitch_results(results, boundaries)
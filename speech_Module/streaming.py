@@ -0,0 +1,96 @@
+# speech_Module/streaming.py
+"""
+Partial/final caption state for streaming live transcription.
+
+The open utterance is re-decoded as it grows. Words that two consecutive
+decodes agree on (a common prefix, "local agreement") are promoted to final
+and the audio before them is never decoded again; the rest is shown as a
+partial hypothesis. When the VAD closes the utterance, one last decode of
+the uncommitted tail produces the final caption.
+
+Words are (text, start_sample, end_sample) tuples in absolute sample indices
+of the meeting's ring buffer. Only the open utterance is kept, and the VAD
+segmenter bounds its length, so memory per meeting stays constant.
+"""
+import os
+from typing import List, Tuple
+
+LIVE_ASR_MODE = os.getenv("LIVE_ASR_MODE", "chunked")  # "chunked" or "streaming"
+LIVE_STREAM_PARTIAL_INTERVAL = float(os.getenv("LIVE_STREAM_PARTIAL_INTERVAL", "1.0"))
+
+Word = Tuple[str, int, int]
+
+
+def _norm(word: str) -> str:
+    return word.strip(" .,!?;:\"'").lower()
+
+
+def agreed_prefix_length(previous: List[Word], current: List[Word]) -> int:
+    """Number of leading words two hypotheses agree on"""
+    n = 0
+    for (a, _, _), (b, _, _) in zip(previous, current):
+        if _norm(a) != _norm(b):
+            break
+        n += 1
+    return n
+
+
+def join_words(words: List[Word]) -> str:
+    """Whisper word tokens carry their own leading spaces"""
+    return "".join(w[0] for w in words).strip()
+
+
+class CaptionStream:
+    """Local-agreement caption state for one meeting's open utterance"""
+
+    def __init__(self):
+        self.seq = 0                # Caption id; one per utterance
+        self.final_words = []       # Promoted words of the open utterance
+        self.hypothesis = []        # Uncommitted words of the last decode
+        self.commit_sample = 0      # Audio before this is already final
+        self.partial_pending = False
+        self.last_partial_end = 0   # Ring position of the last partial decode
+
+    def _uncommitted(self, words: List[Word], commit_sample: int) -> List[Word]:
+        # A decode may have started before the latest commit moved forward
+        return [w for w in words if (w[1] + w[2]) // 2 >= commit_sample]
+
+    def apply_partial(self, seq: int, words: List[Word]) -> bool:
+        """
+        Merge a partial decode. Returns False if the utterance it belongs to
+        has been closed meanwhile (its final decode covers it).
+        """
+        if seq != self.seq:
+            return False
+        words = self._uncommitted(words, self.commit_sample)
+        agreed = agreed_prefix_length(self.hypothesis, words)
+        if agreed:
+            self.final_words.extend(words[:agreed])
+            self.commit_sample = words[agreed - 1][2]
+        self.hypothesis = words[agreed:]
+        return True
+
+    def close(self, end_sample: int):
+        """
+        Close the open utterance and start the next one.
+        Returns (seq, final_words, commit_sample) for the final decode.
+        """
+        snapshot = (self.seq, self.final_words, self.commit_sample)
+        self.seq += 1
+        self.final_words = []
+        self.hypothesis = []
+        self.commit_sample = end_sample
+        self.partial_pending = False
+        return snapshot
+
+    def finish(self, final_words: List[Word], words: List[Word], commit_sample: int) -> List[Word]:
+        """Final caption words: promoted words plus the decoded tail"""
+        return final_words + self._uncommitted(words, commit_sample)
+
+    @property
+    def final_text(self) -> str:
+        return join_words(self.final_words)
+
+    @property
+    def partial_text(self) -> str:
+        return join_words(self.hypothesis)
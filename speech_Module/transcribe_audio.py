@@ -1,27 +1,43 @@
-
 import os
-# Import the pre-loaded model from our new file
-from .whisper_loader import model 
+import numpy as np
+# Models are loaded lazily (and once) by the model manager
+from .whisper_loader import get_whisper_model, inference_lock
+from .parallel_transcribe import transcribe_long_audio
+from .audio_io import decode_audio
+from .decoding_profiles import transcribe_options
+from .language_id import TRANSCRIBE_LANGUAGE, fixed_language
+
+def transcribe_audio(audio_path, audio=None, **options): # added **options for diarization
+    """
+    Transcribe a file, or the [start_time, end_time) range of it.
 
-def transcribe_audio(audio_path, **options): # added **options for diarization
-    if not os.path.exists(audio_path):
+    Pass `audio` (a DecodedAudio from speech_Module.audio_io) when
+    transcribing many ranges of the same file, so it is decoded only once.
+    """
+    if audio is None and not os.path.exists(audio_path):
         raise FileNotFoundError(f"The audio file {audio_path} does not exist.")
 
-    # The model is already loaded, so we remove the load_model line from here
+    model = get_whisper_model("offline")
     print("Transcribing audio...")
 
     # We need to handle diarization segments now
     start_time = options.get("start_time")
     end_time = options.get("end_time")
+    # None = detect (once per file, see speech_Module/language_id.py)
+    language = options.get("language") or fixed_language(TRANSCRIBE_LANGUAGE)
 
     if start_time is not None and end_time is not None:
-        # We need to load the audio and clip it for segmented transcription
-        audio = whisper.load_audio(audio_path)
-        segment_duration = int((end_time - start_time) * whisper.audio.SAMPLE_RATE)
-        audio_segment = audio[int(start_time * whisper.audio.SAMPLE_RATE):int(start_time * whisper.audio.SAMPLE_RATE) + segment_duration]
-        result = model.transcribe(audio_segment, language="en")
+        # Clip the segment out of the decoded samples (a view, no copy)
+        if audio is None:
+            with decode_audio(audio_path) as decoded:
+                audio_segment = decoded.slice(start_time, end_time).copy()
+        else:
+            audio_segment = np.asarray(audio.slice(start_time, end_time))
+        with inference_lock(model):
+            result = model.transcribe(audio_segment, **transcribe_options("offline", language=language))
     else:
-        result = model.transcribe(audio_path, language="en")
+        # Whole file: long recordings are split at silences and run in parallel
+        result = transcribe_long_audio(audio_path, language=language)
 
     print(f"Transcript: {result['text']}")
     return result["text"]
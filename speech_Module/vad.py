@@ -0,0 +1,192 @@
+# speech_Module/vad.py
+"""
+Frame-level voice activity detection and pause-based segmentation.
+
+Energy is measured per short frame (30 ms by default) in float64, so int16
+input cannot overflow. A hangover keeps a frame marked as speech for a short
+time after the energy drops, which bridges the gaps between words. The
+segmenter turns those flags into utterances that start and end at natural
+pauses, so only speech (plus a little padding) is ever sent to the model.
+"""
+import os
+from collections import deque
+from typing import List, Tuple
+
+import numpy as np
+
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))
+VAD_THRESHOLD_DBFS = float(os.getenv("VAD_THRESHOLD_DBFS", "-40"))
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "200"))
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "300"))
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "250"))
+VAD_MAX_SEGMENT_SECONDS = float(os.getenv("VAD_MAX_SEGMENT_SECONDS", "10"))
+VAD_PAD_MS = int(os.getenv("VAD_PAD_MS", "150"))
+
+
+def dbfs_to_amplitude(dbfs: float) -> float:
+    """Convert a dBFS level to an int16 amplitude"""
+    return 32768.0 * (10.0 ** (dbfs / 20.0))
+
+
+def frame_rms(samples: np.ndarray, frame_length: int) -> np.ndarray:
+    """
+    RMS of each complete frame of int16 samples, in int16 units.
+    Trailing samples that do not fill a frame are ignored.
+    """
+    n_frames = len(samples) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float64)
+    frames = samples[:n_frames * frame_length].reshape(n_frames, frame_length)
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64)
+    return np.sqrt(energy / frame_length)
+
+
+def apply_hangover(raw: np.ndarray, hangover_frames: int, first_index: int = 0,
+                   last_speech_index: int = -1) -> Tuple[np.ndarray, int]:
+    """
+    Keep frames flagged as speech for `hangover_frames` after the last raw
+    speech frame. `first_index` is the absolute index of raw[0] and
+    `last_speech_index` carries state over from the previous block.
+    Returns (smoothed flags, new last_speech_index).
+    """
+    if len(raw) == 0:
+        return raw.astype(bool), last_speech_index
+    indices = np.arange(first_index, first_index + len(raw))
+    last = np.maximum.accumulate(np.where(raw, indices, last_speech_index))
+    smoothed = (last >= 0) & (indices - last <= hangover_frames)
+    return smoothed, int(last[-1])
+
+
+def contains_speech(samples: np.ndarray, sample_rate: int = 16000, frame_ms: int = VAD_FRAME_MS,
+                    threshold_dbfs: float = VAD_THRESHOLD_DBFS, min_speech_ms: int = VAD_MIN_SPEECH_MS) -> bool:
+    """True if at least `min_speech_ms` of frames are above the energy threshold"""
+    frame_length = sample_rate * frame_ms // 1000
+    rms = frame_rms(samples, frame_length)
+    min_frames = max(1, min_speech_ms // frame_ms)
+    return int(np.count_nonzero(rms >= dbfs_to_amplitude(threshold_dbfs))) >= min_frames
+
+
+class SpeechSegmenter:
+    """
+    Incremental pause-based segmenter over an AudioRingBuffer.
+
+    Call `push(ring)` after every write; it scans the newly completed frames
+    and returns finished utterances as (start_sample, end_sample) pairs in
+    absolute sample indices. An utterance is flushed as soon as a pause of
+    `min_silence_ms` follows it, and is cut at its quietest frame if it
+    grows past `max_segment_seconds`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = VAD_FRAME_MS,
+        threshold_dbfs: float = VAD_THRESHOLD_DBFS,
+        hangover_ms: int = VAD_HANGOVER_MS,
+        min_silence_ms: int = VAD_MIN_SILENCE_MS,
+        min_speech_ms: int = VAD_MIN_SPEECH_MS,
+        max_segment_seconds: float = VAD_MAX_SEGMENT_SECONDS,
+        pad_ms: int = VAD_PAD_MS
+    ):
+        self.frame_length = sample_rate * frame_ms // 1000
+        self.threshold = dbfs_to_amplitude(threshold_dbfs)
+        self.hangover_frames = max(0, hangover_ms // frame_ms)
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_segment_frames = max(2, int(max_segment_seconds * 1000) // frame_ms)
+        self.pad_samples = sample_rate * pad_ms // 1000
+
+        self._next_frame = 0           # Absolute index of the next frame to scan
+        self._last_speech_frame = -1   # Hangover state carried across pushes
+        self._segment_start = None     # First frame of the current utterance
+        self._continued = False        # Current piece continues a forced cut
+        self._silence_run = 0          # Consecutive non-speech frames inside it
+        self._segment_rms = deque(maxlen=self.max_segment_frames)
+
+    @property
+    def in_speech(self) -> bool:
+        return self._segment_start is not None
+
+    @property
+    def current_start_sample(self) -> int:
+        """Start of the open utterance (including its pad); only valid in speech"""
+        start = self._segment_start * self.frame_length
+        return start if self._continued else max(0, start - self.pad_samples)
+
+    def push(self, ring) -> List[Tuple[int, int]]:
+        """Scan new complete frames in `ring` and return finished utterances"""
+        first_sample = max(self._next_frame * self.frame_length, ring.oldest_available)
+        first_frame = -(-first_sample // self.frame_length)
+        n_frames = (ring.total_written // self.frame_length) - first_frame
+        if n_frames <= 0:
+            return []
+
+        start = first_frame * self.frame_length
+        rms = frame_rms(ring.view(start, start + n_frames * self.frame_length), self.frame_length)
+        speech, self._last_speech_frame = apply_hangover(
+            rms >= self.threshold, self.hangover_frames, first_frame, self._last_speech_frame
+        )
+        self._next_frame = first_frame + n_frames
+
+        segments = []
+        for offset in range(n_frames):
+            frame = first_frame + offset
+            if self._segment_start is None:
+                if speech[offset]:
+                    self._segment_start = frame
+                    self._continued = False
+                    self._silence_run = 0
+                    self._segment_rms.clear()
+                    self._segment_rms.append(rms[offset])
+                continue
+
+            self._segment_rms.append(rms[offset])
+            if speech[offset]:
+                self._silence_run = 0
+            else:
+                self._silence_run += 1
+
+            if self._silence_run >= self.min_silence_frames:
+                # End of utterance: flush now instead of waiting for a full window
+                speech_end = frame - self._silence_run + 1
+                self._emit(segments, self._segment_start, speech_end, ring, pad_start=not self._continued)
+                self._segment_start = None
+            elif frame + 1 - self._segment_start >= self.max_segment_frames:
+                # Too long without a pause: cut at the quietest frame of the latter half
+                tail = np.asarray(self._segment_rms)[len(self._segment_rms) // 2:]
+                cut = frame + 1 - len(tail) + int(np.argmin(tail))
+                # No padding at the cut itself, or both pieces would hear it
+                self._emit(segments, self._segment_start, cut, ring, pad_start=not self._continued, pad_end=False)
+                kept = frame + 1 - cut
+                recent = list(self._segment_rms)[-kept:] if kept else []
+                self._segment_start = cut
+                self._continued = True
+                self._segment_rms.clear()
+                self._segment_rms.extend(recent)
+
+        return segments
+
+    def flush(self, ring) -> List[Tuple[int, int]]:
+        """Close any open utterance (e.g. when the bot disconnects)"""
+        segments = []
+        if self._segment_start is not None:
+            self._emit(
+                segments, self._segment_start, self._next_frame - self._silence_run, ring,
+                pad_start=not self._continued
+            )
+            self._segment_start = None
+        return segments
+
+    def _emit(self, segments, start_frame, end_frame, ring, pad_start=True, pad_end=True):
+        if end_frame - start_frame < self.min_speech_frames:
+            return
+        start = start_frame * self.frame_length
+        end = end_frame * self.frame_length
+        if pad_start:
+            start -= self.pad_samples
+        if pad_end:
+            end += self.pad_samples
+        start = max(start, ring.oldest_available)
+        end = min(end, ring.total_written)
+        if end > start:
+            segments.append((start, end))
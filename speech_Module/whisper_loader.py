@@ -1,6 +1,212 @@
 # speech_Module/whisper_loader.py
-import whisper
+"""
+Lazy, thread-safe Whisper model manager.
 
-print("Loading Whisper model...")
-model = whisper.load_model("base")
-print("Whisper model loaded.")
\ No newline at end of file
+Models are loaded on first use (not at import time) and cached per
+(backend, size). Callers ask for a role instead of a size:
+
+    get_whisper_model("live")     # bot captions, small and fast
+    get_whisper_model("offline")  # post-meeting and uploads, more accurate
+
+WHISPER_BACKEND=ctranslate2 serves the same roles from faster-whisper
+(CTranslate2) with int8 weights, which on CPU-only servers runs several
+times faster than PyTorch float32 in well under half the memory. Its models
+are wrapped so `.transcribe()` takes the same options and returns the same
+dict as openai-whisper. If faster-whisper is not installed the manager
+falls back to openai-whisper.
+
+openai-whisper models are not safe to run from two threads at once: a
+decode installs kv-cache hooks on the shared decoder modules, so concurrent
+decodes corrupt each other's caches. Every inference call on a model runs
+under its lock:
+
+    with inference_lock(model):
+        result = model.transcribe(audio, ...)
+
+CTranslate2 models handle concurrent calls themselves and get no lock.
+"""
+import contextlib
+import os
+import threading
+
+WHISPER_LIVE_MODEL = os.getenv("WHISPER_LIVE_MODEL", "base")
+WHISPER_OFFLINE_MODEL = os.getenv("WHISPER_OFFLINE_MODEL", "base")
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "openai")  # "openai" or "ctranslate2"
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "auto")      # "auto", "cpu" or "cuda"
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # ctranslate2 only
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))  # 0 = library default
+
+ROLE_MODELS = {
+    "live": WHISPER_LIVE_MODEL,
+    "offline": WHISPER_OFFLINE_MODEL,
+}
+
+# openai-whisper options that faster-whisper accepts under the same name
+_CT2_OPTIONS = (
+    "language", "task", "beam_size", "best_of", "patience", "length_penalty", "temperature",
+    "compression_ratio_threshold", "no_speech_threshold", "condition_on_previous_text",
+    "initial_prompt", "word_timestamps", "prepend_punctuations", "append_punctuations",
+    "suppress_tokens", "without_timestamps", "clip_timestamps", "hallucination_silence_threshold",
+)
+
+
+def _resolve_device() -> str:
+    if WHISPER_DEVICE != "auto":
+        return WHISPER_DEVICE
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+class CTranslate2WhisperModel:
+    """faster-whisper model with openai-whisper's `transcribe()` interface"""
+
+    backend = "ctranslate2"
+
+    def __init__(self, name: str, device: str, compute_type: str, cpu_threads: int = 0):
+        from faster_whisper import WhisperModel
+
+        self.name = name
+        self.device = device
+        self.model = WhisperModel(name, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+    def transcribe(self, audio, **options) -> dict:
+        """
+        Same call as `whisper.model.transcribe(audio, ...)`: `audio` is a path
+        or float32 16 kHz array; returns {"text", "segments", "language"}.
+        """
+        kwargs = {k: v for k, v in options.items() if k in _CT2_OPTIONS and v is not None}
+        if options.get("logprob_threshold") is not None:
+            kwargs["log_prob_threshold"] = options["logprob_threshold"]
+        if isinstance(kwargs.get("temperature"), list):
+            kwargs["temperature"] = tuple(kwargs["temperature"])
+        # openai-whisper defaults to greedy decoding
+        kwargs.setdefault("beam_size", 1)
+
+        segments, info = self.model.transcribe(audio, **kwargs)
+
+        result_segments = []
+        for seg in segments:
+            entry = {
+                "id": seg.id,
+                "seek": seg.seek,
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text,
+                "tokens": list(seg.tokens),
+                "temperature": seg.temperature,
+                "avg_logprob": seg.avg_logprob,
+                "compression_ratio": seg.compression_ratio,
+                "no_speech_prob": seg.no_speech_prob,
+            }
+            if seg.words is not None:
+                entry["words"] = [
+                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                    for w in seg.words
+                ]
+            result_segments.append(entry)
+
+        return {
+            "text": "".join(seg["text"] for seg in result_segments),
+            "segments": result_segments,
+            "language": info.language,
+        }
+
+    def detect_language(self, audio) -> tuple:
+        """(language, probability) like openai-whisper's detect_language, for the first 30 s"""
+        # Segments are decoded lazily; the language is detected up front
+        _, info = self.model.transcribe(audio[:30 * 16000], beam_size=1)
+        return info.language, info.language_probability
+
+
+class WhisperModelManager:
+    """Loads each (backend, size) once, on first request, from any thread"""
+
+    def __init__(self, backend: str = WHISPER_BACKEND):
+        self.backend = backend
+        self._models = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _load(self, name: str, backend: str):
+        device = _resolve_device()
+        if backend == "ctranslate2":
+            try:
+                print(f"Loading Whisper model '{name}' (CTranslate2, {WHISPER_COMPUTE_TYPE}, {device})...")
+                return CTranslate2WhisperModel(name, device, WHISPER_COMPUTE_TYPE, WHISPER_CPU_THREADS)
+            except ImportError:
+                print("⚠️  faster-whisper not installed - falling back to openai-whisper")
+                print("   💡 To enable: pip install faster-whisper")
+                self.backend = "openai"
+            except Exception as e:
+                print(f"⚠️  Failed to load CTranslate2 model '{name}': {e}")
+                print("   ✅ Falling back to openai-whisper...")
+
+        import whisper
+
+        print(f"Loading Whisper model '{name}' on {device}...")
+        model = whisper.load_model(name, device=device)
+        # Re-entrant: transcribe() calls back into model.decode()
+        model.inference_lock = threading.RLock()
+        return model
+
+    def get(self, name: str):
+        """Return model `name` for the configured backend, loading it once"""
+        key = (self.backend, name)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        # One lock per model, so loading a large offline model does not
+        # hold up the first request for the live one
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._load(name, key[0])
+                self._models[key] = model
+                print(f"Whisper model '{name}' loaded.")
+            return model
+
+    def loaded(self) -> list:
+        return [f"{backend}:{name}" for backend, name in self._models]
+
+
+_manager = WhisperModelManager()
+
+
+def get_whisper_model(role: str = "offline"):
+    """Whisper model for a role ("live" or "offline"); sizes come from the environment"""
+    if role not in ROLE_MODELS:
+        raise ValueError(f"Unknown Whisper role '{role}', expected one of {list(ROLE_MODELS)}")
+    return _manager.get(ROLE_MODELS[role])
+
+
+def get_model_id(role: str = "offline") -> str:
+    """Backend and size serving a role, e.g. "openai:base" (for cache keys)"""
+    return f"{_manager.backend}:{ROLE_MODELS[role]}"
+
+
+def load_named_model(name: str):
+    """Return the Whisper model `name` (e.g. the live fallback under overload), loading it once"""
+    return _manager.get(name)
+
+
+def is_openai_whisper(model) -> bool:
+    """False for the CTranslate2 wrapper, which cannot run whisper.decode batches"""
+    return getattr(model, "backend", "openai") == "openai"
+
+
+def inference_lock(model):
+    """Context manager serializing inference on `model` (a no-op for CTranslate2 models)"""
+    return getattr(model, "inference_lock", None) or contextlib.nullcontext()
+
+
+def __getattr__(name):
+    # Backward compatibility: `from speech_Module.whisper_loader import model`
+    if name == "model":
+        return get_whisper_model("offline")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+
+from speech_Module.asr_cache import ASRCache, audio_fingerprint
+
+
+def test_fingerprint_depends_on_samples_and_length():
+    audio = np.linspace(-1, 1, 1000, dtype=np.float32)
+
+    assert audio_fingerprint(audio) == audio_fingerprint(audio.copy())
+    assert audio_fingerprint(audio) != audio_fingerprint(audio[:-1])
+    changed = audio.copy()
+    changed[500] += 0.01
+    assert audio_fingerprint(audio) != audio_fingerprint(changed)
+
+
+def test_key_covers_model_and_options_in_any_order(tmp_path):
+    cache = ASRCache(str(tmp_path))
+    key = cache.key("audio", "openai/base", {"language": "en", "beam_size": 5})
+
+    assert key == cache.key("audio", "openai/base", {"beam_size": 5, "language": "en"})
+    assert key != cache.key("audio", "openai/small", {"language": "en", "beam_size": 5})
+    assert key != cache.key("audio", "openai/base", {"language": "de", "beam_size": 5})
+    assert key != cache.key("other", "openai/base", {"language": "en", "beam_size": 5})
+    assert cache.key("audio", "openai/base") == cache.key("audio", "openai/base", {})
+
+
+def test_get_or_compute_computes_once(tmp_path):
+    cache = ASRCache(str(tmp_path))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"text": " hi", "segments": [{"start": np.float32(0.5), "end": 1.0, "text": " hi"}]}
+
+    first = cache.get_or_compute("audio", "model", {"language": "en"}, compute)
+    second = cache.get_or_compute("audio", "model", {"language": "en"}, compute)
+
+    assert len(calls) == 1
+    assert second == {"text": " hi", "segments": [{"start": 0.5, "end": 1.0, "text": " hi"}]}
+    assert first["text"] == second["text"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_disabled_cache_never_stores(tmp_path):
+    cache = ASRCache(str(tmp_path), enabled=False)
+    cache.put(cache.key("audio", "model"), {"text": ""})
+
+    assert cache.get(cache.key("audio", "model")) is None
+    assert not os.listdir(tmp_path)
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = ASRCache(str(tmp_path))
+    key = cache.key("audio", "model")
+    path = cache._path(key)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(b"not gzip")
+
+    assert cache.get(key) is None
+    assert not os.path.exists(path)
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = ASRCache(str(tmp_path), max_mb=1)
+    rng = np.random.default_rng(0)
+    big = {"noise": rng.standard_normal(60_000).tolist()}  # ~500 KB compressed
+    keys = [cache.key(f"audio{i}", "model") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, big)
+        os.utime(cache._path(key), (i, i))
+
+    cache.evict()
+
+    assert not os.path.exists(cache._path(keys[0]))
+    assert os.path.exists(cache._path(keys[2]))
+
+
+def test_size_is_tracked_without_rescanning(tmp_path):
+    cache = ASRCache(str(tmp_path))
+    scans = []
+    scan = cache._scan
+    cache._scan = lambda: scans.append(1) or scan()
+
+    for i in range(5):
+        cache.put(cache.key(f"audio{i}", "model"), {"text": f" entry {i}"})
+    cache.put(cache.key("audio0", "model"), {"text": " replaced with a longer entry"})
+
+    assert len(scans) == 1
+    assert cache._total_bytes == scan()[1]
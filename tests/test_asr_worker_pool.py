@@ -0,0 +1,94 @@
+import asyncio
+
+from speech_Module.asr_worker_pool import ASRWorkerPool
+
+
+def run_jobs(pool, submit, expected):
+    """Submit jobs, then run the loop until `expected` of them have finished"""
+    finished = []
+
+    async def main():
+        done = asyncio.Event()
+
+        async def on_result(name):
+            finished.append(name)
+            if len(finished) == expected:
+                done.set()
+
+        submit(on_result)
+        await asyncio.wait_for(done.wait(), 5)
+        pool.shutdown()
+
+    asyncio.run(main())
+    return finished
+
+
+async def job(name):
+    await asyncio.sleep(0)
+    return name
+
+
+def test_meetings_are_served_round_robin():
+    pool = ASRWorkerPool(workers=1, max_queue_depth=10, max_in_flight=1)
+
+    def submit(on_result):
+        for i in range(3):
+            pool.submit("a", job, f"a{i}", on_result=on_result)
+        for i in range(3):
+            pool.submit("b", job, f"b{i}", on_result=on_result)
+
+    assert run_jobs(pool, submit, 6) == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+
+def test_full_queue_drops_the_oldest_job():
+    pool = ASRWorkerPool(workers=1, max_queue_depth=2, max_in_flight=1)
+    accepted = []
+
+    def submit(on_result):
+        for i in range(4):
+            accepted.append(pool.submit("a", job, f"a{i}", on_result=on_result))
+
+    assert run_jobs(pool, submit, 2) == ["a2", "a3"]
+    assert accepted == [True, True, False, False]
+    assert pool.dropped == {"a": 2}
+
+
+def test_one_job_in_flight_per_meeting():
+    pool = ASRWorkerPool(workers=2, max_queue_depth=10, max_in_flight=4)
+    running = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0, "total": 0}
+
+    async def slow_job(meeting_id, name):
+        running[meeting_id] += 1
+        peak[meeting_id] = max(peak[meeting_id], running[meeting_id])
+        peak["total"] = max(peak["total"], sum(running.values()))
+        await asyncio.sleep(0.01)
+        running[meeting_id] -= 1
+        return name
+
+    def submit(on_result):
+        for i in range(3):
+            pool.submit("a", slow_job, "a", f"a{i}", on_result=on_result)
+            pool.submit("b", slow_job, "b", f"b{i}", on_result=on_result)
+
+    finished = run_jobs(pool, submit, 6)
+
+    # Each meeting's captions stay in order, and meetings still run side by side
+    assert [n for n in finished if n[0] == "a"] == ["a0", "a1", "a2"]
+    assert [n for n in finished if n[0] == "b"] == ["b0", "b1", "b2"]
+    assert (peak["a"], peak["b"], peak["total"]) == (1, 1, 2)
+
+
+def test_discard_forgets_a_meeting():
+    pool = ASRWorkerPool(workers=1, max_queue_depth=1, max_in_flight=1)
+
+    async def main():
+        pool.submit("a", job, "a0")
+        pool.submit("a", job, "a1")
+        assert pool.queue_depth("a") == 1 and pool.dropped == {"a": 1}
+
+        pool.discard("a")
+        assert pool.queue_depth("a") == 0 and pool.dropped == {}
+        pool.shutdown()
+
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from utils.audio_ring_buffer import AudioRingBuffer
+
+
+def samples(start, end):
+    return np.arange(start, end, dtype=np.int16)
+
+
+def test_wraparound_keeps_absolute_positions():
+    ring = AudioRingBuffer(10)
+    ring.write(samples(0, 7))
+    ring.write(samples(7, 15))  # wraps past the end of the storage
+
+    assert ring.total_written == 15
+    assert ring.oldest_available == 5
+    assert ring.view(5, 15).tolist() == list(range(5, 15))
+    assert ring.view(8, 12).tolist() == [8, 9, 10, 11]
+
+
+def test_view_across_the_boundary_is_zero_copy_and_read_only():
+    ring = AudioRingBuffer(10)
+    ring.write(samples(0, 16))
+
+    window = ring.view(7, 14)  # storage positions 7..9 then 0..3
+
+    assert window.tolist() == list(range(7, 14))
+    assert np.shares_memory(window, ring._data)
+    assert not window.flags.writeable
+    with pytest.raises(ValueError):
+        window[0] = 0
+
+
+def test_overwrite_when_full():
+    ring = AudioRingBuffer(8)
+    ring.write(samples(0, 8))
+    ring.write(samples(8, 11))
+
+    assert ring.oldest_available == 3
+    assert ring.view(3, 11).tolist() == list(range(3, 11))
+    with pytest.raises(IndexError):
+        ring.view(2, 5)
+
+    # A write longer than the ring keeps only its newest samples
+    ring.write(samples(11, 31))
+    assert ring.total_written == 31
+    assert ring.view(23, 31).tolist() == list(range(23, 31))
+
+
+def test_view_bounds():
+    ring = AudioRingBuffer(8)
+    ring.write(samples(0, 5))
+
+    assert ring.view(2, 2).tolist() == []
+    for start, end in [(0, 6), (4, 3)]:
+        with pytest.raises(IndexError):
+            ring.view(start, end)
+
+
+def test_strided_consumer_reads_every_sample():
+    # A reader taking overlapping windows while small writes wrap many times,
+    # skipping ahead to oldest_available whenever it falls behind
+    rng = np.random.default_rng(0)
+    ring = AudioRingBuffer(50)
+    reference = np.zeros(0, dtype=np.int16)
+    window, stride = 20, 15
+    next_start = 0
+    read = []
+
+    for _ in range(200):
+        chunk = rng.integers(-32768, 32767, size=int(rng.integers(0, 40)), dtype=np.int16)
+        ring.write(chunk)
+        reference = np.concatenate([reference, chunk])
+        next_start = max(next_start, ring.oldest_available)
+        while ring.total_written - next_start >= window:
+            assert np.array_equal(ring.view(next_start, next_start + window),
+                                  reference[next_start:next_start + window])
+            read.append(next_start)
+            next_start += stride
+
+    assert ring.total_written == len(reference)
+    assert read and all(b > a for a, b in zip(read, read[1:]))
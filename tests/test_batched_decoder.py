@@ -0,0 +1,98 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import speech_Module.batched_decoder as batched_decoder
+import speech_Module.whisper_loader as whisper_loader
+from speech_Module.batched_decoder import MicroBatcher
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Every decode_batch call as (clip ids, options); each clip decodes to its id"""
+    calls = []
+
+    def fake_decode_batch(model, audios, **options):
+        ids = [int(audio[0]) for audio in audios]
+        calls.append((ids, options))
+        return [{"text": f"clip {i}", "language": options.get("language")} for i in ids]
+
+    monkeypatch.setattr(batched_decoder, "decode_batch", fake_decode_batch)
+    monkeypatch.setattr(whisper_loader, "get_whisper_model", lambda role: object())
+    return calls
+
+
+def clip(i):
+    return np.full(16000, i, dtype=np.float32)
+
+
+def run(coro):
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return await coro(executor)
+    return asyncio.run(main())
+
+
+def test_requests_in_the_window_are_grouped_by_options(decodes):
+    async def scenario(executor):
+        batcher = MicroBatcher(executor, window_ms=20, max_batch=8, task="transcribe")
+        languages = ["en", "de", "en", "de", "en"]
+        results = await asyncio.gather(*[
+            batcher.transcribe(clip(i), language=language) for i, language in enumerate(languages)
+        ])
+        return batcher, results
+
+    batcher, results = run(scenario)
+
+    # One batch, one decode per language, the batcher's own options kept
+    assert (batcher.batches_run, batcher.items_decoded) == (1, 5)
+    assert sorted(decodes) == [
+        ([0, 2, 4], {"task": "transcribe", "language": "en"}),
+        ([1, 3], {"task": "transcribe", "language": "de"}),
+    ]
+    assert [r["language"] for r in results] == ["en", "de", "en", "de", "en"]
+
+
+def test_max_batch_cuts_the_window_short(decodes):
+    async def scenario(executor):
+        # A window this long would never end within the test
+        batcher = MicroBatcher(executor, window_ms=60_000, max_batch=3)
+        results = await asyncio.wait_for(
+            asyncio.gather(*[batcher.transcribe(clip(i)) for i in range(6)]), 5
+        )
+        return batcher, results
+
+    batcher, results = run(scenario)
+
+    assert [ids for ids, _ in decodes] == [[0, 1, 2], [3, 4, 5]]
+    assert batcher.batches_run == 2
+    assert len(results) == 6
+
+
+def test_each_caller_gets_its_own_result(decodes):
+    async def scenario(executor):
+        batcher = MicroBatcher(executor, window_ms=5, max_batch=4)
+
+        async def meeting(i):
+            # Callers arrive at different times, across several batches
+            await asyncio.sleep(0.002 * (i % 5))
+            return i, await batcher.transcribe(clip(i))
+
+        return await asyncio.gather(*[meeting(i) for i in range(12)])
+
+    for i, result in run(scenario):
+        assert result["text"] == f"clip {i}"
+
+
+def test_a_failed_batch_fails_only_its_callers(decodes):
+    async def scenario(executor):
+        batcher = MicroBatcher(executor, window_ms=5, max_batch=8)
+        # The fake decoder cannot read a clip that is not an array
+        with pytest.raises(TypeError):
+            await batcher.transcribe(None)
+        # The batcher recovers for the next request
+        return await batcher.transcribe(clip(1))
+
+    assert run(scenario)["text"] == "clip 1"
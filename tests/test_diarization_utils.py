@@ -0,0 +1,57 @@
+import random
+
+from utils.diarization_utils import _best_overlaps, assign_word_speakers, overlap
+
+
+def pairwise_best(starts, ends, turns):
+    """Reference: every interval against every turn (ties -> earlier turn, -1 if none overlaps)"""
+    best = []
+    for start, end in zip(starts, ends):
+        best_k, best_ov = -1, 0.0
+        for k, turn in enumerate(turns):
+            ov = overlap(start, end, turn["start"], turn["end"])
+            if ov > best_ov:
+                best_k, best_ov = k, ov
+        best.append(best_k)
+    return best
+
+
+def random_intervals(rng, count, horizon, max_length):
+    # Whole and half seconds, so equal overlaps, touching edges and
+    # zero-length intervals come up often
+    intervals = []
+    for _ in range(count):
+        start = rng.randrange(2 * horizon) / 2
+        intervals.append((start, start + rng.randrange(2 * max_length + 1) / 2))
+    return intervals
+
+
+def test_sweep_matches_pairwise_on_random_inputs():
+    rng = random.Random(0)
+    for _ in range(3000):
+        horizon = rng.randint(1, 30)
+        intervals = random_intervals(rng, rng.randint(0, 15), horizon, 5)
+        turns = [{"start": s, "end": e, "speaker": f"S{k}"}
+                 for k, (s, e) in enumerate(random_intervals(rng, rng.randint(0, 10), horizon, 8))]
+        if rng.random() < 0.5:
+            # In time order, as Whisper and pyannote produce them (the sort is skipped)
+            intervals.sort()
+            turns.sort(key=lambda t: t["start"])
+        starts = [s for s, _ in intervals]
+        ends = [e for _, e in intervals]
+
+        assert _best_overlaps(starts, ends, turns) == pairwise_best(starts, ends, turns)
+
+
+def test_ties_go_to_the_earlier_turn():
+    turns = [{"start": 2, "end": 4, "speaker": "B"}, {"start": 0, "end": 2, "speaker": "A"}]
+    # One second of each: the first turn in the input wins, whatever its time
+    assert _best_overlaps([1], [3], turns) == [0]
+
+
+def test_touching_and_empty_intervals_overlap_nothing():
+    turns = [{"start": 0, "end": 2, "speaker": "A"}, {"start": 5, "end": 6, "speaker": "B"}]
+    assert _best_overlaps([2, 3, 1, 6], [5, 4, 1, 7], turns) == [-1, -1, -1, -1]
+    assert assign_word_speakers([0.5, 2.5, 5.2], [1.0, 3.0, 5.8], turns) == ["A", None, "B"]
+    assert _best_overlaps([], [], turns) == []
+    assert _best_overlaps([0], [1], []) == [-1]
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from utils.job_context import JobContext, inputs_key
+
+
+def test_stage_runs_once():
+    job = JobContext("meeting.wav")
+    calls = []
+
+    def diarize(path):
+        calls.append(path)
+        return [{"speaker": "A"}]
+
+    assert job.get_or_compute("diarization", diarize, "meeting.wav") == [{"speaker": "A"}]
+    assert job.get_or_compute("diarization", diarize, "meeting.wav", "extra") == [{"speaker": "A"}]
+    assert calls == ["meeting.wav"]
+
+
+def test_concurrent_consumers_join_the_running_stage():
+    job = JobContext("meeting.wav")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "turns"
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(job.get_or_compute("diarization", slow)))
+    owner.start()
+    started.wait(5)
+    joiner = threading.Thread(target=lambda: results.append(job.get_or_compute("diarization", slow)))
+    joiner.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join(5)
+    joiner.join(5)
+
+    assert results == ["turns", "turns"]
+    assert calls == [1]
+
+
+def test_failed_stage_is_retried():
+    job = JobContext("meeting.wav")
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("worker crashed")
+        return "ok"
+
+    with pytest.raises(RuntimeError):
+        job.get_or_compute("diarization", flaky)
+    assert job.get_or_compute("diarization", flaky) == "ok"
+
+
+def test_keyed_stages_recompute_for_different_inputs():
+    job = JobContext("meeting.wav")
+    segments = [{"start": 0.0, "end": 1.0, "text": "hi"}]
+    turns = [{"speaker": "A", "start": 0.0, "end": 1.0}]
+    other_turns = [{"speaker": "B", "start": 0.0, "end": 1.0}]
+    calls = []
+
+    def align(s, t):
+        calls.append(t[0]["speaker"])
+        return t[0]["speaker"]
+
+    assert job.get_or_compute("alignment", align, segments, turns, key=inputs_key(segments, turns)) == "A"
+    assert job.get_or_compute("alignment", align, list(segments), list(turns), key=inputs_key(segments, turns)) == "A"
+    assert job.get_or_compute("alignment", align, segments, other_turns, key=inputs_key(segments, other_turns)) == "B"
+    assert calls == ["A", "B"]
+
+
+def test_inputs_key_is_order_insensitive_for_dict_keys():
+    assert inputs_key({"a": 1, "b": 2}) == inputs_key({"b": 2, "a": 1})
+    assert inputs_key([1, 2]) != inputs_key([2, 1])
@@ -0,0 +1,76 @@
+import numpy as np
+
+from speech_Module.live_diarization import OnlineSpeakerClustering, reconcile_speakers
+
+DIM = 16
+
+
+def voice(*components):
+    vector = np.zeros(DIM)
+    vector[:len(components)] = components
+    return vector / np.linalg.norm(vector)
+
+
+def jitter(vector, rng, scale=0.05):
+    noisy = vector + rng.normal(0, scale, DIM)
+    return noisy / np.linalg.norm(noisy)
+
+
+def test_distinct_voices_get_stable_labels():
+    rng = np.random.default_rng(0)
+    clustering = OnlineSpeakerClustering(threshold=0.5, merge_threshold=0.7)
+    a, b = voice(1, 0), voice(0, 1)
+
+    labels = [clustering.assign(jitter(v, rng), 2.0)[0] for v in (a, b, a, b, a)]
+
+    assert labels == ["Speaker 1", "Speaker 2", "Speaker 1", "Speaker 2", "Speaker 1"]
+
+
+def test_max_speakers_caps_new_labels():
+    clustering = OnlineSpeakerClustering(threshold=0.5, max_speakers=2)
+    for components in ((1, 0, 0), (0, 1, 0), (0, 0, 1)):
+        clustering.assign(voice(*components), 1.0)
+    assert len(clustering.speakers) == 2
+
+
+def test_speakers_that_converge_merge_into_the_older_label():
+    clustering = OnlineSpeakerClustering(threshold=0.5, merge_threshold=0.7)
+    clustering.assign(voice(1, 0), 1.0)
+    assert clustering.assign(voice(0.4, 0.917), 1.0)[0] == "Speaker 2"
+
+    merges = []
+    for _ in range(20):
+        label, changed = clustering.assign(voice(0.8, 0.6), 1.0)
+        merges += changed
+
+    assert merges == [("Speaker 2", "Speaker 1")]
+    assert label == "Speaker 1"
+    assert [s.label for s in clustering.speakers] == ["Speaker 1"]
+
+
+def test_two_voices_under_one_label_are_split():
+    rng = np.random.default_rng(1)
+    clustering = OnlineSpeakerClustering(threshold=0.5, merge_threshold=0.9)
+    a, b = voice(1, 0), voice(0, 1)
+    clustering.assign(voice(1, 1), 1.0)
+    for i in range(24):
+        clustering.assign(jitter(a if i % 2 else b, rng), 1.0)
+
+    assert len(clustering.speakers) == 2
+    assert clustering.assign(a, 1.0)[0] != clustering.assign(b, 1.0)[0]
+
+
+def test_reconcile_maps_live_labels_to_the_longest_overlap():
+    live = [
+        {"start": 0.0, "end": 4.0, "speaker": "Speaker 1"},
+        {"start": 4.0, "end": 6.0, "speaker": "Speaker 2"},
+        {"start": 6.0, "end": 10.0, "speaker": "Speaker 1"},
+        {"start": 30.0, "end": 31.0, "speaker": "Speaker 3"},
+    ]
+    offline = [
+        {"start": 0.0, "end": 4.5, "speaker": "SPEAKER_00"},
+        {"start": 4.5, "end": 6.5, "speaker": "SPEAKER_01"},
+        {"start": 6.5, "end": 10.0, "speaker": "SPEAKER_00"},
+    ]
+
+    assert reconcile_speakers(live, offline) == {"Speaker 1": "SPEAKER_00", "Speaker 2": "SPEAKER_01"}
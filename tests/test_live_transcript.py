@@ -0,0 +1,111 @@
+from speech_Module.live_transcript import (
+    LiveTranscriptLog,
+    load_live_transcript,
+    plan_redecode,
+    result_confidence,
+)
+
+SR = 16000
+
+
+def chunk(start, end, text="words", avg_logprob=-0.2, no_speech_prob=0.01, **extra):
+    return {"start": start, "end": end, "text": text, "avg_logprob": avg_logprob,
+            "no_speech_prob": no_speech_prob, **extra}
+
+
+def log(chunks, dropped=(), segmentation="vad", words=False):
+    return {"segmentation": segmentation, "words": words, "language": None, "chunks": list(chunks),
+            "dropped": list(dropped), "speakers": []}
+
+
+def test_sidecar_round_trip(tmp_path):
+    path = str(tmp_path / "meeting.live.jsonl")
+    sidecar = LiveTranscriptLog(path, sample_rate=SR, segmentation="fixed", words=True)
+    sidecar.chunk(2 * SR, 3 * SR, "later", -0.3, 0.02)
+    sidecar.chunk(0, SR, "first", -0.1, 0.01, words=[(" first", 0, SR // 2)])
+    sidecar.dropped(4 * SR, 5 * SR)
+    sidecar.language("de", 0.9)
+    sidecar.speaker(0, SR, "Speaker 2")
+    sidecar.speaker_merge("Speaker 2", "Speaker 1")
+    sidecar.close()
+    sidecar.chunk(9 * SR, 10 * SR, "after close", 0.0, 0.0)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "chunk", "sta')  # torn last line
+
+    loaded = load_live_transcript(path)
+
+    assert loaded["segmentation"] == "fixed"
+    assert loaded["words"] is True
+    assert loaded["language"] == "de"
+    assert [c["text"] for c in loaded["chunks"]] == ["first", "later"]
+    assert loaded["chunks"][0]["words"] == [[" first", 0.0, 0.5]]
+    assert "words" not in loaded["chunks"][1]
+    assert loaded["dropped"] == [{"type": "dropped", "start": 4.0, "end": 5.0}]
+    assert [t["speaker"] for t in loaded["speakers"]] == ["Speaker 1"]
+
+
+def test_missing_sidecar():
+    assert load_live_transcript("/nonexistent/meeting.live.jsonl") is None
+
+
+def test_confident_chunks_are_kept():
+    kept, regions = plan_redecode(log([chunk(0, 2), chunk(3, 5)]), duration=10)
+    assert len(kept) == 2
+    assert regions == []
+
+
+def test_low_confidence_and_dropped_audio_are_redecoded_with_padding():
+    chunks = [chunk(0, 2), chunk(3, 5, avg_logprob=-1.5), chunk(6, 8)]
+    kept, regions = plan_redecode(log(chunks, dropped=[{"start": 9.0, "end": 10.0}]), duration=10, pad=0.3)
+
+    assert [c["start"] for c in kept] == [0, 6]
+    assert regions == [(2.7, 5.3), (8.7, 10)]
+
+
+def test_silence_is_not_low_confidence():
+    chunks = [chunk(0, 2, text="", avg_logprob=-2.0, no_speech_prob=0.9)]
+    assert plan_redecode(log(chunks), duration=10) == ([], [])
+
+
+def test_forced_vad_cuts_redecode_both_sides():
+    chunks = [chunk(0, 2), chunk(2.0, 4), chunk(6, 8)]
+    kept, regions = plan_redecode(log(chunks), duration=10, pad=0.0)
+    assert regions == [(0, 4)]
+    assert [c["start"] for c in kept] == [6]
+
+    # Fixed windows touch by design: not a forced cut
+    kept, regions = plan_redecode(log(chunks, segmentation="fixed"), duration=10, pad=0.0)
+    assert regions == []
+
+
+def test_chunks_without_words_are_redecoded_when_words_are_needed():
+    chunks = [chunk(0, 2, words=[[" words", 0.0, 2.0]]), chunk(3, 5)]
+    kept, regions = plan_redecode(log(chunks, words=True), duration=10, pad=0.0, need_words=True)
+    assert [c["start"] for c in kept] == [0]
+    assert regions == [(3, 5)]
+
+
+def test_sidecar_without_words_keeps_its_chunks():
+    # Micro-batched live decodes log no words: re-decoding every chunk would reuse nothing
+    chunks = [chunk(0, 2), chunk(3, 5)]
+    kept, regions = plan_redecode(log(chunks), duration=10, pad=0.0, need_words=True)
+    assert len(kept) == 2
+    assert regions == []
+
+
+def test_nearby_regions_are_merged():
+    chunks = [chunk(0, 2, avg_logprob=-1.5), chunk(2.5, 4), chunk(5, 7, avg_logprob=-1.5), chunk(12, 14)]
+    kept, regions = plan_redecode(log(chunks, segmentation="fixed"), duration=20, pad=0.0, merge_gap=3.0)
+    assert regions == [(0, 7)]
+    assert [c["start"] for c in kept] == [12]
+
+    kept, regions = plan_redecode(log(chunks, segmentation="fixed"), duration=20, pad=0.0, merge_gap=0.0)
+    assert regions == [(0, 2), (5, 7)]
+
+
+def test_result_confidence():
+    result = {"segments": [{"avg_logprob": -0.2, "no_speech_prob": 0.1}, {"avg_logprob": -0.4, "no_speech_prob": 0.5}]}
+    avg_logprob, no_speech_prob = result_confidence(result)
+    assert round(avg_logprob, 6) == -0.3
+    assert no_speech_prob == 0.1
+    assert result_confidence({"segments": []}) == (0.0, 1.0)
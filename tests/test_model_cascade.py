@@ -0,0 +1,133 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from speech_Module.model_cascade import CascadeStats, compression_ratio, needs_escalation
+
+
+def result(text="hello there", avg_logprob=-0.2, no_speech_prob=0.01, compression=1.2):
+    return {"text": text, "avg_logprob": avg_logprob, "no_speech_prob": no_speech_prob,
+            "compression_ratio": compression}
+
+
+def test_confident_results_stay_on_the_first_tier():
+    assert not needs_escalation(result(), min_logprob=-0.7, max_compression=2.2)
+    assert not needs_escalation(result(avg_logprob=-0.7), min_logprob=-0.7, max_compression=2.2)
+
+
+def test_low_logprob_escalates():
+    assert needs_escalation(result(avg_logprob=-0.71), min_logprob=-0.7, max_compression=2.2)
+
+
+def test_repetition_loops_escalate():
+    assert needs_escalation(result(compression=2.5), min_logprob=-0.7, max_compression=2.2)
+    assert not needs_escalation(result(compression=2.2), min_logprob=-0.7, max_compression=2.2)
+    looped = " ".join(["thank you"] * 30)
+    assert compression_ratio(looped) > 2.2 > compression_ratio("Let's move on to the budget review.")
+
+
+def test_silence_and_empty_results_never_escalate():
+    # Whisper's no-speech rule (no_speech_prob > 0.6 and avg_logprob < -1.0)
+    assert not needs_escalation(result(avg_logprob=-1.5, no_speech_prob=0.9), min_logprob=-0.7)
+    # Unsure but probably speech: escalate
+    assert needs_escalation(result(avg_logprob=-1.5, no_speech_prob=0.3), min_logprob=-0.7)
+    assert needs_escalation(result(avg_logprob=-0.9, no_speech_prob=0.9), min_logprob=-0.7)
+    assert not needs_escalation(result(text="", avg_logprob=-2.0))
+    assert not needs_escalation(None)
+
+
+def test_cascade_stats_count_escalations_and_corrections():
+    stats = CascadeStats()
+    stats.record_decode("m1", "first", 5.0, escalated=True)
+    stats.record_decode("m1", "first", 5.0)
+    stats.record_decode("m1", "escalated", 5.0)
+    stats.record_correction("m1")
+
+    snapshot = stats.snapshot()
+    assert set(snapshot["meetings"]) == {"m1"}
+    assert stats.snapshot("m2")["meeting_id"] == "m2"
+
+
+# --- escalation path in the live pipeline ------------------------------------
+
+class FakeProcessor:
+    sample_rate = 16000
+
+    def __init__(self):
+        self.logged = []
+        self._next_id = 100
+
+    def process_with_whisper(self, audio_chunk, escalated=False, start_sample=None):
+        raise AssertionError("decodes are not run in these tests")
+
+    def trim_overlap(self, text, max_words=8, previous_text=None):
+        return text
+
+    def log_result(self, audio_range, result):
+        self.logged.append((audio_range, result))
+
+    def next_transcript_id(self):
+        self._next_id += 1
+        return self._next_id
+
+
+def escalate(first_text, escalated_text, transcript_id):
+    """Run BotConnectionManager._escalate with a fake decode; returns (broadcasts, processor, submitted)"""
+    pytest.importorskip("fastapi")
+    from backend.bot_audio_processor import BotConnectionManager
+
+    manager = BotConnectionManager()
+    processor = FakeProcessor()
+    submitted, broadcasts = [], []
+
+    def fake_submit(meeting_id, processor, func, *args, on_result=None, trace=None, audio_range=None):
+        submitted.append((func, args, audio_range, on_result))
+        return True
+
+    async def broadcast_correction(meeting_id, transcript_id, text, speaker="Meeting Bot"):
+        broadcasts.append(("correction", transcript_id, text, speaker))
+
+    async def broadcast_transcription(meeting_id, text, speaker="Meeting Bot", transcript_id=None):
+        broadcasts.append(("transcription", transcript_id, text, speaker))
+
+    manager._submit = fake_submit
+    manager.broadcast_correction = broadcast_correction
+    manager.broadcast_transcription = broadcast_transcription
+
+    async def main():
+        async def identify_speaker():
+            return "Speaker 2"
+
+        speaker_task = asyncio.create_task(identify_speaker())
+        chunk = np.zeros(16000, dtype=np.int16)
+        manager._escalate("m1", processor, chunk, (0, 16000), transcript_id, first_text, "", "Speaker 1",
+                          speaker_task)
+        _, _, _, on_result = submitted[0]
+        await on_result(result(text=escalated_text))
+
+    asyncio.run(main())
+    return broadcasts, processor, submitted
+
+
+def test_escalation_corrects_the_line_in_place():
+    broadcasts, processor, submitted = escalate("helo their", "hello there", transcript_id=7)
+
+    func, args, audio_range, _ = submitted[0]
+    assert func == processor.process_with_whisper
+    assert args[1] is True  # decoded by the escalated (live) model
+    assert audio_range == (0, 16000)
+    # The corrected line carries the identified speaker, not the provisional one
+    assert broadcasts == [("correction", 7, "hello there", "Speaker 2")]
+    assert processor.logged[0][1]["text"] == "hello there"
+
+
+def test_unchanged_escalation_is_not_broadcast():
+    broadcasts, processor, _ = escalate("hello there", "hello there", transcript_id=7)
+    assert broadcasts == []
+    assert len(processor.logged) == 1
+
+
+def test_escalation_of_a_trimmed_away_chunk_is_a_new_line():
+    broadcasts, _, _ = escalate(None, "hello there", transcript_id=None)
+    assert broadcasts == [("transcription", 101, "hello there", "Speaker 2")]
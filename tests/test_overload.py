@@ -0,0 +1,33 @@
+from speech_Module.overload import OverloadController, parse_policy
+
+
+def test_parse_policy_keeps_known_actions_in_order():
+    assert parse_policy("widen_chunk, bogus,skip_nonspeech,widen_chunk") == ["widen_chunk", "skip_nonspeech"]
+    assert parse_policy("none") == []
+    assert parse_policy("") == []
+
+
+def test_escalates_one_action_per_cooldown_and_recovers_in_reverse():
+    controller = OverloadController("skip_nonspeech,widen_chunk,pause_bot", threshold=10, recover=3, cooldown=5)
+
+    assert controller.update(12, now=0) == ("skip_nonspeech", True)
+    assert controller.update(12, now=1) is None  # cooling down
+    assert controller.update(12, now=6) == ("widen_chunk", True)
+    assert controller.active == ["skip_nonspeech", "widen_chunk"]
+
+    assert controller.update(5, now=20) is None  # between recover and threshold: hold
+    assert controller.update(1, now=21) == ("widen_chunk", False)
+    assert controller.update(1, now=30) == ("skip_nonspeech", False)
+    assert controller.update(1, now=40) is None
+    assert controller.level == 0
+
+
+def test_stops_at_the_last_action():
+    controller = OverloadController("skip_nonspeech", threshold=10, recover=3, cooldown=0)
+
+    assert controller.update(50, now=0) == ("skip_nonspeech", True)
+    assert controller.update(50, now=1) is None
+
+
+def test_recover_never_exceeds_threshold():
+    assert OverloadController("skip_nonspeech", threshold=2, recover=5).recover == 2
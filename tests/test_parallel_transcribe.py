@@ -0,0 +1,67 @@
+import numpy as np
+
+from speech_Module.parallel_transcribe import find_split_points, stitch_results, uses_worker_pool
+
+SR = 16000
+
+
+def _speech_with_pause(seconds, pause_at, pause_seconds=1.0):
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(seconds * SR)) * 0.3).astype(np.float32)
+    start = int(pause_at * SR)
+    audio[start:start + int(pause_seconds * SR)] = 0.0
+    return audio, start
+
+
+def test_short_audio_is_one_piece():
+    audio = np.zeros(5 * SR, dtype=np.float32)
+    assert find_split_points(audio, chunk_seconds=10, search_seconds=2) == [(0, len(audio))]
+
+
+def test_pieces_cover_the_file_and_cut_in_the_pause():
+    audio, pause = _speech_with_pause(25, pause_at=11)
+    pieces = find_split_points(audio, chunk_seconds=10, search_seconds=3)
+
+    assert pieces[0][0] == 0 and pieces[-1][1] == len(audio)
+    assert all(a[1] == b[0] for a, b in zip(pieces, pieces[1:]))
+    assert all(end - start <= (10 + 3) * SR for start, end in pieces)
+    assert pause <= pieces[0][1] <= pause + SR
+
+
+def _segment(start, end, text, words=None):
+    segment = {"start": start, "end": end, "text": text}
+    if words is not None:
+        segment["words"] = words
+    return segment
+
+
+def test_stitch_merges_a_sentence_cut_at_the_boundary():
+    first = {"segments": [_segment(0.0, 4.0, " Hello there."), _segment(4.0, 9.8, " and so we", [{"word": " we"}])],
+             "language": "en"}
+    second = {"segments": [_segment(10.1, 12.0, " continue.", [{"word": " continue."}]), _segment(12.0, 14.0, " Bye.")],
+              "language": "en"}
+
+    result = stitch_results([first, second], boundaries=[10.0])
+
+    assert [s["text"] for s in result["segments"]] == [" Hello there.", " and so we continue.", " Bye."]
+    assert result["segments"][1]["end"] == 12.0
+    assert [w["word"] for w in result["segments"][1]["words"]] == [" we", " continue."]
+    assert [s["id"] for s in result["segments"]] == [0, 1, 2]
+    assert result["language"] == "en"
+
+
+def test_stitch_keeps_finished_sentences_apart():
+    first = {"segments": [_segment(0.0, 9.9, " Done.")]}
+    second = {"segments": [_segment(10.0, 12.0, " Next one.")]}
+
+    result = stitch_results([first, second], boundaries=[10.0])
+
+    assert len(result["segments"]) == 2
+    assert result["text"] == " Done. Next one."
+    assert result["language"] is None
+
+
+def test_worker_pool_only_for_long_recordings():
+    assert not uses_worker_pool(10.0, workers=4)
+    assert not uses_worker_pool(10_000.0, workers=1)
+    assert uses_worker_pool(10_000.0, workers=4)
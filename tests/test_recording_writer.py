@@ -0,0 +1,124 @@
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from utils.recording_writer import BufferedRecordingWriter, open_recording_writer, wav_header
+
+SR = 16000
+
+
+def tone(seconds, frequency=440.0):
+    t = np.arange(int(SR * seconds)) / SR
+    return (0.3 * 32767 * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def header_data_size(path):
+    with open(path, "rb") as f:
+        return int.from_bytes(f.read(44)[40:44], "little")
+
+
+def read_wav(path):
+    with wave.open(path, "rb") as f:
+        params = (f.getnchannels(), f.getsampwidth(), f.getframerate())
+        return params, np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+
+
+def test_wav_header_layout():
+    header = wav_header(1000, SR, 1, 2)
+    assert len(header) == 44
+    assert header[:4] == b"RIFF" and header[8:16] == b"WAVEfmt "
+    assert int.from_bytes(header[4:8], "little") == 1036
+    assert int.from_bytes(header[40:44], "little") == 1000
+
+
+def test_header_is_patched_after_incremental_flushes(tmp_path):
+    path = str(tmp_path / "meeting.wav")
+    audio = tone(1.0)
+    writer = BufferedRecordingWriter(path, flush_bytes=4000, flush_interval=0.01, fsync_interval=0.0)
+    try:
+        for block in np.array_split(audio, 20):
+            writer.write(block.tobytes())
+            # Still open: the file on disk is a playable WAV of everything flushed so far
+            wait_for(lambda: header_data_size(path) == writer.bytes_written == writer.bytes_received)
+            params, frames = read_wav(path)
+            assert params == (1, 2, SR)
+            assert np.array_equal(frames, audio[:len(frames)])
+            assert frames.nbytes == writer.bytes_written
+        assert writer.flushes > 1
+    finally:
+        writer.close()
+
+    _, frames = read_wav(path)
+    assert np.array_equal(frames, audio)
+
+
+def test_close_flushes_everything_pending(tmp_path):
+    path = str(tmp_path / "meeting.wav")
+    audio = tone(2.0)
+    # Nothing would be flushed on its own before close
+    writer = BufferedRecordingWriter(path, flush_bytes=10 ** 9, flush_interval=60, fsync_interval=60)
+    for block in np.array_split(audio, 50):
+        writer.write(block.tobytes())
+    assert writer.stats()["bytes_pending"] == audio.nbytes
+
+    writer.close()
+    writer.close()  # idempotent
+
+    stats = writer.stats()
+    assert stats["bytes_written"] == audio.nbytes
+    assert stats["bytes_pending"] == 0
+    assert stats["lag_seconds"] == 0.0
+    _, frames = read_wav(path)
+    assert np.array_equal(frames, audio)
+    with pytest.raises(ValueError):
+        writer.write(b"\0\0")
+
+
+def test_unknown_format_falls_back_to_wav(tmp_path):
+    writer = open_recording_writer(str(tmp_path / "meeting"), fmt="mp3", sample_rate=SR)
+    writer.close()
+    assert writer.path.endswith(".wav")
+    assert read_wav(writer.path)[0] == (1, 2, SR)
+
+
+def test_flac_round_trip(tmp_path):
+    sf = pytest.importorskip("soundfile")
+    audio = tone(1.5)
+    writer = open_recording_writer(str(tmp_path / "meeting"), fmt="flac", sample_rate=SR, flush_bytes=8000)
+    for block in np.array_split(audio, 30):
+        writer.write(block.tobytes())
+    writer.close()
+
+    assert writer.path.endswith(".flac")
+    frames, sample_rate = sf.read(writer.path, dtype="int16")
+    assert sample_rate == SR
+    assert np.array_equal(frames, audio)  # lossless
+
+
+def test_opus_round_trip(tmp_path):
+    sf = pytest.importorskip("soundfile")
+    if "OPUS" not in sf.available_subtypes("OGG"):
+        pytest.skip("libsndfile built without Opus")
+    audio = tone(1.5)
+    writer = open_recording_writer(str(tmp_path / "meeting"), fmt="opus", sample_rate=SR, flush_bytes=8000)
+    for block in np.array_split(audio, 30):
+        writer.write(block.tobytes())
+    writer.close()
+
+    assert writer.path.endswith(".ogg")
+    frames, sample_rate = sf.read(writer.path, dtype="float32")
+    assert sample_rate == SR
+    assert abs(len(frames) - len(audio)) < SR // 10
+    # Lossy, but still the same tone
+    steady = frames[SR // 4:SR]
+    peak_hz = np.argmax(np.abs(np.fft.rfft(steady))) * SR / len(steady)
+    assert abs(peak_hz - 440) < 5
@@ -0,0 +1,45 @@
+from speech_Module.streaming import CaptionStream, agreed_prefix_length, join_words
+
+
+def words(*spec):
+    """("hello", 0, 10), ... -> Word tuples with a leading space like Whisper's"""
+    return [(" " + text, start, end) for text, start, end in spec]
+
+
+def test_agreed_prefix_ignores_case_and_punctuation():
+    previous = words(("Hello", 0, 10), ("world", 10, 20), ("again", 20, 30))
+    current = words(("hello,", 0, 10), ("World", 10, 20), ("then", 20, 30))
+    assert agreed_prefix_length(previous, current) == 2
+
+
+def test_partials_promote_agreed_words():
+    stream = CaptionStream()
+    assert stream.apply_partial(0, words(("the", 0, 10), ("cat", 10, 20)))
+    assert stream.final_text == ""
+    assert stream.partial_text == "the cat"
+
+    assert stream.apply_partial(0, words(("the", 0, 10), ("cat", 10, 20), ("sat", 20, 30)))
+    assert stream.final_text == "the cat"
+    assert stream.partial_text == "sat"
+    assert stream.commit_sample == 20
+
+
+def test_partial_of_a_closed_utterance_is_ignored():
+    stream = CaptionStream()
+    stream.close(100)
+    assert not stream.apply_partial(0, words(("late", 0, 10)))
+    assert stream.seq == 1
+
+
+def test_finish_skips_words_before_the_commit():
+    stream = CaptionStream()
+    stream.apply_partial(0, words(("one", 0, 10), ("two", 10, 20)))
+    stream.apply_partial(0, words(("one", 0, 10), ("two", 10, 20), ("three", 20, 30)))
+    seq, final_words, commit_sample = stream.close(40)
+
+    # The final decode started before the commit moved on and heard "two" again
+    caption = stream.finish(final_words, words(("two", 10, 20), ("three", 20, 30), ("four", 30, 40)), commit_sample)
+
+    assert seq == 0
+    assert join_words(caption) == "one two three four"
+    assert stream.final_words == [] and stream.commit_sample == 40
@@ -0,0 +1,92 @@
+import numpy as np
+
+from speech_Module.vad import SpeechSegmenter, apply_hangover, contains_speech, frame_rms
+
+SR = 16000
+FRAME = SR * 30 // 1000
+
+
+class ArrayRing:
+    """Everything ever written, with the read interface of the bot's AudioRingBuffer"""
+
+    def __init__(self):
+        self.samples = np.zeros(0, dtype=np.int16)
+        self.oldest_available = 0
+
+    @property
+    def total_written(self):
+        return len(self.samples)
+
+    def write(self, samples):
+        self.samples = np.concatenate([self.samples, samples])
+
+    def view(self, start, end):
+        return self.samples[start:end]
+
+
+def tone(seconds, amplitude=8000):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.int16)
+
+
+def test_frame_rms_ignores_the_partial_frame():
+    samples = np.full(2 * FRAME + 5, 1000, dtype=np.int16)
+    rms = frame_rms(samples, FRAME)
+    assert rms.shape == (2,)
+    assert np.allclose(rms, 1000)
+
+
+def test_int16_extremes_do_not_overflow():
+    samples = np.full(FRAME, -32768, dtype=np.int16)
+    assert frame_rms(samples, FRAME)[0] == 32768
+
+
+def test_hangover_bridges_short_gaps_across_blocks():
+    first, last = apply_hangover(np.array([True, False, False]), hangover_frames=2)
+    second, _ = apply_hangover(np.array([False, False]), hangover_frames=2, first_index=3, last_speech_index=last)
+    assert first.tolist() == [True, True, True]
+    assert second.tolist() == [False, False]
+
+
+def test_contains_speech():
+    assert contains_speech(tone(1.0))
+    assert not contains_speech(silence(1.0))
+
+
+def test_utterances_end_at_pauses():
+    ring = ArrayRing()
+    segmenter = SpeechSegmenter(sample_rate=SR)
+    segments = []
+    for block in (silence(0.5), tone(1.0), silence(0.6), tone(0.8), silence(0.6)):
+        ring.write(block)
+        segments += segmenter.push(ring)
+
+    assert len(segments) == 2
+    (s1, e1), (s2, e2) = segments
+    # Padded by 150 ms either side, and the hangover keeps 200 ms after speech
+    assert abs(s1 - int(0.5 * SR) + segmenter.pad_samples) <= FRAME
+    assert int(1.5 * SR) <= e1 <= int(1.5 * SR) + int(0.4 * SR)
+    assert e1 <= s2 and e2 <= ring.total_written
+    assert not segmenter.in_speech
+
+
+def test_long_speech_is_cut_without_padding_at_the_cut():
+    ring = ArrayRing()
+    segmenter = SpeechSegmenter(sample_rate=SR, max_segment_seconds=2)
+    ring.write(tone(5.0))
+    segments = segmenter.push(ring) + segmenter.flush(ring)
+
+    assert len(segments) >= 2
+    assert all(a[1] == b[0] for a, b in zip(segments, segments[1:]))
+    assert all(end - start <= 2 * SR + FRAME for start, end in segments)
+
+
+def test_blips_shorter_than_min_speech_are_dropped():
+    ring = ArrayRing()
+    segmenter = SpeechSegmenter(sample_rate=SR, hangover_ms=0)
+    ring.write(np.concatenate([silence(0.3), tone(0.06), silence(1.0)]))
+    assert segmenter.push(ring) == []
@@ -0,0 +1,82 @@
+import pytest
+
+from utils.word_timings import WordTimings, normalize_token
+
+
+def segment(start, end, *words):
+    """words: (text, start, end)"""
+    return {
+        "start": start, "end": end, "text": "".join(w for w, _, _ in words),
+        "words": [{"word": w, "start": s, "end": e, "probability": 0.9} for w, s, e in words],
+    }
+
+
+SEGMENTS = [
+    segment(0.0, 2.0, (" The", 0.0, 0.4), (" budget,", 0.4, 1.0), (" please.", 1.0, 2.0)),
+    {"start": 2.0, "end": 3.0, "text": "", "words": []},
+    segment(3.0, 5.0, (" Budget", 3.0, 3.5), (" review", 3.5, 4.2), (" the", 4.2, 5.0)),
+]
+
+
+def test_from_segments_builds_columns_and_segment_offsets():
+    timings = WordTimings.from_segments(SEGMENTS)
+
+    assert len(timings) == 6
+    assert timings.segment.tolist() == [0, 3, 3]
+    assert timings.words(timings.segment_range(2)) == ["Budget", "review", "the"]
+    assert timings.words(timings.segment_range(1)) == []
+    assert len(timings.vocab) == 6  # "The" and "the" are distinct raw tokens
+
+
+def test_segments_with_text_but_no_words_are_rejected_on_request():
+    segments = SEGMENTS + [{"start": 5.0, "end": 6.0, "text": " no timings"}]
+
+    assert len(WordTimings.from_segments(segments)) == 6
+    with pytest.raises(ValueError, match="1 of 4 segments"):
+        WordTimings.from_segments(segments, require_words=True)
+    WordTimings.from_segments(SEGMENTS, require_words=True)  # silent segments are fine
+
+
+def test_bytes_round_trip():
+    timings = WordTimings.from_segments(SEGMENTS)
+    restored = WordTimings.from_bytes(timings.to_bytes())
+
+    assert restored.columns() == timings.columns()
+    assert restored.segment.tolist() == timings.segment.tolist()
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "nested" / "meeting.npz")
+    WordTimings.from_segments(SEGMENTS).save(path)
+    assert WordTimings.load(path).words() == ["The", "budget,", "please.", "Budget", "review", "the"]
+
+
+def test_range_returns_overlapping_words():
+    timings = WordTimings.from_segments(SEGMENTS)
+    assert timings.words(timings.range(0.5, 3.2)) == ["budget,", "please.", "Budget"]
+    assert timings.words(timings.range(10, 11)) == []
+
+
+def test_search_is_case_and_punctuation_insensitive():
+    timings = WordTimings.from_segments(SEGMENTS)
+
+    hits = timings.search("budget")
+    assert [h["start"] for h in hits] == [0.4, 3.0]
+
+    phrase = timings.search("Budget review", context=1)
+    assert phrase == [{"start": 3.0, "end": 4.2, "index": 3, "text": "please. Budget review the"}]
+
+    assert timings.search("missing") == []
+    assert timings.search("...") == []
+
+
+def test_normalize_token():
+    assert normalize_token("Budget,") == "budget"
+    assert normalize_token("don't!") == "don't"
+
+
+def test_empty_timings():
+    timings = WordTimings.from_segments([])
+    assert len(timings) == 0
+    assert timings.search("anything") == []
+    assert WordTimings.from_bytes(timings.to_bytes()).vocab == []
@@ -0,0 +1,66 @@
+# utils/audio_ring_buffer.py
+"""
+Fixed-size live audio buffer for the bot's ASR windowing.
+
+Growing a bytearray per websocket message and slicing it per window copies
+every sample several times. The ring is allocated once and hands out
+zero-copy views of any recent window, addressed by absolute sample index
+so queued jobs and the VAD agree on positions for the whole meeting.
+"""
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Preallocated int16 ring buffer addressed by absolute sample index.
+
+    Every sample is stored twice (at ``i`` and ``i + capacity``), so any
+    window of up to ``capacity`` samples is a contiguous slice and can be
+    handed out as a zero-copy, read-only view. Views stay valid until the
+    writer has advanced ``capacity`` samples past their start.
+    """
+
+    def __init__(self, capacity_samples: int):
+        self.capacity = int(capacity_samples)
+        self._data = np.zeros(2 * self.capacity, dtype=np.int16)
+        self.total_written = 0  # Absolute index of the next sample
+
+    @property
+    def oldest_available(self) -> int:
+        """Absolute index of the oldest sample still held in the buffer"""
+        return max(0, self.total_written - self.capacity)
+
+    def write(self, samples: np.ndarray):
+        """Append int16 samples, overwriting the oldest ones when full"""
+        n = len(samples)
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Only the newest `capacity` samples can survive anyway
+            self.total_written += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+
+        pos = self.total_written % self.capacity
+        first = min(n, self.capacity - pos)
+        self._data[pos:pos + first] = samples[:first]
+        self._data[pos + self.capacity:pos + self.capacity + first] = samples[:first]
+
+        rest = n - first
+        if rest:
+            self._data[:rest] = samples[first:]
+            self._data[self.capacity:self.capacity + rest] = samples[first:]
+
+        self.total_written += n
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """Return a read-only view of samples [start, end) by absolute index"""
+        if start < self.oldest_available or end > self.total_written or start > end:
+            raise IndexError(
+                f"Samples [{start}, {end}) not in buffer "
+                f"[{self.oldest_available}, {self.total_written})"
+            )
+        offset = start % self.capacity
+        window = self._data[offset:offset + (end - start)]
+        window.flags.writeable = False
+        return window
@@ -1,33 +1,121 @@
 # backend/utils/diarization_utils.py
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 def overlap(a_start, a_end, b_start, b_end):
     return max(0.0, min(a_end, b_end) - max(a_start, b_start))
 
-def align_transcript_with_diarization(transcript_segments: List[Dict], diarization_segments: List[Dict]):
+def _best_overlaps(starts, ends, diarization_segments: List[Dict]) -> List[int]:
+    """
+    For every interval (starts[i], ends[i]), the index of the diarization
+    segment it overlaps most (ties -> the earlier segment in the input),
+    or -1 if it overlaps none.
+
+    Sweep line: intervals and turns are visited in start order, and a turn
+    is dropped from the active set once it ends before the current interval
+    starts. Each turn is added and dropped once, so the cost is O(n + m)
+    plus the sort (skipped when the inputs are already in time order, as
+    Whisper and pyannote produce them) - instead of comparing every pair.
+    """
+    n = len(starts)
+    best = [-1] * n
+    if n == 0 or not diarization_segments:
+        return best
+
+    d_starts = [d['start'] for d in diarization_segments]
+    d_ends = [d['end'] for d in diarization_segments]
+    d_order = list(range(len(d_starts)))
+    if any(d_starts[k] > d_starts[k + 1] for k in range(len(d_starts) - 1)):
+        d_order.sort(key=d_starts.__getitem__)
+    t_order = list(range(n))
+    if any(starts[k] > starts[k + 1] for k in range(n - 1)):
+        t_order.sort(key=starts.__getitem__)
+
+    active = []  # diarization indices that started and may still overlap
+    j = 0
+    for i in t_order:
+        t_start, t_end = starts[i], ends[i]
+        while j < len(d_order) and d_starts[d_order[j]] < t_end:
+            active.append(d_order[j])
+            j += 1
+        # Later intervals start no earlier, so turns that ended are done for good
+        active = [k for k in active if d_ends[k] > t_start]
+
+        best_k, best_ov = -1, 0.0
+        for k in active:
+            ov = overlap(t_start, t_end, d_starts[k], d_ends[k])
+            if ov > best_ov or (ov == best_ov and ov > 0 and k < best_k):
+                best_k, best_ov = k, ov
+        best[i] = best_k
+    return best
+
+def assign_word_speakers(word_starts, word_ends, diarization_segments: List[Dict]) -> List[Optional[str]]:
+    """
+    Speaker of every word (parallel start/end sequences, e.g. the columns of
+    utils.word_timings.WordTimings), None where no speaker turn overlaps it.
+    """
+    best = _best_overlaps(list(word_starts), list(word_ends), diarization_segments)
+    return [diarization_segments[k]['speaker'] if k >= 0 else None for k in best]
+
+def _split_by_word_speakers(segment: Dict, starts, ends, words, speakers, fallback) -> List[Dict]:
+    """Cut one transcript segment into runs of consecutive words with the same speaker"""
+    runs = []
+    for start, end, word, speaker in zip(starts, ends, words, speakers):
+        speaker = speaker or fallback
+        if runs and runs[-1]["speaker"] == speaker:
+            runs[-1]["end"] = end
+            runs[-1]["words"].append(word)
+        else:
+            runs.append({"start": start, "end": end, "speaker": speaker, "words": [word]})
+    if not runs:
+        return [{"start": segment["start"], "end": segment["end"], "speaker": fallback, "text": segment["text"]}]
+    return [
+        {"start": float(r["start"]), "end": float(r["end"]), "speaker": r["speaker"], "text": " ".join(r["words"])}
+        for r in runs
+    ]
+
+def align_transcript_with_diarization(transcript_segments: List[Dict], diarization_segments: List[Dict],
+                                      word_level: bool = False, word_timings=None):
     """
     Align transcript segments (with timestamps) to diarization segments.
 
     transcript_segments: [{'start':float,'end':float,'text':str}, ...]
     diarization_segments: [{'speaker':str,'start':float,'end':float}, ...]
 
+    Each segment gets the speaker it overlaps most. With `word_level`, each
+    word is assigned on its own and a segment that spans a speaker change is
+    split at that word. Word times come from `word_timings` (a WordTimings
+    whose segments match transcript_segments) or from each segment's
+    "words"; segments without word times keep segment-level assignment.
+
     Returns: [{'start','end','speaker','text'}, ...]
     """
     if not transcript_segments or not diarization_segments:
         return []
 
     diar = diarization_segments
+    best = _best_overlaps(
+        [t['start'] for t in transcript_segments], [t['end'] for t in transcript_segments], diar
+    )
     aligned = []
 
-    for t in transcript_segments:
-        best = None
-        best_ov = 0.0
-        for d in diar:
-            ov = overlap(t['start'], t['end'], d['start'], d['end'])
-            if ov > best_ov:
-                best_ov = ov
-                best = d
-        speaker = best['speaker'] if best and best_ov > 0 else None
+    if word_level and word_timings is None and any(t.get("words") for t in transcript_segments):
+        from utils.word_timings import WordTimings
+        word_timings = WordTimings.from_segments(transcript_segments)
+
+    word_speakers = None
+    if (word_level and word_timings is not None and len(word_timings)
+            and len(word_timings.segment) == len(transcript_segments)):
+        word_speakers = assign_word_speakers(word_timings.start.tolist(), word_timings.end.tolist(), diar)
+
+    for i, t in enumerate(transcript_segments):
+        speaker = diar[best[i]]['speaker'] if best[i] >= 0 else None
+        if word_speakers is not None:
+            words = word_timings.segment_range(i)
+            aligned.extend(_split_by_word_speakers(
+                t, word_timings.start[words].tolist(), word_timings.end[words].tolist(),
+                word_timings.words(words), word_speakers[words], speaker
+            ))
+            continue
         aligned.append({
             "start": t["start"],
             "end": t["end"],
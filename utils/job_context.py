@@ -0,0 +1,95 @@
+# utils/job_context.py
+"""
+Per-job artifact context: every pipeline stage runs once per uploaded file.
+
+An upload used to be diarized by the endpoint and then again by
+run_pipeline_from_audio, and the file was decoded by each stage that needed
+samples. A JobContext is created once per job and handed to every consumer;
+stage outputs are memoized under the stage name, plus a key of the inputs
+for stages that take more than the file (the same transcript and speaker
+turns align once, different ones align again):
+
+    with JobContext(audio_path) as job:
+        turns = job.get_or_compute("diarization", diarization_worker.run, audio_path)
+        audio = job.audio()            # decoded once, freed when the job closes
+        aligned = job.get_or_compute("alignment", align, segments, turns, key=inputs_key(segments, turns))
+
+A stage that is already running in another thread (or awaited through
+`aget_or_compute`) is joined rather than started again, so a consumer that
+asks for diarization while the endpoint's diarization is still in flight
+waits for that result. A stage that raised is not memoized.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def inputs_key(*values) -> str:
+    """Hash of JSON-like stage inputs (segment lists, speaker turns), for `get_or_compute(key=...)`"""
+    encoded = json.dumps(values, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class JobContext:
+    """Stage outputs for one audio file, computed once and shared by every consumer"""
+
+    def __init__(self, audio_path: str):
+        self.audio_path = audio_path
+        self._artifacts: Dict[Tuple[str, Optional[str]], Future] = {}
+        self._lock = threading.Lock()
+        self._decoded = None
+
+    def get_or_compute(self, stage: str, compute: Callable, *args, key: Optional[str] = None) -> Any:
+        """
+        The output of `stage` for this job, running `compute(*args)` only if
+        no consumer has produced (or is producing) it yet. Blocking.
+        Pass `key` (see `inputs_key`) when the output depends on `args`
+        rather than only on the job's file.
+        """
+        key = (stage, key)
+        with self._lock:
+            future = self._artifacts.get(key)
+            owner = future is None
+            if owner:
+                future = self._artifacts[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute(*args)
+        except BaseException as e:
+            with self._lock:
+                self._artifacts.pop(key, None)  # The next consumer may retry
+            future.set_exception(e)
+            raise
+        future.set_result(value)
+        return value
+
+    async def aget_or_compute(self, stage: str, compute: Callable, *args, key: Optional[str] = None,
+                              executor=None) -> Any:
+        """`get_or_compute` without blocking the event loop (runs in `executor`, default: the loop's)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, lambda: self.get_or_compute(stage, compute, *args, key=key))
+
+    def audio(self):
+        """The decoded file (speech_Module.audio_io.DecodedAudio), memory-mapped so worker processes can share it"""
+        from speech_Module.audio_io import decode_audio
+
+        self._decoded = self.get_or_compute("audio", lambda: decode_audio(self.audio_path, mmap=True))
+        return self._decoded
+
+    def close(self):
+        """Free the decoded audio; other artifacts are dropped with the context"""
+        if self._decoded is not None:
+            self._decoded.close()
+            self._decoded = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
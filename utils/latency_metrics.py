@@ -0,0 +1,180 @@
+# utils/latency_metrics.py
+"""
+End-to-end latency instrumentation for live transcription.
+
+Every ASR job carries a LatencyTrace with perf_counter timestamps for each
+stage of the live path:
+
+    receive -> buffered -> vad -> queued -> inference_start -> inference_end -> broadcast
+
+When its text has been broadcast the trace is folded into fixed-bucket
+histograms, per meeting and globally, together with the real-time factor
+(inference seconds per second of audio). Histograms have a fixed size, so
+memory does not grow with meeting length.
+"""
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+STAGES = ("receive", "buffered", "vad", "queued", "inference_start", "inference_end", "broadcast")
+
+# name -> (from stage, to stage)
+INTERVALS = OrderedDict([
+    ("buffering", ("receive", "buffered")),
+    ("vad", ("buffered", "vad")),
+    ("enqueue", ("vad", "queued")),
+    ("queue_wait", ("queued", "inference_start")),
+    ("inference", ("inference_start", "inference_end")),
+    ("broadcast", ("inference_end", "broadcast")),
+    ("total", ("receive", "broadcast")),
+])
+
+# Upper bucket bounds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+# Finished meetings kept for inspection before the oldest is dropped
+MAX_TRACKED_MEETINGS = 50
+
+
+class LatencyTrace:
+    """Stage timestamps (time.perf_counter) for one live ASR job"""
+
+    __slots__ = ("marks", "audio_seconds", "kind")
+
+    def __init__(self, audio_seconds: float, kind: str = "chunk", **marks):
+        self.audio_seconds = audio_seconds
+        self.kind = kind
+        self.marks = {stage: t for stage, t in marks.items() if t is not None}
+
+    def mark(self, stage: str, t: Optional[float] = None):
+        self.marks[stage] = time.perf_counter() if t is None else t
+
+    def has(self, stage: str) -> bool:
+        return stage in self.marks
+
+    def interval(self, name: str) -> Optional[float]:
+        """Seconds spent in an interval, or None if a stage was not marked"""
+        start, end = INTERVALS[name]
+        if start in self.marks and end in self.marks:
+            return max(0.0, self.marks[end] - self.marks[start])
+        return None
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and max"""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile (max for the open bucket)"""
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": round(self.max, 3),
+            "buckets": {
+                **{f"le_{b}": n for b, n in zip(self.bounds, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class LatencyStats:
+    """Stage-latency histograms (milliseconds) plus RTF for one scope"""
+
+    def __init__(self):
+        self.intervals = {name: Histogram(LATENCY_BUCKETS_MS) for name in INTERVALS}
+        self.rtf = Histogram(RTF_BUCKETS)
+        self.audio_seconds = 0.0
+        self.inference_seconds = 0.0
+        self.jobs = 0
+
+    def add(self, trace: LatencyTrace):
+        self.jobs += 1
+        for name, histogram in self.intervals.items():
+            seconds = trace.interval(name)
+            if seconds is not None:
+                histogram.add(seconds * 1000.0)
+
+        inference = trace.interval("inference")
+        if inference is not None and trace.audio_seconds > 0:
+            self.rtf.add(inference / trace.audio_seconds)
+            self.audio_seconds += trace.audio_seconds
+            self.inference_seconds += inference
+
+    def summary(self) -> dict:
+        return {
+            "jobs": self.jobs,
+            "audio_seconds": round(self.audio_seconds, 2),
+            "inference_seconds": round(self.inference_seconds, 2),
+            # Aggregate RTF: below 1.0 means inference keeps up with real time
+            "rtf": round(self.inference_seconds / self.audio_seconds, 3) if self.audio_seconds else None,
+            "rtf_histogram": self.rtf.summary(),
+            "latency_ms": {name: h.summary() for name, h in self.intervals.items()},
+        }
+
+
+class LatencyRegistry:
+    """Global and per-meeting latency stats; safe to read from any thread"""
+
+    def __init__(self, max_meetings: int = MAX_TRACKED_MEETINGS):
+        self.max_meetings = max_meetings
+        self.global_stats = LatencyStats()
+        self.meetings: "OrderedDict[str, LatencyStats]" = OrderedDict()
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, meeting_id: str, trace: LatencyTrace):
+        with self._lock:
+            stats = self.meetings.get(meeting_id)
+            if stats is None:
+                stats = self.meetings[meeting_id] = LatencyStats()
+                while len(self.meetings) > self.max_meetings:
+                    self.meetings.popitem(last=False)
+            else:
+                self.meetings.move_to_end(meeting_id)
+            stats.add(trace)
+            self.global_stats.add(trace)
+
+    def snapshot(self, meeting_id: Optional[str] = None) -> Dict:
+        with self._lock:
+            if meeting_id is not None:
+                stats = self.meetings.get(meeting_id)
+                return {"meeting_id": meeting_id, **(stats or LatencyStats()).summary()}
+            return {
+                "since": self.started_at,
+                "global": self.global_stats.summary(),
+                "meetings": {mid: stats.summary() for mid, stats in self.meetings.items()},
+            }
+
+
+# Global registry shared by the live pipeline and the metrics endpoint
+latency_metrics = LatencyRegistry()
@@ -0,0 +1,267 @@
+# utils/recording_writer.py
+"""
+Buffered background writer for full-meeting recordings.
+
+Audio arrives as many small websocket messages. Writing each one with
+`wave.writeframes` on the event loop means a blocking syscall plus a header
+rewrite per message. This writer only appends to an in-memory list on the
+caller's thread; a background thread turns the list into large sequential
+writes, patches the WAV header on a schedule (so the file stays playable
+after a crash) and fsyncs on a schedule.
+
+RECORDING_FORMAT selects the on-disk format per deployment: "wav" (16-bit
+PCM, ~115 MB/hour), "flac" (lossless, roughly half) or "opus" (Ogg/Opus
+speech codec, a few MB/hour). FLAC and Opus are streamed through soundfile
+from the same background thread; both stay decodable after a crash.
+"""
+import glob
+import os
+import struct
+import threading
+import time
+
+RECORDING_FLUSH_BYTES = int(os.getenv("RECORDING_FLUSH_BYTES", str(256 * 1024)))
+RECORDING_FLUSH_INTERVAL = float(os.getenv("RECORDING_FLUSH_INTERVAL", "1.0"))
+RECORDING_FSYNC_INTERVAL = float(os.getenv("RECORDING_FSYNC_INTERVAL", "5.0"))
+RECORDING_FORMAT = os.getenv("RECORDING_FORMAT", "wav").lower()
+RECORDING_RETENTION_DAYS = float(os.getenv("RECORDING_RETENTION_DAYS", "0"))  # 0 = keep forever (opt in to pruning)
+
+# format -> (file extension, soundfile container, soundfile subtype)
+RECORDING_FORMATS = {
+    "wav": (".wav", None, None),
+    "flac": (".flac", "FLAC", "PCM_16"),
+    "opus": (".ogg", "OGG", "OPUS"),
+}
+
+WAV_HEADER_SIZE = 44
+
+
+def wav_header(data_size: int, sample_rate: int, channels: int, sample_width: int) -> bytes:
+    """Canonical 44-byte PCM WAV header for `data_size` bytes of audio"""
+    byte_rate = sample_rate * channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate, channels * sample_width, sample_width * 8,
+        b"data", data_size
+    )
+
+
+class BufferedRecordingWriter:
+    """
+    Append-only PCM recording written by a background thread.
+
+    `write()` never touches the disk. Data is flushed when
+    `flush_bytes` are pending or every `flush_interval` seconds; the header
+    is patched and the file fsynced every `fsync_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        sample_width: int = 2,
+        flush_bytes: int = RECORDING_FLUSH_BYTES,
+        flush_interval: float = RECORDING_FLUSH_INTERVAL,
+        fsync_interval: float = RECORDING_FSYNC_INTERVAL
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+
+        self._pending = []
+        self._pending_bytes = 0
+        self._oldest_pending = None  # monotonic time of the oldest unwritten chunk
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Counters (read without the lock; they are only informational)
+        self.bytes_received = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.fsyncs = 0
+
+        self._open()
+        self._last_sync = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"recording-{os.path.basename(path)}", daemon=True)
+        self._thread.start()
+
+    # --- format hooks -------------------------------------------------------
+
+    def _open(self):
+        self._file = open(self.path, "wb")
+        self._file.write(wav_header(0, self.sample_rate, self.channels, self.sample_width))
+
+    def _write_frames(self, data: bytes):
+        self._file.write(data)
+
+    def _sync(self):
+        """Patch the header to the current size, then flush and fsync"""
+        end = self._file.tell()
+        self._file.seek(0)
+        self._file.write(wav_header(self.bytes_written, self.sample_rate, self.channels, self.sample_width))
+        self._file.seek(end)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close_file(self):
+        self._file.close()
+
+    # --- public API ---------------------------------------------------------
+
+    def write(self, chunk: bytes):
+        """Queue PCM bytes for writing; never blocks on I/O"""
+        with self._cond:
+            if self._closed:
+                raise ValueError("Recording already closed")
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            self._pending.append(chunk)
+            self._pending_bytes += len(chunk)
+            self.bytes_received += len(chunk)
+            if self._pending_bytes >= self.flush_bytes:
+                self._cond.notify()
+
+    @property
+    def lag_seconds(self) -> float:
+        """Age of the oldest chunk that has not reached the file yet"""
+        oldest = self._oldest_pending
+        return time.monotonic() - oldest if oldest is not None else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "bytes_received": self.bytes_received,
+            "bytes_written": self.bytes_written,
+            "bytes_pending": self._pending_bytes,
+            "lag_seconds": round(self.lag_seconds, 3),
+            "flushes": self.flushes,
+            "fsyncs": self.fsyncs,
+        }
+
+    def close(self):
+        """Flush everything, finalize the header and close. Blocks until done."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    # --- background thread --------------------------------------------------
+
+    def _take_pending(self):
+        batch = self._pending
+        self._pending = []
+        self._pending_bytes = 0
+        self._oldest_pending = None
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and self._pending_bytes < self.flush_bytes:
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+                batch = self._take_pending()
+
+            try:
+                if batch:
+                    data = b"".join(batch)
+                    self._write_frames(data)
+                    self.bytes_written += len(data)
+                    self.flushes += 1
+
+                now = time.monotonic()
+                if closed or now - self._last_sync >= self.fsync_interval:
+                    self._sync()
+                    self.fsyncs += 1
+                    self._last_sync = now
+            except Exception as e:
+                print(f"❌ Recording write failed for {self.path}: {e}")
+
+            if closed:
+                try:
+                    self._close_file()
+                except Exception as e:
+                    print(f"❌ Failed to close recording {self.path}: {e}")
+                return
+
+
+class SoundFileRecordingWriter(BufferedRecordingWriter):
+    """
+    Same buffering as BufferedRecordingWriter, but the background thread
+    streams frames through a libsndfile encoder (FLAC or Ogg/Opus).
+    """
+
+    def __init__(self, path: str, container: str, subtype: str, **kwargs):
+        self.container = container
+        self.subtype = subtype
+        super().__init__(path, **kwargs)
+
+    def _open(self):
+        import soundfile as sf
+
+        # Keep our own handle so the file can be fsynced
+        self._file = open(self.path, "wb")
+        self._encoder = sf.SoundFile(
+            self._file, mode="w",
+            samplerate=self.sample_rate, channels=self.channels,
+            format=self.container, subtype=self.subtype
+        )
+
+    def _write_frames(self, data: bytes):
+        import numpy as np
+
+        frames = np.frombuffer(data, dtype=np.int16)
+        if self.channels > 1:
+            frames = frames.reshape(-1, self.channels)
+        self._encoder.write(frames)
+
+    def _sync(self):
+        # Encoded streams have no size header to patch; flush what is encoded
+        self._encoder.flush()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close_file(self):
+        self._encoder.close()
+        self._file.close()
+
+
+def open_recording_writer(path_without_ext: str, fmt: str = RECORDING_FORMAT, **kwargs) -> BufferedRecordingWriter:
+    """Create the writer for the configured recording format; its `.path` has the right extension"""
+    if fmt not in RECORDING_FORMATS:
+        print(f"⚠️  Unknown RECORDING_FORMAT '{fmt}', falling back to wav")
+        fmt = "wav"
+    ext, container, subtype = RECORDING_FORMATS[fmt]
+    path = path_without_ext + ext
+    if container is None:
+        return BufferedRecordingWriter(path, **kwargs)
+    return SoundFileRecordingWriter(path, container, subtype, **kwargs)
+
+
+def prune_recordings(directory: str = "temp_recordings", max_age_days: float = RECORDING_RETENTION_DAYS) -> int:
+    """
+    Delete recordings older than `max_age_days` (0 disables pruning).
+    Returns the number of files removed.
+    """
+    if max_age_days <= 0 or not os.path.isdir(directory):
+        return 0
+
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    # Recordings plus their live transcript sidecars
+    for ext in [e for e, _, _ in RECORDING_FORMATS.values()] + [".jsonl"]:
+        for path in glob.glob(os.path.join(directory, f"*{ext}")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError as e:
+                print(f"⚠️  Could not prune recording {path}: {e}")
+    return removed
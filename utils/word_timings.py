@@ -0,0 +1,223 @@
+# utils/word_timings.py
+"""
+Columnar word-level timestamps for a meeting.
+
+Whisper's word timestamps arrive as one dict per word
+({"word", "start", "end", "probability"}), which for a long meeting means
+hundreds of thousands of small Python objects and a Mongo document that
+approaches the 16 MB limit. WordTimings keeps the same data as parallel
+arrays instead:
+
+    start, end, prob   float32, one entry per word
+    token              uint32 index into a table of distinct word strings
+    segment            int32 offset of each transcript segment's first word
+
+The table itself is stored as one UTF-8 blob plus offsets, so a saved file
+needs no pickling. Serialized size is roughly 14 bytes per word before
+compression. Timeline queries are binary searches over `start`; searches
+compare integer token ids, never strings per word.
+
+WORD_TIMINGS_STORAGE chooses where meetings are kept: "disk" (one .npz per
+meeting under WORD_TIMINGS_DIR) or "mongo" (compressed bytes in the
+word_timings collection, one document per meeting).
+"""
+import io
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+WORD_TIMINGS_STORAGE = os.getenv("WORD_TIMINGS_STORAGE", "disk").lower()  # "disk" or "mongo"
+WORD_TIMINGS_DIR = os.getenv("WORD_TIMINGS_DIR", "word_timings")
+
+_NORMALIZE = re.compile(r"[^\w']+")
+
+
+def normalize_token(word: str) -> str:
+    """Lowercase and strip punctuation, so search matches "Budget," for "budget" """
+    return _NORMALIZE.sub("", word.lower())
+
+
+class WordTimings:
+    """Parallel arrays of word start/end/probability plus a token string table"""
+
+    def __init__(self, start: np.ndarray, end: np.ndarray, prob: np.ndarray,
+                 token: np.ndarray, vocab: List[str], segment: Optional[np.ndarray] = None):
+        self.start = np.asarray(start, dtype=np.float32)
+        self.end = np.asarray(end, dtype=np.float32)
+        self.prob = np.asarray(prob, dtype=np.float32)
+        self.token = np.asarray(token, dtype=np.uint32)
+        self.vocab = vocab
+        self.segment = np.asarray(segment if segment is not None else [0], dtype=np.int32)
+        self._normalized = None
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    # --- building ------------------------------------------------------------
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict], require_words: bool = False) -> "WordTimings":
+        """
+        Build from whisper-style segments with "words". The per-word dicts
+        are read once and can be dropped afterwards. Words are kept in time
+        order; `segment[i]` is the index of segment i's first word.
+
+        With `require_words`, raises ValueError if a segment has text but no
+        words (transcribed without word timestamps), instead of building an
+        index with holes in it.
+        """
+        starts, ends, probs, tokens, seg_offsets = [], [], [], [], []
+        vocab: List[str] = []
+        ids: Dict[str, int] = {}
+        missing = 0
+        for seg in segments:
+            seg_offsets.append(len(starts))
+            if not seg.get("words") and seg.get("text", "").strip():
+                missing += 1
+            for w in seg.get("words") or []:
+                word = w["word"].strip()
+                token = ids.get(word)
+                if token is None:
+                    token = ids[word] = len(vocab)
+                    vocab.append(word)
+                starts.append(w["start"])
+                ends.append(w["end"])
+                probs.append(w.get("probability", 1.0))
+                tokens.append(token)
+        if require_words and missing:
+            raise ValueError(f"{missing} of {len(seg_offsets)} segments have text but no word timestamps")
+        return cls(starts, ends, probs, tokens, vocab, seg_offsets or [0])
+
+    # --- serialization -------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Compressed .npz bytes (no pickled objects)"""
+        encoded = [w.encode("utf-8") for w in self.vocab]
+        vocab_offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        if encoded:
+            np.cumsum([len(b) for b in encoded], out=vocab_offsets[1:])
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf, start=self.start, end=self.end, prob=self.prob, token=self.token, segment=self.segment,
+            vocab_blob=np.frombuffer(b"".join(encoded), dtype=np.uint8), vocab_offsets=vocab_offsets,
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "WordTimings":
+        with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+            blob = npz["vocab_blob"].tobytes()
+            offsets = npz["vocab_offsets"]
+            vocab = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+            return cls(npz["start"], npz["end"], npz["prob"], npz["token"], vocab, npz["segment"])
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "WordTimings":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    # --- queries -------------------------------------------------------------
+
+    def range(self, start: float, end: float) -> slice:
+        """Slice of the words that overlap [start, end) seconds"""
+        lo = int(np.searchsorted(self.end, start, side="right"))
+        hi = int(np.searchsorted(self.start, end, side="left"))
+        return slice(lo, max(lo, hi))
+
+    def words(self, indices=slice(None)) -> List[str]:
+        return [self.vocab[t] for t in self.token[indices]]
+
+    def columns(self, indices=slice(None)) -> Dict[str, list]:
+        """JSON-friendly columns for a slice: {"start", "end", "prob", "word"}"""
+        return {
+            "start": np.round(self.start[indices].astype(np.float64), 3).tolist(),
+            "end": np.round(self.end[indices].astype(np.float64), 3).tolist(),
+            "prob": np.round(self.prob[indices].astype(np.float64), 3).tolist(),
+            "word": self.words(indices),
+        }
+
+    def segment_range(self, i: int) -> slice:
+        """Word slice of transcript segment i"""
+        stop = self.segment[i + 1] if i + 1 < len(self.segment) else len(self)
+        return slice(int(self.segment[i]), int(stop))
+
+    def _normalized_tokens(self) -> np.ndarray:
+        # Map raw token ids onto ids of their normalized form, once per instance
+        if self._normalized is None:
+            ids: Dict[str, int] = {}
+            mapping = np.array([ids.setdefault(normalize_token(w), len(ids)) for w in self.vocab] or [0],
+                               dtype=np.uint32)
+            self._normalized = (mapping[self.token], ids)
+        return self._normalized
+
+    def search(self, query: str, limit: int = 50, context: int = 5) -> List[Dict]:
+        """
+        Occurrences of the phrase `query` (case and punctuation insensitive),
+        in time order: [{"start", "end", "index", "text"}, ...] where "text"
+        includes `context` words either side.
+        """
+        terms = [normalize_token(w) for w in query.split()]
+        terms = [t for t in terms if t]
+        if not terms or not len(self):
+            return []
+
+        normalized, ids = self._normalized_tokens()
+        if any(t not in ids for t in terms):
+            return []
+        # Candidate positions for the first term, then narrowed term by term
+        hits = np.flatnonzero(normalized == ids[terms[0]])
+        for k, term in enumerate(terms[1:], start=1):
+            hits = hits[hits + k < len(normalized)]
+            hits = hits[normalized[hits + k] == ids[term]]
+
+        results = []
+        for i in hits[:limit].tolist():
+            last = i + len(terms) - 1
+            results.append({
+                "start": round(float(self.start[i]), 3),
+                "end": round(float(self.end[last]), 3),
+                "index": i,
+                "text": " ".join(self.words(slice(max(0, i - context), last + 1 + context))),
+            })
+        return results
+
+
+# --- per-meeting storage -----------------------------------------------------
+
+def _meeting_path(meeting_id: str) -> str:
+    return os.path.join(WORD_TIMINGS_DIR, f"{meeting_id}.npz")
+
+
+async def store_word_timings(meeting_id: str, timings: WordTimings, collection=None):
+    """
+    Persist a meeting's word timings. `collection` is the Mongo collection
+    used when WORD_TIMINGS_STORAGE=mongo.
+    """
+    if WORD_TIMINGS_STORAGE == "mongo" and collection is not None:
+        from bson import Binary
+
+        await collection.update_one(
+            {"_id": str(meeting_id)},
+            {"$set": {"data": Binary(timings.to_bytes()), "word_count": len(timings)}},
+            upsert=True,
+        )
+    else:
+        timings.save(_meeting_path(meeting_id))
+
+
+async def fetch_word_timings(meeting_id: str, collection=None) -> Optional[WordTimings]:
+    """A meeting's word timings, or None if none were stored"""
+    if WORD_TIMINGS_STORAGE == "mongo" and collection is not None:
+        doc = await collection.find_one({"_id": str(meeting_id)})
+        return WordTimings.from_bytes(bytes(doc["data"])) if doc else None
+    path = _meeting_path(meeting_id)
+    return WordTimings.load(path) if os.path.exists(path) else None